@@ -0,0 +1,226 @@
+"""Storage and pipeline benchmarks.
+
+Usage:
+    python -m benchmarks.run_benchmarks --stream-cases 50000 5000000 --output benchmarks/baseline.json
+    python -m benchmarks.run_benchmarks --scales 10000 --compare benchmarks/baseline.json
+    python -m benchmarks.run_benchmarks --scales 10000 --stream-cases 50000 500000 5000000
+
+Streaming sizes should start at 50000 or so: smaller runs finish before the
+queues and write batches fill, so their peak memory is below the plateau.
+"""
+import argparse
+import gc
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Any, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import (
+    CATEGORIES, FakeEvaluator, FakeModel, generate_results, generate_test_cases
+)
+from src.data.csv_manager import CSVDataManager
+from src.pipeline.runner import EvaluationRunner
+from src.utils.tracing import Tracer
+
+DEFAULT_SCALES = [10_000, 100_000, 1_000_000]
+APPEND_BATCH = 1_000
+# Test cases generated and written per chunk when building a streaming suite
+STREAM_CHUNK = 100_000
+
+
+def measure(operation: Callable[[], Any], track_memory: bool = True) -> Dict[str, float]:
+    """Wall time of one call and, optionally, peak traced memory of a second call"""
+    gc.collect()
+    start = time.perf_counter()
+    operation()
+    seconds = time.perf_counter() - start
+    result = {"seconds": round(seconds, 4)}
+    if track_memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            operation()
+            result["peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 2)
+        finally:
+            tracemalloc.stop()
+    return result
+
+
+def benchmark_scale(scale: int, data_dir: Path, e2e_cases: int = 200, latency_ms: float = 0.0,
+                    track_memory: bool = True, seed: int = 0) -> Dict[str, Dict[str, float]]:
+    """Time each data-manager operation against a store holding `scale` results"""
+    test_case_count = max(scale // 10, 100)
+    manager = CSVDataManager(data_dir=data_dir)
+    generate_test_cases(test_case_count, seed).to_csv(manager.test_cases_file, index=False)
+    generate_results(scale, test_case_count, seed).to_csv(manager.results_file, index=False)
+    base_results = manager.results_file.read_bytes()
+    append_batch = generate_results(APPEND_BATCH, test_case_count, seed + 1).drop(columns=["id"]).to_dict("records")
+
+    def reset_store():
+        manager.results_file.write_bytes(base_results)
+
+    def save():
+        reset_store()
+        manager.save_evaluation_results(append_batch)
+
+    def summary_cold():
+        manager.summary_cube_file.unlink(missing_ok=True)
+        manager.get_summary_statistics()
+
+    timings = {
+        "save_evaluation_results": measure(save, track_memory),
+        "load_evaluation_results": measure(manager.load_evaluation_results, track_memory),
+        "get_results_by_category": measure(lambda: manager.get_results_by_category(CATEGORIES[0]), track_memory),
+        "get_summary_statistics_cold": measure(summary_cold, track_memory),
+        "get_summary_statistics_warm": measure(manager.get_summary_statistics, track_memory),
+    }
+    reset_store()
+
+    cases = generate_test_cases(e2e_cases, seed).to_dict("records")
+    runner = EvaluationRunner(
+        [FakeModel("fake-a", latency_ms, seed=seed), FakeModel("fake-b", latency_ms, seed=seed + 1)],
+        {"correctness": FakeEvaluator()},
+        manager
+    )
+
+    def end_to_end():
+        reset_store()
+        runner.run(cases)
+
+    timings["end_to_end_run"] = measure(end_to_end, track_memory)
+    timings["end_to_end_run"]["cases"] = e2e_cases
+    reset_store()
+    return timings
+
+
+def write_test_cases(manager: CSVDataManager, n: int, seed: int = 0):
+    """Write a suite of n synthetic test cases chunk by chunk, never holding it all in memory"""
+    manager.test_cases_file.unlink(missing_ok=True)
+    for start in range(0, n, STREAM_CHUNK):
+        chunk = generate_test_cases(min(STREAM_CHUNK, n - start), seed + start)
+        chunk['id'] += start
+        chunk.to_csv(manager.test_cases_file, mode='a', header=start == 0, index=False)
+
+
+def benchmark_streaming(cases: int, data_dir: Path, latency_ms: float = 0.0, max_workers: int = 4,
+                        queue_size: int = 256, batch_size: int = 1_000, seed: int = 0) -> Dict[str, float]:
+    """Time and peak traced memory of a streaming run over a suite of `cases` test cases"""
+    manager = CSVDataManager(data_dir=data_dir)
+    write_test_cases(manager, cases, seed)
+    runner = EvaluationRunner(
+        [FakeModel("fake-a", latency_ms, seed=seed)], {"correctness": FakeEvaluator()}, manager,
+        tracer=Tracer(), max_workers=max_workers
+    )
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        summary = runner.run_stream(manager.iter_test_cases(), expected=cases,
+                                    queue_size=queue_size, batch_size=batch_size)
+        seconds = time.perf_counter() - start
+        peak_mb = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    finally:
+        tracemalloc.stop()
+    return {
+        "seconds": round(seconds, 4),
+        "peak_mb": round(peak_mb, 2),
+        "rows": summary["total"],
+        "rows_per_second": round(summary["total"] / seconds, 1) if seconds else None
+    }
+
+
+def memory_growth(streaming: Dict[str, Dict[str, float]]) -> float:
+    """Peak memory of the largest streaming run relative to the smallest"""
+    sizes = sorted(streaming, key=int)
+    return streaming[sizes[-1]]["peak_mb"] / streaming[sizes[0]]["peak_mb"]
+
+
+def run_suite(scales: List[int], e2e_cases: int = 200, latency_ms: float = 0.0,
+              track_memory: bool = True, seed: int = 0,
+              stream_cases: Optional[List[int]] = None) -> Dict[str, Any]:
+    """Run the benchmark at every scale and return a JSON-serialisable report"""
+    report = {
+        "created_at": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "settings": {"e2e_cases": e2e_cases, "latency_ms": latency_ms, "seed": seed},
+        "results": {}
+    }
+    for scale in scales:
+        with tempfile.TemporaryDirectory() as tmp:
+            report["results"][str(scale)] = benchmark_scale(
+                scale, Path(tmp), e2e_cases, latency_ms, track_memory, seed
+            )
+    if stream_cases:
+        report["streaming"] = {}
+        for cases in stream_cases:
+            with tempfile.TemporaryDirectory() as tmp:
+                report["streaming"][str(cases)] = benchmark_streaming(cases, Path(tmp), latency_ms, seed=seed)
+    return report
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.25) -> List[str]:
+    """Operations that got slower (or used more memory) than the baseline by more than tolerance"""
+    regressions = []
+    for scale, operations in current["results"].items():
+        for operation, stats in operations.items():
+            reference = baseline.get("results", {}).get(scale, {}).get(operation)
+            if not reference:
+                continue
+            for key in ("seconds", "peak_mb"):
+                if key in stats and key in reference and reference[key] > 0:
+                    change = stats[key] / reference[key] - 1
+                    if change > tolerance:
+                        regressions.append(
+                            f"{operation} @ {scale} rows: {key} {reference[key]} -> {stats[key]} (+{change:.0%})"
+                        )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark storage and pipeline operations")
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES)
+    parser.add_argument("--e2e-cases", type=int, default=200, help="Test cases in the end-to-end run")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Fake backend latency per generation")
+    parser.add_argument("--no-memory", action="store_true", help="Skip peak memory measurement")
+    parser.add_argument("--output", type=Path, help="Write results to this JSON file")
+    parser.add_argument("--compare", type=Path, help="Baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown")
+    parser.add_argument("--stream-cases", type=int, nargs="+",
+                        help="Suite sizes for streaming runs, from 50000 up; peak memory should not grow with them")
+    parser.add_argument("--max-memory-growth", type=float, default=1.5,
+                        help="Allowed peak memory of the largest streaming run relative to the smallest")
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.scales, args.e2e_cases, args.latency_ms, not args.no_memory,
+                       stream_cases=args.stream_cases)
+    # The exact invocation, so a baseline can be regenerated the same way
+    report["command"] = " ".join(["python -m benchmarks.run_benchmarks"] + list(sys.argv[1:] if argv is None else argv))
+    print(json.dumps(report["results"], indent=2))
+    # Written before any regression check, so a failing run's numbers are kept too
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+    regressions = []
+    if "streaming" in report:
+        print(json.dumps(report["streaming"], indent=2))
+        growth = memory_growth(report["streaming"])
+        if len(report["streaming"]) > 1 and growth > args.max_memory_growth:
+            regressions.append(f"streaming peak memory grew {growth:.2f}x with suite size")
+    if args.compare:
+        regressions += compare(report, json.loads(args.compare.read_text()), args.tolerance)
+    for line in regressions:
+        print(f"REGRESSION {line}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+import random
+import time
+import numpy as np
+import pandas as pd
+from typing import List, Optional
+from src.models.base_model import BaseModel, GenerationRecord
+from src.evaluators.base_evaluator import BaseEvaluator
+
+CATEGORIES = ["reasoning", "math", "coding", "summarization", "qa", "translation", "safety", "greeting"]
+TAGS = ["multi-step", "arithmetic", "python", "long-context", "factual", "french", "adversarial", "short"]
+MODELS = ["llama3:8b", "mistral:7b", "phi3:mini", "anthropic.claude-v2"]
+SCORE_COLUMNS = ["correctness_score", "relevancy_score", "fluency_score", "coherence_score"]
+WORDS = ("the model answer explains reasoning step result value because therefore example "
+         "context question input output correct final number list").split()
+
+
+def _sentences(rng: np.random.Generator, count: int, words: int) -> List[str]:
+    vocabulary = np.array(WORDS)
+    picks = rng.integers(0, len(vocabulary), size=(count, words))
+    return [" ".join(row) for row in vocabulary[picks]]
+
+
+def generate_test_cases(n: int, seed: int = 0) -> pd.DataFrame:
+    """Synthetic test cases with categories, tags and realistic text lengths"""
+    rng = np.random.default_rng(seed)
+    tag_pairs = [f"{a},{b}" for a, b in zip(rng.choice(TAGS, n), rng.choice(TAGS, n))]
+    now = pd.Timestamp.now().isoformat()
+    return pd.DataFrame({
+        "id": np.arange(1, n + 1),
+        "input_text": _sentences(rng, n, 20),
+        "expected_output": _sentences(rng, n, 10),
+        "context": "",
+        "category": rng.choice(CATEGORIES, n),
+        "tags": tag_pairs,
+        "created_at": now,
+        "updated_at": now
+    })
+
+
+def generate_results(n: int, test_case_count: int, seed: int = 0, start_id: int = 1) -> pd.DataFrame:
+    """Synthetic evaluation results spread over several models"""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "id": np.arange(start_id, start_id + n),
+        "test_case_id": rng.integers(1, test_case_count + 1, n),
+        "model_name": rng.choice(MODELS, n),
+        "model_type": "ollama",
+        "response_text": _sentences(rng, n, 50),
+    })
+    for col in SCORE_COLUMNS:
+        df[col] = np.round(rng.beta(5, 2, n), 3)
+    df["toxicity_score"] = np.round(rng.beta(1, 20, n), 3)
+    df["bias_score"] = np.round(rng.beta(1, 10, n), 3)
+    df["custom_metrics"] = ""
+    df["evaluation_time"] = pd.Timestamp.now().isoformat()
+    df["duration_ms"] = np.round(rng.lognormal(6, 0.5, n), 1)
+    df["status"] = np.where(rng.random(n) < 0.98, "success", "error")
+    df["error_message"] = ""
+    return df
+
+
+class FakeModel(BaseModel):
+    """Backend stand-in that sleeps for a sampled latency and returns canned text"""
+    model_type = "fake"
+
+    def __init__(self, model_name: str = "fake-model", latency_ms: float = 0.0,
+                 jitter_ms: float = 0.0, seed: Optional[int] = None):
+        self.model_name = model_name
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self._random = random.Random(seed)
+
+    def generate(self, input_text, **kwargs):
+        latency = max(self.latency_ms + self._random.uniform(-self.jitter_ms, self.jitter_ms), 0.0)
+        if latency:
+            time.sleep(latency / 1000)
+        completion = f"answer to: {input_text[:40]}"
+        return GenerationRecord(
+            text=completion, model_name=self.model_name,
+            prompt_tokens=len(input_text.split()), completion_tokens=len(completion.split()),
+            latency_ms=latency, eval_duration_ms=latency
+        )
+
+    def generate_response(self, input_text, **kwargs):
+        return self.generate(input_text, **kwargs).text
+
+
+class FakeEvaluator(BaseEvaluator):
+    """Deterministic cheap evaluator"""
+
+    def evaluate(self, input_text, expected_output, response_text, **kwargs):
+        return {"score": (len(response_text) % 10) / 10, "details": "synthetic"}
@@ -6,7 +6,7 @@ setup(
        packages=find_packages(where="src"),
        package_dir={"": "src"},
        install_requires=[
-           "streamlit",
+           "streamlit>=1.37.0",
            "pandas",
            "boto3",
            "ollama",
@@ -1,23 +1,64 @@
 import pandas as pd
 import os
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import Iterable, List, Dict, Any, Optional, Tuple
 from datetime import datetime
 import json
+import threading
+from contextlib import contextmanager
 import streamlit as st
 from src.utils.config import Config
+from src.utils.tracing import child_span
+from src.data.datasets import DatasetStore, assign_stable_ids, case_hash
+from src.data.tag_index import TagIndex
+from src.utils.aggregation import (
+    USAGE_COLUMNS, build_aggregation_cube, build_usage_partials, finalize_usage,
+    get_metric_rules, latest_results, model_averages, metric_pass_rates
+)
+
+try:
+    import fcntl
+except ImportError:  # Windows: only threads of this process are kept apart
+    fcntl = None
+
+# One re-entrant lock per results file, shared by every manager in the process
+_results_locks: Dict[str, threading.RLock] = {}
+_results_lock_depth: Dict[str, int] = {}
+_results_locks_guard = threading.Lock()
 
 class CSVDataManager:
     """Manages CSV data operations for test cases and evaluation results"""
-    
-    def __init__(self, data_dir: str = "data"):
+
+    # Rows read per chunk when scanning the results or test cases file
+    chunk_size = 100_000
+    # Test cases read per chunk when streaming them; their text makes rows wider than result rows
+    test_case_chunk_size = 10_000
+    # Bump when the summary cube or its metadata change shape so cached copies are rebuilt
+    summary_version = 8
+    # Runs kept in the progress file read by live dashboards
+    run_status_limit = 20
+
+    def __init__(self, data_dir: str = "data", config: Optional[Config] = None):
         self.data_dir = Path(data_dir)
+        # Project-specific configuration; the global config is loaded on demand when None
+        self.config = config
         self.data_dir.mkdir(exist_ok=True)
         
         # Define file paths
         self.test_cases_file = self.data_dir / "test_cases.csv"
         self.results_file = self.data_dir / "evaluation_results.csv"
         self.models_usage_file = self.data_dir / "models_usage.csv"
+        self.summary_cube_file = self.data_dir / "summary_cube.csv"
+        self.summary_meta_file = self.data_dir / "summary_cube.json"
+        self.tag_index_file = self.data_dir / "tag_index.npz"
+        self.run_status_file = self.data_dir / "run_status.json"
+        self.results_lock_file = self.data_dir / "evaluation_results.lock"
+        self.datasets = DatasetStore(self.data_dir)
+        # Written by src.data.retention when old results are archived
+        self.archive_dir = self.data_dir / "archive"
+        self.archive_manifest_file = self.archive_dir / "manifest.json"
+        self.archive_latest_file = self.archive_dir / "latest.csv"
+        self.archive_usage_file = self.archive_dir / "usage.csv"
         
         # Initialize CSV files if they don't exist
         self._initialize_csv_files()
@@ -52,22 +93,32 @@ class CSVDataManager:
             usage_df.to_csv(self.models_usage_file, index=False)
     
     def save_test_cases(self, test_cases: List[Dict[str, Any]]) -> bool:
-        """Save test cases to CSV"""
+        """Save test cases to CSV and record them as a new dataset version.
+
+        Cases without an id keep the id of the stored case with the same content,
+        so results keep pointing at the cases they were produced for.
+        """
         try:
-            df = pd.DataFrame(test_cases)
+            existing_df = self.load_test_cases()
+            df = assign_stable_ids(pd.DataFrame(test_cases), existing_df)
             
-            # Add timestamps
+            # Keep timestamps of cases whose content is unchanged
             current_time = datetime.now().isoformat()
+            previous = {}
+            if 'case_hash' in existing_df.columns:
+                previous = {
+                    (row['id'], row['case_hash']): row
+                    for row in existing_df[['id', 'case_hash', 'created_at', 'updated_at']].to_dict('records')
+                }
+            unchanged = [previous.get((i, h)) for i, h in zip(df['id'], df['case_hash'])]
             if 'created_at' not in df.columns:
-                df['created_at'] = current_time
-            df['updated_at'] = current_time
-            
-            # Generate IDs if not present
-            if 'id' not in df.columns or df['id'].isna().any():
-                df['id'] = range(1, len(df) + 1)
+                df['created_at'] = [row['created_at'] if row else current_time for row in unchanged]
+            df['updated_at'] = [row['updated_at'] if row else current_time for row in unchanged]
             
             # Save to CSV
             df.to_csv(self.test_cases_file, index=False)
+            self.datasets.commit(df)
+            TagIndex.build(df).save(self.tag_index_file, self._test_cases_signature())
             return True
             
         except Exception as e:
@@ -83,23 +134,68 @@ class CSVDataManager:
                     'category', 'tags', 'created_at', 'updated_at'
                 ])
             
-            df = pd.read_csv(self.test_cases_file)
+            with child_span("csv.read", file="test_cases") as span:
+                df = pd.read_csv(self.test_cases_file)
+                span.set_attribute("rows", len(df))
             
             # Apply filters if provided
-            if filter_conditions:
-                for column, value in filter_conditions.items():
-                    if column in df.columns:
-                        if isinstance(value, list):
-                            df = df[df[column].isin(value)]
-                        else:
-                            df = df[df[column] == value]
-            
-            return df
+            return self._apply_filters(df, filter_conditions)
             
         except Exception as e:
             st.error(f"Error loading test cases: {str(e)}")
             return pd.DataFrame()
     
+    def iter_test_cases(self, ids: Optional[Iterable[int]] = None, chunk_size: Optional[int] = None):
+        """Yield test cases one record at a time, reading at most chunk_size rows at once"""
+        if not self.test_cases_file.exists():
+            return
+        wanted = set(ids) if ids is not None else None
+        for chunk in pd.read_csv(self.test_cases_file, chunksize=chunk_size or self.test_case_chunk_size):
+            if wanted is not None:
+                chunk = chunk[chunk['id'].isin(wanted)]
+            yield from chunk.to_dict('records')
+
+    def count_test_cases(self) -> int:
+        """Number of test cases, counted without loading their text"""
+        if not self.test_cases_file.exists():
+            return 0
+        try:
+            return sum(len(chunk) for chunk in pd.read_csv(self.test_cases_file, usecols=['id'], chunksize=self.chunk_size))
+        except (ValueError, pd.errors.EmptyDataError):
+            return 0
+
+    def _test_cases_signature(self) -> Optional[List[int]]:
+        if not self.test_cases_file.exists():
+            return None
+        stat = self.test_cases_file.stat()
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def _current_tag_index(self) -> Optional[TagIndex]:
+        """The persisted tag index if it was built from the current test cases file"""
+        if not self.tag_index_file.exists():
+            return None
+        index = TagIndex.load(self.tag_index_file)
+        return index if index.signature == self._test_cases_signature() else None
+
+    def get_tag_index(self) -> TagIndex:
+        """Inverted index of test case categories and tags, rebuilt if the test cases changed"""
+        index = self._current_tag_index()
+        if index is None:
+            index = TagIndex.build(self.load_test_cases())
+            if self.test_cases_file.exists():
+                index.save(self.tag_index_file, self._test_cases_signature())
+        return index
+
+    def query_test_cases(self, expression: str) -> pd.DataFrame:
+        """Test cases matching a tag index query, e.g. 'category:reasoning AND (tag:math OR tag:multi-step)'"""
+        try:
+            ids = self.get_tag_index().query(expression)
+            df = self.load_test_cases()
+            return df[df['id'].isin(ids)] if len(df) else df
+        except Exception as e:
+            st.error(f"Error querying test cases: {str(e)}")
+            return pd.DataFrame()
+
     def add_test_case(self, test_case: Dict[str, Any]) -> bool:
         """Add a single test case"""
         try:
@@ -112,6 +208,7 @@ class CSVDataManager:
                 new_id = 1
             
             test_case['id'] = new_id
+            test_case['case_hash'] = case_hash(test_case)
             test_case['created_at'] = datetime.now().isoformat()
             test_case['updated_at'] = datetime.now().isoformat()
             
@@ -119,7 +216,15 @@ class CSVDataManager:
             new_row = pd.DataFrame([test_case])
             updated_df = pd.concat([existing_df, new_row], ignore_index=True)
             
+            # An index matching the file before this write only needs the new case
+            index = self._current_tag_index()
             updated_df.to_csv(self.test_cases_file, index=False)
+            self.datasets.commit(assign_stable_ids(updated_df, existing_df))
+            if index is None:
+                index = TagIndex.build(updated_df)
+            else:
+                index.add(int(new_id), test_case.get('category'), test_case.get('tags'))
+            index.save(self.tag_index_file, self._test_cases_signature())
             return True
             
         except Exception as e:
@@ -127,38 +232,129 @@ class CSVDataManager:
             return False
     
     def save_evaluation_results(self, results: List[Dict[str, Any]]) -> bool:
-        """Save evaluation results to CSV"""
+        """Save evaluation results to CSV.
+
+        Rows are appended when their columns already exist in the file, so live
+        readers can tail it by byte offset; new columns force a full rewrite.
+        """
         try:
-            new_results_df = pd.DataFrame(results)
+            with self.results_lock():
+                new_results_df = pd.DataFrame(results)
+                header = self._read_results_header()
+                start_id = self._next_result_id() if header else self.archived_max_id() + 1
+                new_results_df['id'] = range(start_id, start_id + len(new_results_df))
             
-            # Load existing results
-            if self.results_file.exists():
-                existing_df = pd.read_csv(self.results_file)
-                
-                # Generate new IDs
-                if len(existing_df) > 0:
-                    start_id = existing_df['id'].max() + 1
+                if header and set(new_results_df.columns) <= set(header):
+                    with child_span("csv.append", file="evaluation_results", new_rows=len(new_results_df)):
+                        new_results_df.reindex(columns=header).to_csv(self.results_file, mode='a', header=False, index=False)
                 else:
-                    start_id = 1
+                    # Load existing results and combine with the new ones
+                    existing_df = pd.DataFrame()
+                    if self.results_file.exists():
+                        with child_span("csv.read", file="evaluation_results") as span:
+                            existing_df = pd.read_csv(self.results_file)
+                            span.set_attribute("rows", len(existing_df))
+                    combined_df = pd.concat([existing_df, new_results_df], ignore_index=True) if len(existing_df) else new_results_df
+                    if header:
+                        combined_df = combined_df.reindex(columns=header + [col for col in combined_df.columns if col not in header])
                 
-                new_results_df['id'] = range(start_id, start_id + len(new_results_df))
-                
-                # Combine with existing data
-                combined_df = pd.concat([existing_df, new_results_df], ignore_index=True)
-            else:
-                new_results_df['id'] = range(1, len(new_results_df) + 1)
-                combined_df = new_results_df
-            
-            # Save to CSV
-            combined_df.to_csv(self.results_file, index=False)
+                    # Save to CSV
+                    with child_span("csv.write", file="evaluation_results",
+                                    rows=len(combined_df), new_rows=len(new_results_df)):
+                        combined_df.to_csv(self.results_file, index=False)
+                self._last_result_id = (self._results_signature(), start_id + len(new_results_df) - 1)
             return True
             
         except Exception as e:
             st.error(f"Error saving evaluation results: {str(e)}")
             return False
+
+    @contextmanager
+    def results_lock(self):
+        """Hold the results file exclusively against other threads and processes.
+
+        Appends, archiving and restores all rewrite or extend the file, so each
+        runs under this lock and none of them loses rows written by another.
+        The lock is re-entrant within a thread.
+        """
+        key = str(self.results_file.resolve())
+        with _results_locks_guard:
+            lock = _results_locks.setdefault(key, threading.RLock())
+        with lock:
+            outermost = _results_lock_depth.get(key, 0) == 0
+            _results_lock_depth[key] = _results_lock_depth.get(key, 0) + 1
+            handle = open(self.results_lock_file, 'a') if outermost and fcntl is not None else None
+            try:
+                if handle is not None:
+                    fcntl.flock(handle, fcntl.LOCK_EX)
+                yield
+            finally:
+                _results_lock_depth[key] -= 1
+                if handle is not None:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+                    handle.close()
+
+    def _results_signature(self) -> Optional[List[int]]:
+        if not self.results_file.exists():
+            return None
+        stat = self.results_file.stat()
+        return [stat.st_ino, stat.st_mtime_ns, stat.st_size]
+
+    def _next_result_id(self) -> int:
+        """Next free result id, read from the id column unless this manager wrote the file last.
+
+        Ids of archived results are never reused, so ids stay unique across the
+        live file and the archive.
+        """
+        signature, last_id = getattr(self, '_last_result_id', (None, 0))
+        if signature is None or signature != self._results_signature():
+            ids = pd.read_csv(self.results_file, usecols=['id'])['id']
+            last_id = int(ids.max()) if len(ids) and pd.notna(ids.max()) else 0
+        return max(last_id, self.archived_max_id()) + 1
+
+    def archived_max_id(self) -> int:
+        """Highest result id moved into the archive, 0 without an archive"""
+        if not self.archive_manifest_file.exists():
+            return 0
+        with open(self.archive_manifest_file, 'r') as f:
+            manifest = json.load(f)
+        if "max_id" in manifest:
+            return int(manifest["max_id"] or 0)
+        # Manifests written before the high-water mark was recorded
+        max_id = 0
+        for segment in manifest.get("segments", []):
+            ids = pd.read_csv(self.archive_dir / segment["file"], usecols=['id'])['id']
+            if len(ids) and pd.notna(ids.max()):
+                max_id = max(max_id, int(ids.max()))
+        return max_id
+
+    def results_offset(self) -> int:
+        """Current byte size of the results file; rows appended later start at this offset"""
+        return self.results_file.stat().st_size if self.results_file.exists() else 0
+
+    def load_run_status(self) -> Dict[str, Dict[str, Any]]:
+        """Progress records of recent runs keyed by run id"""
+        if not self.run_status_file.exists():
+            return {}
+        try:
+            with open(self.run_status_file, 'r') as f:
+                return json.load(f)
+        except json.JSONDecodeError:
+            return {}
+
+    def update_run_status(self, run_id: str, **fields):
+        """Merge fields into a run's progress record, keeping the most recent runs only"""
+        runs = self.load_run_status()
+        runs[run_id] = {**runs.get(run_id, {}), **fields}
+        runs = dict(list(runs.items())[-self.run_status_limit:])
+        tmp_path = self.run_status_file.with_suffix(".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(runs, f, default=str)
+        os.replace(tmp_path, self.run_status_file)
     
-    def load_evaluation_results(self, filter_conditions: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
-        """Load evaluation results from CSV with optional filtering"""
+    def load_evaluation_results(self, filter_conditions: Optional[Dict[str, Any]] = None,
+                                columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Load evaluation results from CSV with optional filtering and column projection"""
         try:
             if not self.results_file.exists():
                 return pd.DataFrame(columns=[
@@ -168,18 +364,16 @@ class CSVDataManager:
                     'duration_ms', 'status', 'error_message'
                 ])
             
-            df = pd.read_csv(self.results_file)
+            usecols = None
+            if columns is not None:
+                wanted = set(columns) | set(filter_conditions or {})
+                usecols = [col for col in self._read_results_header() if col in wanted]
+            with child_span("csv.read", file="evaluation_results") as span:
+                df = pd.read_csv(self.results_file, usecols=usecols)
+                span.set_attribute("rows", len(df))
             
             # Apply filters if provided
-            if filter_conditions:
-                for column, value in filter_conditions.items():
-                    if column in df.columns:
-                        if isinstance(value, list):
-                            df = df[df[column].isin(value)]
-                        else:
-                            df = df[df[column] == value]
-            
-            return df
+            return self._apply_filters(df, filter_conditions)
             
         except Exception as e:
             st.error(f"Error loading evaluation results: {str(e)}")
@@ -221,6 +415,141 @@ class CSVDataManager:
             st.error(f"Error getting results by category: {str(e)}")
             return pd.DataFrame()
 
+    @staticmethod
+    def _apply_filters(df: pd.DataFrame, filter_conditions: Optional[Dict[str, Any]]) -> pd.DataFrame:
+        """Apply equality / membership filters to a DataFrame"""
+        if filter_conditions:
+            for column, value in filter_conditions.items():
+                if column in df.columns:
+                    if isinstance(value, list):
+                        df = df[df[column].isin(value)]
+                    else:
+                        df = df[df[column] == value]
+        return df
+
+    def _read_results_header(self) -> List[str]:
+        """Read only the header row of the results CSV"""
+        try:
+            return list(pd.read_csv(self.results_file, nrows=0).columns)
+        except (FileNotFoundError, pd.errors.EmptyDataError):
+            return []
+
+    def iter_evaluation_results(self, columns: Optional[List[str]] = None, chunk_size: Optional[int] = None):
+        """Iterate over evaluation results in chunks of at most chunk_size rows"""
+        header = self._read_results_header()
+        usecols = [col for col in header if columns is None or col in set(columns)]
+        if not usecols:
+            return
+        yield from pd.read_csv(self.results_file, usecols=usecols, chunksize=chunk_size or self.chunk_size)
+
+    def get_distinct_values(self, column: str) -> List[Any]:
+        """Get the sorted distinct values of one results column without loading the rest"""
+        try:
+            values = set()
+            for chunk in self.iter_evaluation_results([column]):
+                values.update(chunk[column].dropna().unique().tolist())
+            return sorted(values, key=str)
+        except Exception as e:
+            st.error(f"Error reading distinct values for {column}: {str(e)}")
+            return []
+
+    def query_evaluation_results(self,
+                                 columns: Optional[List[str]] = None,
+                                 filter_conditions: Optional[Dict[str, Any]] = None,
+                                 categories: Optional[List[str]] = None,
+                                 score_ranges: Optional[Dict[str, Tuple[float, float]]] = None,
+                                 sort_by: Optional[str] = None,
+                                 ascending: bool = True,
+                                 page: int = 0,
+                                 page_size: int = 50) -> Tuple[pd.DataFrame, int]:
+        """Fetch one page of evaluation results, filtered and sorted on the server side.
+
+        The results file is scanned twice in chunks: first reading only the id, filter
+        and sort columns to find the rows on the requested page, then reading only the
+        requested columns for those rows. Returns the page and the total match count.
+        """
+        try:
+            header = self._read_results_header()
+            if not header:
+                return pd.DataFrame(columns=columns or []), 0
+
+            filter_conditions = filter_conditions or {}
+            score_ranges = score_ranges or {}
+            columns = [col for col in (columns or header) if col in header]
+            if 'id' not in columns:
+                columns = ['id'] + columns
+
+            # Restrict to test cases in the requested categories
+            category_ids = None
+            if categories:
+                test_cases_df = self.load_test_cases()
+                if 'category' in test_cases_df.columns:
+                    category_ids = test_cases_df.loc[test_cases_df['category'].isin(categories), 'id'].tolist()
+                else:
+                    category_ids = []
+
+            # Pass 1: find matching ids using only the key columns
+            key_columns = {'id'} | set(filter_conditions) | set(score_ranges)
+            if sort_by:
+                key_columns.add(sort_by)
+            if category_ids is not None:
+                key_columns.add('test_case_id')
+
+            matches = []
+            for chunk in self.iter_evaluation_results(list(key_columns)):
+                chunk = self._apply_filters(chunk, filter_conditions)
+                if category_ids is not None:
+                    chunk = chunk[chunk['test_case_id'].isin(category_ids)]
+                for metric, (low, high) in score_ranges.items():
+                    if metric in chunk.columns:
+                        chunk = chunk[chunk[metric].between(low, high)]
+                keep = ['id'] + ([sort_by] if sort_by and sort_by in chunk.columns and sort_by != 'id' else [])
+                matches.append(chunk[keep])
+
+            if not matches:
+                return pd.DataFrame(columns=columns), 0
+            matches_df = pd.concat(matches, ignore_index=True)
+            total = len(matches_df)
+
+            if sort_by and sort_by in matches_df.columns:
+                matches_df = matches_df.sort_values(sort_by, ascending=ascending, kind='mergesort', na_position='last')
+            start = max(page, 0) * page_size
+            page_ids = matches_df['id'].iloc[start:start + page_size].tolist()
+            if not page_ids:
+                return pd.DataFrame(columns=columns), total
+
+            # Pass 2: fetch only the requested columns for the rows on this page
+            wanted = set(page_ids)
+            rows = []
+            found = 0
+            for chunk in self.iter_evaluation_results(columns):
+                chunk = chunk[chunk['id'].isin(wanted)]
+                if not chunk.empty:
+                    rows.append(chunk)
+                    found += len(chunk)
+                    if found >= len(wanted):
+                        break
+            page_df = pd.concat(rows, ignore_index=True) if rows else pd.DataFrame(columns=columns)
+            page_df = page_df.set_index('id').reindex(page_ids).reset_index()
+            return page_df[columns], total
+
+        except Exception as e:
+            st.error(f"Error querying evaluation results: {str(e)}")
+            return pd.DataFrame(), 0
+
+    def get_response_text(self, result_id: int) -> Optional[str]:
+        """Load the response text of a single evaluation result"""
+        try:
+            for chunk in self.iter_evaluation_results(['id', 'response_text']):
+                match = chunk[chunk['id'] == result_id]
+                if not match.empty:
+                    value = match.iloc[0]['response_text']
+                    return None if pd.isna(value) else str(value)
+            return None
+        except Exception as e:
+            st.error(f"Error loading response text: {str(e)}")
+            return None
+
     def calculate_pass_rate(self, results_df: pd.DataFrame, metric: str, threshold: float, higher_is_better: bool = True) -> float:
         """Calculate the pass rate for a specific metric based on its threshold"""
         try:
@@ -236,57 +565,147 @@ class CSVDataManager:
             st.error(f"Error calculating pass rate for {metric}: {str(e)}")
             return 0.0
 
-    def get_summary_statistics(self) -> Dict[str, Any]:
-        """Get summary statistics for the evaluation results"""
-        try:
-            results_df = self.load_evaluation_results()
-            test_cases_df = self.load_test_cases()
-            
-            if len(results_df) == 0:
-                return {
-                    "total_evaluations": 0,
-                    "total_test_cases": len(test_cases_df),
-                    "models_evaluated": [],
-                    "average_scores": {},
-                    "pass_rates": {},
-                    "category_counts": test_cases_df['category'].value_counts().to_dict() if not test_cases_df.empty else {}
-                }
+    def _summary_signature(self, thresholds: Dict[str, float], higher_is_better: Dict[str, bool]) -> Dict[str, Any]:
+        """Fingerprint of the inputs the summary cube was built from"""
+        signature = {"version": self.summary_version, "thresholds": thresholds, "higher_is_better": higher_is_better}
+        for key, path in (("results", self.results_file), ("test_cases", self.test_cases_file),
+                          ("archive", self.archive_manifest_file)):
+            stat = path.stat() if path.exists() else None
+            signature[key] = [stat.st_mtime_ns, stat.st_size] if stat else None
+        return signature
+
+    def _load_summary(self, config: Optional[Config] = None) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """Return the materialised summary cube, rebuilding it if the underlying data changed"""
+        config = config or self.config or Config()
+        thresholds, higher_is_better = get_metric_rules(config)
+        signature = json.loads(json.dumps(self._summary_signature(thresholds, higher_is_better)))
+
+        if self.summary_cube_file.exists() and self.summary_meta_file.exists():
+            with open(self.summary_meta_file, 'r') as f:
+                meta = json.load(f)
+            if meta.get("signature") == signature:
+                cube = pd.read_csv(self.summary_cube_file,
+                                   dtype={'model_name': str, 'category': str, 'metric': str})
+                return cube, meta
+
+        header = self._read_results_header()
+        columns = (['model_name', 'test_case_id', 'case_hash', 'status', 'coalesced'] + USAGE_COLUMNS
+                   + [col for col in header if col.endswith('_score')])
+        results_df = self.load_evaluation_results(columns=columns) if header else pd.DataFrame()
+        test_cases_df = self.load_test_cases()
+        usage = build_usage_partials(results_df)
+        models = results_df['model_name'].dropna().unique().tolist() if 'model_name' in results_df.columns else []
+
+        # Archived results contribute through their latest rows and usage sums
+        archive = self.load_archive_summary()
+        scored = results_df
+        if archive["rows"]:
+            if not archive["latest"].empty:
+                # Archived rows come first, so a live result for the same case and model wins
+                scored = pd.concat([archive["latest"], results_df], ignore_index=True)
+            usage = pd.concat([frame for frame in (usage, archive["usage"]) if not frame.empty], ignore_index=True)
+            usage = usage.groupby('model_name', as_index=False, sort=True).sum(numeric_only=True)
+            models = list(dict.fromkeys(models + archive["models"]))
+        # Scores come from the latest result per case and model; usage counts every generation
+        cube = build_aggregation_cube(latest_results(scored), test_cases_df, thresholds, higher_is_better)
 
-            # Initialize config for thresholds
-            config = Config()
-            metrics_config = config.get_available_metrics()
-            thresholds = config.metrics_config.get('thresholds', {})
+        meta = {
+            "signature": signature,
+            "built_at": datetime.now().isoformat(),
+            "total_evaluations": len(results_df) + archive["rows"],
+            "archived_evaluations": archive["rows"],
+            "models_evaluated": models,
+            "total_test_cases": len(test_cases_df),
+            "category_counts": self._category_counts(test_cases_df),
+            "usage": usage.to_dict('records')
+        }
+        cube.to_csv(self.summary_cube_file, index=False)
+        with open(self.summary_meta_file, 'w') as f:
+            json.dump(meta, f, default=str)
+        return cube, meta
 
-            # Identify numeric score columns
-            score_columns = [col for col in results_df.columns if col.endswith('_score') and pd.api.types.is_numeric_dtype(results_df[col])]
+    def load_archive_summary(self) -> Dict[str, Any]:
+        """Latest rows, usage sums and row count of archived results"""
+        if not self.archive_manifest_file.exists():
+            return {"rows": 0, "models": [], "latest": pd.DataFrame(), "usage": pd.DataFrame(), "segments": []}
+        with open(self.archive_manifest_file, 'r') as f:
+            manifest = json.load(f)
+        usage = pd.read_csv(self.archive_usage_file, dtype={'model_name': str}) if self.archive_usage_file.exists() else pd.DataFrame()
+        return {
+            "rows": sum(segment["rows"] for segment in manifest.get("segments", [])),
+            "models": manifest.get("models", []),
+            "latest": self.load_archive_latest(manifest.get("segments", [])),
+            "usage": usage,
+            "segments": manifest.get("segments", [])
+        }
 
-            # Calculate average scores per model
-            average_scores = {}
-            if score_columns:
-                avg_scores_df = results_df.groupby('model_name')[score_columns].mean().reset_index()
-                average_scores = avg_scores_df.set_index('model_name').to_dict('index')
+    @staticmethod
+    def latest_columns(columns: Iterable[str]) -> List[str]:
+        """Columns kept for archived results: keys, status and every score and evaluator version"""
+        keys = ['id', 'test_case_id', 'model_name', 'case_hash', 'status', 'evaluation_time']
+        return [col for col in columns if col in keys or col.endswith('_score') or col.endswith('_evaluator_version')]
 
-            # Calculate pass rates for each metric
-            pass_rates = {}
-            for metric in score_columns:
-                metric_name = metric.replace('_score', '')
-                threshold = thresholds.get(metric_name, 0.5)
-                higher_is_better = metrics_config.get(metric_name, {}).get('higher_is_better', True)
-                pass_rates[metric] = self.calculate_pass_rate(results_df, metric, threshold, higher_is_better)
+    def build_archive_latest(self, segments: List[Dict[str, Any]]) -> pd.DataFrame:
+        """Latest archived row per case and model, read from the segment files in archive order"""
+        frames = []
+        for segment in segments:
+            for chunk in pd.read_csv(self.archive_dir / segment["file"], chunksize=self.chunk_size):
+                frames.append(latest_results(chunk[self.latest_columns(chunk.columns)]))
+        return latest_results(pd.concat(frames, ignore_index=True)) if frames else pd.DataFrame()
 
-            # Get unique models evaluated
-            models_evaluated = results_df['model_name'].unique().tolist()
+    def load_archive_latest(self, segments: Optional[List[Dict[str, Any]]] = None) -> pd.DataFrame:
+        """Latest archived row per case and model, as scored into summaries and seen by the planner"""
+        if self.archive_latest_file.exists():
+            return pd.read_csv(self.archive_latest_file, dtype={'model_name': str, 'case_hash': str})
+        if segments is None:
+            if not self.archive_manifest_file.exists():
+                return pd.DataFrame()
+            with open(self.archive_manifest_file, 'r') as f:
+                segments = json.load(f).get("segments", [])
+        # Archives written before the latest rows were kept alongside the segments
+        return self.build_archive_latest(segments)
 
-            # Get category counts from test cases
-            category_counts = test_cases_df['category'].value_counts().to_dict() if not test_cases_df.empty else {}
+    @staticmethod
+    def _category_counts(test_cases_df: pd.DataFrame) -> Dict[str, int]:
+        if 'category' not in test_cases_df.columns or test_cases_df.empty:
+            return {}
+        return {str(k): int(v) for k, v in test_cases_df['category'].value_counts().items()}
+
+    def get_summary_partials(self) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """The materialised cube and its metadata, whose counts and sums can be merged with other stores"""
+        return self._load_summary()
+
+    @staticmethod
+    def _usage_summary(meta: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Per-model throughput and cost rollup from the materialised usage sums"""
+        partial = pd.DataFrame(meta.get("usage", []))
+        if partial.empty:
+            return {}
+        return finalize_usage(partial).set_index('model_name').to_dict('index')
+
+    def get_aggregation_cube(self) -> pd.DataFrame:
+        """Get the model x category x metric summary cube"""
+        try:
+            cube, _ = self._load_summary()
+            return cube
+        except Exception as e:
+            st.error(f"Error building aggregation cube: {str(e)}")
+            return pd.DataFrame()
+
+    def get_summary_statistics(self) -> Dict[str, Any]:
+        """Get summary statistics for the evaluation results"""
+        try:
+            # Test case counts are cached with the cube, so a warm call reads no raw data
+            cube, meta = self._load_summary()
 
             return {
-                "total_evaluations": len(results_df),
-                "total_test_cases": len(test_cases_df),
-                "models_evaluated": models_evaluated,
-                "average_scores": average_scores,
-                "pass_rates": pass_rates,
-                "category_counts": category_counts
+                "total_evaluations": meta["total_evaluations"],
+                "total_test_cases": meta["total_test_cases"],
+                "models_evaluated": meta["models_evaluated"],
+                "average_scores": model_averages(cube),
+                "pass_rates": metric_pass_rates(cube),
+                "category_counts": meta["category_counts"],
+                "usage": self._usage_summary(meta)
             }
             
         except Exception as e:
@@ -297,5 +716,6 @@ class CSVDataManager:
                 "models_evaluated": [],
                 "average_scores": {},
                 "pass_rates": {},
-                "category_counts": {}
-            }
\ No newline at end of file
+                "category_counts": {},
+                "usage": {}
+            }
@@ -0,0 +1,166 @@
+import hashlib
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+import pandas as pd
+
+# Fields that define what a test case asks and expects; metadata such as category does not change its hash
+CONTENT_FIELDS = ['input_text', 'expected_output', 'context']
+# Per-case metadata recorded in each version manifest
+METADATA_FIELDS = ['category', 'tags']
+HASH_LENGTH = 16
+
+
+def _normalise(value) -> str:
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return ""
+    return str(value).strip()
+
+
+def case_hash(test_case: Dict[str, Any]) -> str:
+    """Stable content ID of a test case"""
+    content = json.dumps([_normalise(test_case.get(field)) for field in CONTENT_FIELDS], ensure_ascii=False)
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()[:HASH_LENGTH]
+
+
+def hash_test_cases(df: pd.DataFrame) -> pd.Series:
+    return pd.Series([case_hash(row) for row in df.to_dict('records')], index=df.index, dtype=object)
+
+
+def assign_stable_ids(df: pd.DataFrame, existing_df: pd.DataFrame) -> pd.DataFrame:
+    """Fill missing ids so unchanged cases keep their id across uploads.
+
+    A case without an id takes the id of the stored case with the same content
+    hash, else of a stored case with the same input whose content changed, else
+    a new id above every id already in use.
+    """
+    df = df.copy()
+    df['case_hash'] = hash_test_cases(df)
+    if 'id' not in df.columns:
+        df['id'] = pd.NA
+    if not df['id'].isna().any():
+        return df
+
+    existing_df = existing_df if 'id' in existing_df.columns else pd.DataFrame(columns=['id'])
+    if 'case_hash' not in existing_df.columns:
+        existing_df = existing_df.assign(case_hash=hash_test_cases(existing_df) if len(existing_df) else [])
+    taken = set(df['id'].dropna().astype(int))
+    by_hash = {h: int(i) for h, i in zip(existing_df['case_hash'], existing_df['id']) if pd.notna(i)}
+    new_hashes = set(df['case_hash'])
+    by_input = {}
+    for _, row in existing_df.iterrows():
+        if pd.notna(row['id']) and row['case_hash'] not in new_hashes:
+            by_input.setdefault(_normalise(row.get('input_text')), int(row['id']))
+    next_id = max(taken | set(existing_df['id'].dropna().astype(int)) | {0}) + 1
+
+    ids = []
+    for current, h, text in zip(df['id'], df['case_hash'], df.get('input_text', pd.Series([None] * len(df)))):
+        if pd.notna(current):
+            ids.append(int(current))
+            continue
+        candidate = by_hash.get(h)
+        if candidate is None or candidate in taken:
+            candidate = by_input.get(_normalise(text))
+        if candidate is None or candidate in taken:
+            candidate = next_id
+            next_id += 1
+        taken.add(candidate)
+        ids.append(candidate)
+    df['id'] = ids
+    return df
+
+
+class DatasetStore:
+    """Immutable test-case dataset versions.
+
+    Case contents live once in an append-only object file keyed by content hash;
+    each version is a JSON manifest mapping test case ids to hashes plus metadata.
+    Saving the same cases twice reuses the latest version.
+    """
+
+    def __init__(self, data_dir: Path):
+        self.root = Path(data_dir) / "datasets"
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.objects_file = self.root / "objects.jsonl"
+
+    def _manifest_path(self, version: str) -> Path:
+        return self.root / f"{version}.json"
+
+    def list_versions(self) -> List[str]:
+        return sorted(path.stem for path in self.root.glob("v*.json"))
+
+    def latest_version(self) -> Optional[str]:
+        versions = self.list_versions()
+        return versions[-1] if versions else None
+
+    def load_manifest(self, version: str) -> Dict[str, Any]:
+        with open(self._manifest_path(version), 'r') as f:
+            return json.load(f)
+
+    def _known_hashes(self) -> set:
+        if not self.objects_file.exists():
+            return set()
+        with open(self.objects_file, 'r') as f:
+            return {json.loads(line)['case_hash'] for line in f}
+
+    def commit(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """Record the test cases (with id and case_hash columns) as a version"""
+        cases = [
+            {'id': int(row['id']), 'case_hash': row['case_hash'],
+             **{field: _normalise(row.get(field)) for field in METADATA_FIELDS}}
+            for row in df.to_dict('records')
+        ]
+        cases.sort(key=lambda case: case['id'])
+        digest = hashlib.sha256(json.dumps(cases, sort_keys=True).encode('utf-8')).hexdigest()[:HASH_LENGTH]
+
+        latest = self.latest_version()
+        if latest is not None:
+            manifest = self.load_manifest(latest)
+            if manifest['digest'] == digest:
+                return manifest
+
+        known = self._known_hashes()
+        new_objects = {}
+        for row in df.to_dict('records'):
+            if row['case_hash'] not in known:
+                new_objects[row['case_hash']] = {field: _normalise(row.get(field)) for field in CONTENT_FIELDS}
+        if new_objects:
+            with open(self.objects_file, 'a') as f:
+                for h, content in new_objects.items():
+                    f.write(json.dumps({'case_hash': h, **content}, ensure_ascii=False) + "\n")
+
+        version = f"v{len(self.list_versions()) + 1:04d}"
+        manifest = {
+            'version': version,
+            'parent': latest,
+            'digest': digest,
+            'created_at': datetime.now().isoformat(),
+            'count': len(cases),
+            'cases': cases
+        }
+        with open(self._manifest_path(version), 'w') as f:
+            json.dump(manifest, f)
+        return manifest
+
+    def diff(self, old_version: Optional[str], new_version: str) -> Dict[str, List[int]]:
+        """Test case ids that are new, changed (same id, new content) or removed between versions"""
+        old = {case['id']: case['case_hash'] for case in self.load_manifest(old_version)['cases']} if old_version else {}
+        new = {case['id']: case['case_hash'] for case in self.load_manifest(new_version)['cases']}
+        return {
+            'new': sorted(set(new) - set(old)),
+            'changed': sorted(i for i in set(new) & set(old) if new[i] != old[i]),
+            'removed': sorted(set(old) - set(new)),
+            'unchanged': sorted(i for i in set(new) & set(old) if new[i] == old[i])
+        }
+
+    def load_version(self, version: str) -> pd.DataFrame:
+        """Rebuild the test cases of a version from its manifest and the object file"""
+        manifest = pd.DataFrame(self.load_manifest(version)['cases'])
+        if manifest.empty:
+            return pd.DataFrame(columns=['id', 'case_hash'] + CONTENT_FIELDS + METADATA_FIELDS)
+        objects = pd.read_json(self.objects_file, lines=True, dtype=False).drop_duplicates('case_hash')
+        return manifest.merge(objects, on='case_hash', how='left')[
+            ['id', 'case_hash'] + CONTENT_FIELDS + METADATA_FIELDS
+        ]
@@ -0,0 +1,155 @@
+import io
+import os
+import time
+from collections import deque
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+
+import pandas as pd
+
+from src.data.csv_manager import CSVDataManager
+from src.utils.aggregation import (
+    ADDITIVE_COLUMNS, ALL_CATEGORIES, build_partial_aggregates, build_usage_partials, finalize_aggregates,
+    get_metric_rules, merge_partial_aggregates, metric_pass_rates
+)
+from src.utils.config import Config
+
+# Upper bound on bytes parsed per refresh, so a refresh costs the same however large the file is
+DEFAULT_MAX_BYTES = 4 * 1024 * 1024
+
+
+def complete_records_end(data: bytes) -> int:
+    """Length of the longest prefix of `data` made of whole CSV records.
+
+    A newline only ends a record when the quotes before it are balanced, so
+    multi-line quoted fields and half-written appends are left for the next read.
+    """
+    end, quotes, start = 0, 0, 0
+    while True:
+        newline = data.find(b"\n", start)
+        if newline == -1:
+            return end
+        quotes += data.count(b'"', start, newline)
+        start = newline + 1
+        if quotes % 2 == 0:
+            end = start
+
+
+class ResultsTail:
+    """Reads rows appended to the results CSV since the previous read.
+
+    The cursor is a byte offset. If the file is rewritten (new columns,
+    archiving or a restore) the header or inode changes and reading restarts
+    from the first record, which `poll` reports as a reset.
+    """
+
+    def __init__(self, path: Path, offset: Optional[int] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = Path(path)
+        self.offset = offset
+        self.max_bytes = max_bytes
+        self.header: Optional[bytes] = None
+        self.inode: Optional[int] = None
+
+    def poll(self) -> Tuple[pd.DataFrame, bool]:
+        """New rows (at most about max_bytes of them) and whether the file was rewritten"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return pd.DataFrame(), False
+        with open(self.path, 'rb') as f:
+            header = f.readline()
+            reset = False
+            if self.header is None:
+                # First read: start at the requested offset, or at the first record
+                self.offset = max(self.offset or 0, len(header))
+            elif header != self.header or stat.st_ino != self.inode or stat.st_size < self.offset:
+                self.offset = len(header)
+                reset = True
+            self.header, self.inode = header, stat.st_ino
+            f.seek(self.offset)
+            data = f.read(self.max_bytes)
+            end = complete_records_end(data)
+            if end == 0 and len(data) == self.max_bytes:
+                # A single record larger than the budget
+                data += f.read()
+                end = complete_records_end(data)
+        if end == 0:
+            return pd.DataFrame(), reset
+        self.offset += end
+        return pd.read_csv(io.BytesIO(header + data[:end])), reset
+
+
+class LiveAggregator:
+    """Running aggregates over results appended while a run is in progress.
+
+    Each refresh parses only the rows appended since the previous one and merges
+    their additive cube cells and usage sums into the running totals. Every
+    appended row counts, including retries of the same case.
+    """
+
+    def __init__(self, data_manager: CSVDataManager, run_id: Optional[str] = None,
+                 offset: Optional[int] = None, config: Optional[Config] = None,
+                 max_bytes: int = DEFAULT_MAX_BYTES, rate_window_s: float = 30.0):
+        self.data_manager = data_manager
+        self.run_id = run_id
+        self.thresholds, self.higher_is_better = get_metric_rules(config or data_manager.config or Config())
+        test_cases_df = data_manager.load_test_cases()
+        self.category_map = (test_cases_df.drop_duplicates('id').set_index('id')['category']
+                             if {'id', 'category'} <= set(test_cases_df.columns) and len(test_cases_df) else None)
+        self.tail = ResultsTail(data_manager.results_file, offset, max_bytes)
+        self.rate_window_s = rate_window_s
+        self.reset()
+
+    def reset(self):
+        self.partial = merge_partial_aggregates([])
+        self.usage = pd.DataFrame()
+        self.rows = 0
+        self.errors = 0
+        self.samples = deque([(time.monotonic(), 0)])
+
+    def refresh(self) -> int:
+        """Merge newly appended rows; returns how many rows were added"""
+        df, rewritten = self.tail.poll()
+        if rewritten:
+            self.reset()
+        if self.run_id is not None and not df.empty:
+            df = df[df['run_id'].astype(str) == self.run_id] if 'run_id' in df.columns else df.iloc[0:0]
+        if not df.empty:
+            self.partial = merge_partial_aggregates([
+                self.partial, build_partial_aggregates(df, self.category_map, self.thresholds, self.higher_is_better)
+            ])
+            usage = pd.concat([frame for frame in (self.usage, build_usage_partials(df)) if not frame.empty], ignore_index=True)
+            self.usage = usage.groupby('model_name', as_index=False, sort=True).sum(numeric_only=True)
+            self.rows += len(df)
+            self.errors += int(df['status'].eq('error').sum()) if 'status' in df.columns else 0
+
+        now = time.monotonic()
+        self.samples.append((now, self.rows))
+        while len(self.samples) > 2 and now - self.samples[1][0] > self.rate_window_s:
+            self.samples.popleft()
+        return len(df)
+
+    def throughput(self) -> float:
+        """Rows per second over the recent refreshes"""
+        (first_t, first_rows), (last_t, last_rows) = self.samples[0], self.samples[-1]
+        return (last_rows - first_rows) / (last_t - first_t) if last_t > first_t else 0.0
+
+    def cube(self) -> pd.DataFrame:
+        """Model x metric cells with running mean and pass rate"""
+        if self.partial.empty:
+            return self.partial
+        aggregations = {col: 'sum' for col in ADDITIVE_COLUMNS}
+        aggregations.update({'min': 'min', 'max': 'max'})
+        totals = self.partial.groupby(['model_name', 'metric'], sort=True).agg(aggregations).reset_index()
+        totals['category'] = ALL_CATEGORIES
+        return finalize_aggregates(totals)
+
+    def snapshot(self) -> Dict[str, Any]:
+        cube = self.cube()
+        return {
+            "rows": self.rows,
+            "errors": self.errors,
+            "rows_per_second": self.throughput(),
+            "pass_rates": metric_pass_rates(self.partial) if not self.partial.empty else {},
+            "cells": cube
+        }
@@ -0,0 +1,141 @@
+import re
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+import pandas as pd
+import yaml
+
+from src.data.csv_manager import CSVDataManager
+from src.utils.aggregation import (
+    ADDITIVE_COLUMNS, GROUP_KEYS, finalize_aggregates, finalize_usage, merge_partial_aggregates,
+    metric_pass_rates, model_averages
+)
+from src.utils.config import Config
+
+# The default project keeps using the top-level data directory
+DEFAULT_PROJECT = "default"
+PROJECTS_DIR = "projects"
+OVERRIDES_FILE = "project.yaml"
+PROJECT_NAME = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_-]{0,63}$")
+
+
+def _deep_merge(base: Dict[str, Any], overrides: Dict[str, Any]) -> Dict[str, Any]:
+    merged = dict(base)
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _deep_merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+class ProjectStore:
+    """Projects with their own data directory, config overrides and summary cache.
+
+    Each project directory is a complete CSVDataManager store, so reads and
+    writes of one team never touch another team's files. Cross-project views
+    merge the per-project summary cubes instead of scanning raw results.
+    """
+
+    def __init__(self, data_dir: str = "data", config_dir: str = "config"):
+        self.data_dir = Path(data_dir)
+        self.config_dir = config_dir
+        self.projects_dir = self.data_dir / PROJECTS_DIR
+
+    def list_projects(self) -> List[str]:
+        projects = [DEFAULT_PROJECT]
+        if self.projects_dir.exists():
+            projects += sorted(path.name for path in self.projects_dir.iterdir()
+                               if path.is_dir() and PROJECT_NAME.match(path.name) and path.name != DEFAULT_PROJECT)
+        return projects
+
+    def project_dir(self, name: str) -> Path:
+        if name == DEFAULT_PROJECT:
+            return self.data_dir
+        if not PROJECT_NAME.match(name):
+            raise ValueError(f"Invalid project name {name!r}: use letters, digits, '-' and '_'")
+        return self.projects_dir / name
+
+    def create_project(self, name: str, overrides: Optional[Dict[str, Any]] = None) -> Path:
+        """Create an empty project, optionally with config overrides"""
+        if name in self.list_projects():
+            raise ValueError(f"Project {name!r} already exists")
+        path = self.project_dir(name)
+        path.mkdir(parents=True)
+        if overrides:
+            self.save_overrides(name, overrides)
+        return path
+
+    def load_overrides(self, name: str) -> Dict[str, Any]:
+        """Config overrides as {'models': {...}, 'metrics': {...}}"""
+        path = self.project_dir(name) / OVERRIDES_FILE
+        if not path.exists():
+            return {}
+        with open(path, 'r') as f:
+            return yaml.safe_load(f) or {}
+
+    def save_overrides(self, name: str, overrides: Dict[str, Any]):
+        path = self.project_dir(name) / OVERRIDES_FILE
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as f:
+            yaml.dump(overrides, f, default_flow_style=False)
+
+    def get_config(self, name: str) -> Config:
+        """Global config with the project's overrides merged in (not written back)"""
+        config = Config(self.config_dir)
+        overrides = self.load_overrides(name)
+        config.models_config = _deep_merge(config.models_config, overrides.get('models', {}) or {})
+        config.metrics_config = _deep_merge(config.metrics_config, overrides.get('metrics', {}) or {})
+        return config
+
+    def get_data_manager(self, name: str = DEFAULT_PROJECT) -> CSVDataManager:
+        if name not in self.list_projects():
+            raise ValueError(f"Unknown project {name!r}")
+        return CSVDataManager(data_dir=self.project_dir(name), config=self.get_config(name))
+
+    def _partials(self, names: Optional[List[str]]):
+        for name in names or self.list_projects():
+            cube, meta = self.get_data_manager(name).get_summary_partials()
+            yield name, cube, meta
+
+    def cross_project_cube(self, names: Optional[List[str]] = None) -> pd.DataFrame:
+        """Model x category x metric cube over several projects, merged from their cached cubes.
+
+        Pass counts use each project's own thresholds. Percentiles cannot be
+        merged from summaries and are left out.
+        """
+        cubes = [cube[GROUP_KEYS + ADDITIVE_COLUMNS + ['min', 'max']] for _, cube, _ in self._partials(names)]
+        merged = merge_partial_aggregates(cubes)
+        return finalize_aggregates(merged) if not merged.empty else merged
+
+    def cross_project_summary(self, names: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Summary statistics over several projects, in the shape of get_summary_statistics"""
+        cubes, usage, projects = [], [], {}
+        category_counts: Dict[str, int] = {}
+        models = set()
+        for name, cube, meta in self._partials(names):
+            cubes.append(cube[GROUP_KEYS + ADDITIVE_COLUMNS + ['min', 'max']])
+            usage.extend(meta.get("usage", []))
+            models.update(meta.get("models_evaluated", []))
+            for category, count in meta.get("category_counts", {}).items():
+                category_counts[category] = category_counts.get(category, 0) + count
+            projects[name] = {
+                "total_evaluations": meta.get("total_evaluations", 0),
+                "total_test_cases": meta.get("total_test_cases", 0)
+            }
+
+        merged = merge_partial_aggregates(cubes)
+        cube = finalize_aggregates(merged) if not merged.empty else merged
+        usage_df = pd.DataFrame(usage)
+        if not usage_df.empty:
+            usage_df = usage_df.groupby('model_name', as_index=False).sum(numeric_only=True)
+        return {
+            "total_evaluations": sum(project["total_evaluations"] for project in projects.values()),
+            "total_test_cases": sum(project["total_test_cases"] for project in projects.values()),
+            "models_evaluated": sorted(models, key=str),
+            "average_scores": model_averages(cube) if not cube.empty else {},
+            "pass_rates": metric_pass_rates(cube) if not cube.empty else {},
+            "category_counts": category_counts,
+            "usage": finalize_usage(usage_df).set_index('model_name').to_dict('index') if not usage_df.empty else {},
+            "projects": projects
+        }
@@ -0,0 +1,253 @@
+import gzip
+import json
+import os
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional
+
+import pandas as pd
+
+from src.data.csv_manager import CSVDataManager
+from src.utils.aggregation import build_usage_partials, latest_results
+from src.utils.config import Config
+
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".csv.gz"
+
+
+def _parse_times(values: pd.Series) -> pd.Series:
+    return pd.to_datetime(values, errors='coerce', format='ISO8601')
+
+
+class RetentionManager:
+    """Moves old raw results into compressed archive segments while keeping their aggregates.
+
+    Each archive run writes one gzip CSV segment and updates two small tables
+    beside the segments: the latest archived row per case and model (keys,
+    status, scores and evaluator versions) and per-segment usage sums.
+    CSVDataManager scores the latest rows together with the live ones, so a
+    summary counts each case and model once whether or not it was archived,
+    and the planner does not re-run archived cells. Raw rows can be read back
+    with load_archived or moved back with restore. Archiving and restoring hold
+    the results file lock, so concurrent appends are never lost.
+    """
+
+    def __init__(self, data_manager: CSVDataManager, config: Optional[Config] = None):
+        self.data_manager = data_manager
+        self.config = config or data_manager.config or Config()
+        self.archive_dir = data_manager.archive_dir
+        settings = self.config.get_retention_settings()
+        self.enabled = settings.get('enabled', False)
+        self.max_age_days = settings.get('max_age_days', 180)
+        self.compaction_interval_hours = settings.get('compaction_interval_hours', 24)
+
+    def load_manifest(self) -> Dict[str, Any]:
+        if not self.data_manager.archive_manifest_file.exists():
+            return {"segments": [], "models": [], "last_compacted_at": None, "max_id": 0}
+        with open(self.data_manager.archive_manifest_file, 'r') as f:
+            return json.load(f)
+
+    def _save_manifest(self, manifest: Dict[str, Any]):
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.data_manager.archive_manifest_file.with_suffix(".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, self.data_manager.archive_manifest_file)
+
+    def _read_table(self, path) -> pd.DataFrame:
+        if not path.exists():
+            return pd.DataFrame()
+        return pd.read_csv(path, dtype={'segment': str, 'model_name': str, 'category': str, 'metric': str})
+
+    def _write_table(self, path, df: pd.DataFrame):
+        tmp_path = path.with_suffix(".tmp")
+        df.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, path)
+
+    def archive(self, older_than_days: Optional[float] = None, now: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+        """Move results evaluated more than `older_than_days` ago into a new segment.
+
+        Rows without a parseable evaluation_time stay live. Returns the segment's
+        manifest entry, or None when nothing was old enough.
+        """
+        with self.data_manager.results_lock():
+            return self._archive(older_than_days, now)
+
+    def _archive(self, older_than_days: Optional[float], now: Optional[datetime]) -> Optional[Dict[str, Any]]:
+        results_file = self.data_manager.results_file
+        if not results_file.exists():
+            return None
+        now = now or datetime.now()
+        cutoff = now - timedelta(days=self.max_age_days if older_than_days is None else older_than_days)
+
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        name = f"{SEGMENT_PREFIX}{now.strftime('%Y%m%dT%H%M%S%f')}{SEGMENT_SUFFIX}"
+        segment_path = self.archive_dir / name
+        segment_tmp = self.archive_dir / (name + ".tmp")
+        live_tmp = results_file.with_suffix(".csv.tmp")
+        latest, usage, times = [], [], []
+        archived_rows = 0
+        max_id = self.data_manager.archived_max_id()
+
+        with gzip.open(segment_tmp, 'wt', newline='') as segment, open(live_tmp, 'w', newline='') as live:
+            header = self.data_manager._read_results_header()
+            pd.DataFrame(columns=header).to_csv(live, index=False)
+            for chunk in self.data_manager.iter_evaluation_results():
+                evaluated_at = _parse_times(chunk['evaluation_time']) if 'evaluation_time' in chunk.columns \
+                    else pd.Series(pd.NaT, index=chunk.index)
+                old = (evaluated_at < cutoff).fillna(False)
+                chunk[~old].to_csv(live, index=False, header=False)
+                archived = chunk[old]
+                if archived.empty:
+                    continue
+                archived.to_csv(segment, index=False, header=archived_rows == 0)
+                archived_rows += len(archived)
+                if 'id' in archived.columns and archived['id'].notna().any():
+                    max_id = max(max_id, int(archived['id'].max()))
+                latest.append(latest_results(archived[self.data_manager.latest_columns(archived.columns)]))
+                usage.append(build_usage_partials(archived))
+                times.extend([evaluated_at[old].min(), evaluated_at[old].max()])
+
+        if not archived_rows:
+            segment_tmp.unlink()
+            live_tmp.unlink()
+            return None
+
+        # Earlier segments first, so the rows just archived win over older ones
+        latest_df = latest_results(pd.concat([self.data_manager.load_archive_latest(), *latest], ignore_index=True))
+        os.replace(segment_tmp, segment_path)
+        os.replace(live_tmp, results_file)
+
+        segment_id = name[:-len(SEGMENT_SUFFIX)]
+        usage_df = pd.concat(usage, ignore_index=True).groupby('model_name', as_index=False, sort=True).sum(numeric_only=True)
+        self._write_table(self.data_manager.archive_latest_file, latest_df)
+        self._write_table(self.data_manager.archive_usage_file,
+                          pd.concat([self._read_table(self.data_manager.archive_usage_file),
+                                     usage_df.assign(segment=segment_id)], ignore_index=True))
+
+        entry = {
+            "segment": segment_id,
+            "file": name,
+            "rows": archived_rows,
+            "min_evaluation_time": min(times).isoformat(),
+            "max_evaluation_time": max(times).isoformat(),
+            "archived_at": now.isoformat()
+        }
+        manifest = self.load_manifest()
+        manifest["segments"].append(entry)
+        manifest["models"] = sorted(set(manifest.get("models", [])) | set(usage_df['model_name']), key=str)
+        # New results are numbered above every archived id
+        manifest["max_id"] = max_id
+        self._save_manifest(manifest)
+        return entry
+
+    def compact(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Archive expired results and merge all archive segments into one"""
+        now = now or datetime.now()
+        archived = self.archive(now=now)
+        manifest = self.load_manifest()
+        merged = None
+        if len(manifest["segments"]) > 1:
+            merged = self._merge_segments(manifest, now)
+            manifest = self.load_manifest()
+        manifest["last_compacted_at"] = now.isoformat()
+        self._save_manifest(manifest)
+        return {
+            "archived_rows": archived["rows"] if archived else 0,
+            "merged_segments": merged or 0,
+            "segments": len(manifest["segments"])
+        }
+
+    def maybe_compact(self, now: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+        """Run compact() if retention is enabled and the compaction interval has passed"""
+        if not self.enabled:
+            return None
+        now = now or datetime.now()
+        last = self.load_manifest().get("last_compacted_at")
+        if last and now - datetime.fromisoformat(last) < timedelta(hours=self.compaction_interval_hours):
+            return None
+        return self.compact(now=now)
+
+    def _merge_segments(self, manifest: Dict[str, Any], now: datetime) -> int:
+        segments = manifest["segments"]
+        name = f"{SEGMENT_PREFIX}{now.strftime('%Y%m%dT%H%M%S%f')}-merged{SEGMENT_SUFFIX}"
+        tmp_path = self.archive_dir / (name + ".tmp")
+        columns: List[str] = []
+        for entry in segments:
+            columns += [col for col in pd.read_csv(self.archive_dir / entry["file"], nrows=0).columns if col not in columns]
+        with gzip.open(tmp_path, 'wt', newline='') as out:
+            pd.DataFrame(columns=columns).to_csv(out, index=False)
+            for entry in segments:
+                for chunk in pd.read_csv(self.archive_dir / entry["file"], chunksize=self.data_manager.chunk_size):
+                    chunk.reindex(columns=columns).to_csv(out, index=False, header=False)
+        os.replace(tmp_path, self.archive_dir / name)
+
+        segment_id = name[:-len(SEGMENT_SUFFIX)]
+        usage = self._read_table(self.data_manager.archive_usage_file)
+        if not usage.empty:
+            self._write_table(self.data_manager.archive_usage_file, usage.assign(segment=segment_id))
+        manifest["segments"] = [{
+            "segment": segment_id,
+            "file": name,
+            "rows": sum(entry["rows"] for entry in segments),
+            "min_evaluation_time": min(entry["min_evaluation_time"] for entry in segments),
+            "max_evaluation_time": max(entry["max_evaluation_time"] for entry in segments),
+            "archived_at": now.isoformat()
+        }]
+        self._save_manifest(manifest)
+        for entry in segments:
+            (self.archive_dir / entry["file"]).unlink()
+        return len(segments)
+
+    def load_archived(self, segments: Optional[List[str]] = None,
+                      filter_conditions: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+        """Read archived raw results, optionally limited to some segments and filtered"""
+        frames = []
+        for entry in self.load_manifest()["segments"]:
+            if segments is not None and entry["segment"] not in segments:
+                continue
+            for chunk in pd.read_csv(self.archive_dir / entry["file"], chunksize=self.data_manager.chunk_size):
+                frames.append(self.data_manager._apply_filters(chunk, filter_conditions))
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    def restore(self, segment: str) -> int:
+        """Move a segment's rows back into the live results file and drop them from the archive tables"""
+        with self.data_manager.results_lock():
+            return self._restore(segment)
+
+    def _restore(self, segment: str) -> int:
+        manifest = self.load_manifest()
+        entry = next((entry for entry in manifest["segments"] if entry["segment"] == segment), None)
+        if entry is None:
+            raise ValueError(f"Unknown archive segment {segment!r}")
+        restored = pd.read_csv(self.archive_dir / entry["file"])
+        live = self.data_manager.load_evaluation_results()
+        if 'id' in restored.columns:
+            # Rows whose id is taken (results saved before archived ids were reserved) get fresh ids
+            taken = set(live['id'].dropna()) if 'id' in live.columns else set()
+            clash = restored['id'].isna() | restored['id'].isin(taken) | restored['id'].duplicated()
+            if clash.any():
+                next_id = max([self.data_manager.archived_max_id(), *taken, *restored['id'].dropna()]) + 1
+                restored.loc[clash, 'id'] = range(int(next_id), int(next_id) + int(clash.sum()))
+                manifest["max_id"] = int(restored['id'].max())
+        combined = pd.concat([live, restored], ignore_index=True)
+        if 'id' in combined.columns:
+            combined = combined.sort_values('id', kind='stable')
+        tmp_path = self.data_manager.results_file.with_suffix(".csv.tmp")
+        combined.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, self.data_manager.results_file)
+
+        manifest["segments"] = [other for other in manifest["segments"] if other["segment"] != segment]
+        # Rows of the remaining segments that the restored ones had replaced become the latest again
+        latest = self.data_manager.build_archive_latest(manifest["segments"])
+        if not latest.empty:
+            self._write_table(self.data_manager.archive_latest_file, latest)
+        elif self.data_manager.archive_latest_file.exists():
+            self.data_manager.archive_latest_file.unlink()
+        usage = self._read_table(self.data_manager.archive_usage_file)
+        if not usage.empty:
+            usage = usage[usage['segment'] != segment]
+            self._write_table(self.data_manager.archive_usage_file, usage)
+        manifest["models"] = sorted(set(usage['model_name']), key=str) if not usage.empty else []
+        self._save_manifest(manifest)
+        (self.archive_dir / entry["file"]).unlink()
+        return len(restored)
@@ -0,0 +1,185 @@
+import re
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+CATEGORY = "category"
+TAG = "tag"
+# Tags are stored as free text such as "math, multi-step" or "math;geometry"
+TAG_SEPARATORS = re.compile(r"[,;|]")
+QUERY_TOKENS = re.compile(r"\s*(\(|\)|[^\s()]+)")
+
+
+def parse_tags(value) -> List[str]:
+    """Normalised, de-duplicated tags of a test case"""
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return []
+    tags = (tag.strip().lower() for tag in TAG_SEPARATORS.split(str(value)))
+    return list(dict.fromkeys(tag for tag in tags if tag))
+
+
+def term(kind: str, value) -> str:
+    return f"{kind}:{str(value).strip().lower()}"
+
+
+class TagIndex:
+    """Inverted index from category and tag terms to sorted arrays of test case ids.
+
+    Terms look like "category:reasoning" or "tag:math". Postings are stored
+    CSR-style in one .npz file (terms, offsets, ids) together with the
+    signature of the test cases file they were built from.
+    """
+
+    def __init__(self, postings: Optional[Dict[str, np.ndarray]] = None,
+                 all_ids: Optional[np.ndarray] = None, signature: Optional[List[int]] = None):
+        self.postings = postings or {}
+        self.all_ids = all_ids if all_ids is not None else np.array([], dtype=np.int64)
+        self.signature = signature
+
+    @classmethod
+    def build(cls, test_cases_df: pd.DataFrame) -> "TagIndex":
+        if test_cases_df.empty or 'id' not in test_cases_df.columns:
+            return cls()
+        ids = test_cases_df['id'].astype(np.int64).to_numpy()
+        terms, term_ids = [], []
+        if CATEGORY in test_cases_df.columns:
+            for case_id, category in zip(ids, test_cases_df[CATEGORY]):
+                if pd.notna(category):
+                    terms.append(term(CATEGORY, category))
+                    term_ids.append(case_id)
+        if 'tags' in test_cases_df.columns:
+            for case_id, tags in zip(ids, test_cases_df['tags']):
+                for tag in parse_tags(tags):
+                    terms.append(term(TAG, tag))
+                    term_ids.append(case_id)
+        pairs = pd.DataFrame({'term': terms, 'id': np.array(term_ids, dtype=np.int64)})
+        postings = {t: np.unique(group.to_numpy()) for t, group in pairs.groupby('term', sort=True)['id']}
+        return cls(postings, np.unique(ids))
+
+    def add(self, case_id: int, category=None, tags=None):
+        """Index one more test case"""
+        case_terms = ([term(CATEGORY, category)] if category is not None and not pd.isna(category) else []) + \
+            [term(TAG, tag) for tag in parse_tags(tags)]
+        for t in case_terms:
+            self.postings[t] = np.union1d(self.postings.get(t, np.array([], dtype=np.int64)), [case_id])
+        self.all_ids = np.union1d(self.all_ids, [case_id]).astype(np.int64)
+
+    def save(self, path: Path, signature: Optional[List[int]] = None):
+        self.signature = signature
+        terms = sorted(self.postings)
+        lengths = [len(self.postings[t]) for t in terms]
+        ids = np.concatenate([self.postings[t] for t in terms]) if terms else np.array([], dtype=np.int64)
+        tmp_path = Path(path).with_suffix(".tmp.npz")
+        np.savez_compressed(
+            tmp_path,
+            terms=np.array(terms, dtype=str),
+            offsets=np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64),
+            ids=ids.astype(np.int64),
+            all_ids=self.all_ids.astype(np.int64),
+            signature=np.array(signature if signature is not None else [], dtype=np.int64)
+        )
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> "TagIndex":
+        with np.load(path, allow_pickle=False) as data:
+            offsets, ids = data['offsets'], data['ids']
+            postings = {str(t): ids[offsets[i]:offsets[i + 1]] for i, t in enumerate(data['terms'])}
+            signature = data['signature'].tolist() or None
+            return cls(postings, data['all_ids'], signature)
+
+    def terms(self, kind: Optional[str] = None) -> List[str]:
+        return [t for t in self.postings if kind is None or t.startswith(f"{kind}:")]
+
+    def lookup(self, kind: str, value) -> np.ndarray:
+        return self.postings.get(term(kind, value), np.array([], dtype=np.int64))
+
+    def all_of(self, postings: Iterable[np.ndarray]) -> np.ndarray:
+        result = None
+        for ids in sorted(postings, key=len):
+            result = ids if result is None else np.intersect1d(result, ids, assume_unique=True)
+        return self.all_ids if result is None else result
+
+    @staticmethod
+    def any_of(postings: Iterable[np.ndarray]) -> np.ndarray:
+        postings = list(postings)
+        return np.unique(np.concatenate(postings)) if postings else np.array([], dtype=np.int64)
+
+    def exclude(self, ids: np.ndarray, removed: np.ndarray) -> np.ndarray:
+        return np.setdiff1d(ids, removed, assume_unique=True)
+
+    def select(self, categories: Optional[List[str]] = None, all_tags: Optional[List[str]] = None,
+               any_tags: Optional[List[str]] = None, exclude_tags: Optional[List[str]] = None) -> np.ndarray:
+        """Ids in any of `categories`, carrying every tag in `all_tags`, at least one of
+        `any_tags` and none of `exclude_tags`; omitted arguments do not filter"""
+        clauses = []
+        if categories:
+            clauses.append(self.any_of(self.lookup(CATEGORY, c) for c in categories))
+        clauses.extend(self.lookup(TAG, tag) for tag in all_tags or [])
+        if any_tags:
+            clauses.append(self.any_of(self.lookup(TAG, tag) for tag in any_tags))
+        ids = self.all_of(clauses)
+        if exclude_tags:
+            ids = self.exclude(ids, self.any_of(self.lookup(TAG, tag) for tag in exclude_tags))
+        return ids
+
+    def query(self, expression: str) -> np.ndarray:
+        """Evaluate e.g. "category:reasoning AND (tag:math OR tag:multi-step) AND NOT tag:flaky".
+
+        NOT binds tightest, then AND, then OR. A bare word is read as a tag.
+        """
+        tokens = QUERY_TOKENS.findall(expression)
+        position = 0
+
+        def peek() -> Optional[str]:
+            return tokens[position] if position < len(tokens) else None
+
+        def advance() -> str:
+            nonlocal position
+            position += 1
+            return tokens[position - 1]
+
+        def parse_or() -> np.ndarray:
+            ids = parse_and()
+            while peek() is not None and peek().upper() == "OR":
+                advance()
+                ids = self.any_of([ids, parse_and()])
+            return ids
+
+        def parse_and() -> np.ndarray:
+            ids = parse_not()
+            while peek() is not None and peek().upper() == "AND":
+                advance()
+                ids = self.all_of([ids, parse_not()])
+            return ids
+
+        def parse_not() -> np.ndarray:
+            if peek() is not None and peek().upper() == "NOT":
+                advance()
+                return self.exclude(self.all_ids, parse_not())
+            return parse_term()
+
+        def parse_term() -> np.ndarray:
+            token = peek()
+            if token is None or token == ")":
+                raise ValueError(f"Incomplete query: {expression!r}")
+            advance()
+            if token == "(":
+                ids = parse_or()
+                if peek() != ")":
+                    raise ValueError(f"Unbalanced parentheses in query: {expression!r}")
+                advance()
+                return ids
+            kind, _, value = token.partition(":")
+            if not value:
+                kind, value = TAG, token
+            if kind not in (CATEGORY, TAG):
+                raise ValueError(f"Unknown field {kind!r} in query; use category: or tag:")
+            return self.lookup(kind, value)
+
+        ids = parse_or()
+        if peek() is not None:
+            raise ValueError(f"Unexpected {peek()!r} in query: {expression!r}")
+        return ids
@@ -1,6 +1,25 @@
+import hashlib
+import json
 from abc import ABC, abstractmethod
 
 class BaseEvaluator(ABC):
+    # Bump when the scoring logic changes so earlier scores are treated as stale
+    version = "1"
+
     @abstractmethod
     def evaluate(self, input_text, expected_output, response_text, **kwargs):
-        pass
\ No newline at end of file
+        pass
+
+    def evaluate_metrics(self, input_text, expected_output, response_text, metrics, **kwargs):
+        """Results for each metric this evaluator is registered under; multi-metric evaluators
+        override this to score them all in one pass"""
+        return {metric: self.evaluate(input_text, expected_output, response_text, **kwargs) for metric in metrics}
+
+    def config_version(self):
+        """Short hash of the evaluator class, version and scalar settings"""
+        settings = {
+            key: value for key, value in vars(self).items()
+            if not key.startswith('_') and isinstance(value, (str, int, float, bool, type(None)))
+        }
+        payload = json.dumps([type(self).__name__, self.version, settings], sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:12]
@@ -0,0 +1,75 @@
+import threading
+from typing import Any, Callable, Dict, List
+
+
+class _Slot:
+    __slots__ = ('item', 'result', 'error', 'done', 'lead')
+
+    def __init__(self, item: Any):
+        self.item = item
+        self.result = None
+        self.error = None
+        self.done = False
+        self.lead = False
+
+
+class MicroBatcher:
+    """Packs items submitted concurrently from worker threads into batched calls.
+
+    `submit` blocks until its item's result is ready. The first waiting caller
+    leads a batch: it waits up to `max_wait_ms` for the batch to fill to
+    `max_batch` items, then calls `fn` with the items and hands each caller its
+    result, while the next waiting caller starts collecting the following batch.
+    A single thread therefore gets batches of one after at most `max_wait_ms`.
+    """
+
+    def __init__(self, fn: Callable[[List[Any]], List[Any]], max_batch: int = 8, max_wait_ms: float = 20.0):
+        self.fn = fn
+        self.max_batch = max(max_batch, 1)
+        self.max_wait_ms = max_wait_ms
+        self.pending: List[_Slot] = []
+        self.condition = threading.Condition()
+        self.batches = 0
+        self.items = 0
+
+    def submit(self, item: Any) -> Any:
+        slot = _Slot(item)
+        with self.condition:
+            self.pending.append(slot)
+            slot.lead = len(self.pending) == 1
+            self.condition.notify_all()
+            self.condition.wait_for(lambda: slot.lead or slot.done)
+        if not slot.done:
+            self._lead()
+        if slot.error is not None:
+            raise slot.error
+        return slot.result
+
+    def _lead(self):
+        with self.condition:
+            self.condition.wait_for(lambda: len(self.pending) >= self.max_batch, timeout=self.max_wait_ms / 1000)
+            batch, self.pending = self.pending[:self.max_batch], self.pending[self.max_batch:]
+            if self.pending:
+                self.pending[0].lead = True
+                self.condition.notify_all()
+        try:
+            results = self.fn([slot.item for slot in batch])
+            if len(results) != len(batch):
+                raise ValueError(f"Batch call returned {len(results)} results for {len(batch)} items")
+        except Exception as e:
+            results = [None] * len(batch)
+            for slot in batch:
+                slot.error = e
+        with self.condition:
+            for slot, result in zip(batch, results):
+                slot.result = result
+                slot.done = True
+            self.batches += 1
+            self.items += len(batch)
+            self.condition.notify_all()
+
+    def metrics(self) -> Dict[str, Any]:
+        """Batched calls made and the mean number of items per call"""
+        with self.condition:
+            return {"batches": self.batches, "items": self.items,
+                    "mean_batch": self.items / self.batches if self.batches else 0.0}
@@ -0,0 +1,204 @@
+import hashlib
+import json
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from .base_evaluator import BaseEvaluator
+from .batching import MicroBatcher
+from src.models.base_model import BaseModel
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+RUBRIC_HEADER = (
+    "You are an impartial judge grading a model's response to a test case. "
+    "Score every metric below from 0 to 1, where 1 is the best possible response for that metric. "
+    "Judge each metric on its own and give a one-sentence reason for each score."
+)
+
+
+def build_rubric(metrics: Dict[str, Dict[str, Any]]) -> str:
+    """Static system prompt for the metrics; identical across rows so judge servers can cache it"""
+    lines = [RUBRIC_HEADER, "", "Metrics:"]
+    for metric, info in metrics.items():
+        lines.append(f"- {metric} ({info.get('name', metric)}): {info.get('description', '')}")
+    lines += [
+        "",
+        "A single test case arrives as Input, Expected output and Response. Reply with only a JSON object "
+        "mapping each metric to {\"score\": number, \"reason\": string}.",
+        "Several numbered test cases arrive as Item 1, Item 2 and so on. Reply with only a JSON object "
+        "{\"results\": [...]} holding one such mapping per item, in item order, each with an \"item\" number."
+    ]
+    return "\n".join(lines)
+
+
+def score_schema(metrics: List[str]) -> Dict[str, Any]:
+    """JSON schema of one row's scores, used for structured output"""
+    verdict = {
+        "type": "object",
+        "properties": {"score": {"type": "number", "minimum": 0, "maximum": 1}, "reason": {"type": "string"}},
+        "required": ["score", "reason"]
+    }
+    return {"type": "object", "properties": {metric: verdict for metric in metrics}, "required": list(metrics)}
+
+
+def batch_schema(metrics: List[str]) -> Dict[str, Any]:
+    row = score_schema(metrics)
+    row = {**row, "properties": {"item": {"type": "integer"}, **row["properties"]}, "required": ["item"] + row["required"]}
+    return {"type": "object", "properties": {"results": {"type": "array", "items": row}}, "required": ["results"]}
+
+
+def _case_text(input_text: str, expected_output: str, response_text: str) -> str:
+    return f"Input:\n{input_text}\n\nExpected output:\n{expected_output}\n\nResponse:\n{response_text}"
+
+
+def parse_json(text: str) -> Any:
+    """The JSON object in a judge reply, tolerating code fences or text around it"""
+    try:
+        return json.loads(text)
+    except (TypeError, ValueError):
+        match = re.search(r"\{.*\}", text or "", re.DOTALL)
+        if match is None:
+            raise ValueError("Judge reply holds no JSON object")
+        return json.loads(match.group(0))
+
+
+def _verdict(value: Any) -> Dict[str, Any]:
+    """Normalise one metric's verdict to an evaluator result with the score clamped to 0-1"""
+    if isinstance(value, dict):
+        score, reason = value.get("score"), value.get("reason")
+    else:
+        score, reason = value, None
+    try:
+        score = min(max(float(score), 0.0), 1.0)
+    except (TypeError, ValueError):
+        return {"score": None, "details": f"Evaluation error: unreadable score {score!r}"}
+    return {"score": score, "details": reason}
+
+
+class MultiMetricJudgeEvaluator(BaseEvaluator):
+    """Scores every configured metric with one judge call per row.
+
+    Register one instance under each metric it scores, e.g.
+    `{metric: judge for metric in judge.metrics}`; the runner then calls
+    `evaluate_metrics` once per row. The rubric goes in a fixed system prompt
+    ahead of the row, so backends that cache prompt prefixes (Ollama's KV
+    cache, OpenAI prompt caching) only process the row itself. With
+    `rows_per_call` above one, rows scored concurrently by the runner's
+    workers are packed into a single call. Failed calls and unreadable replies
+    give a None score, which pass rates count as a failure.
+    """
+    version = "1"
+
+    def __init__(self, judge: BaseModel, metrics: Dict[str, Dict[str, Any]], rows_per_call: int = 1,
+                 max_wait_ms: float = 50.0, options: Optional[Dict[str, Any]] = None,
+                 keep_alive: Optional[str] = None):
+        self._judge = judge
+        self._metrics = dict(metrics)
+        self.judge_model = getattr(judge, 'model_name', type(judge).__name__)
+        self.rows_per_call = max(rows_per_call, 1)
+        # Scheduling settings stay private so changing them does not mark scores stale
+        self._keep_alive = keep_alive
+        self._options = {"temperature": 0, **(options or {})}
+        self._rubric = build_rubric(self._metrics)
+        # Part of config_version, so editing the rubric marks earlier scores stale
+        self.rubric_hash = hashlib.sha256(
+            json.dumps([self._rubric, self._options], sort_keys=True).encode('utf-8')
+        ).hexdigest()[:12]
+        self._batcher = MicroBatcher(self._score_rows, self.rows_per_call, max_wait_ms) if self.rows_per_call > 1 else None
+        self._lock = threading.Lock()
+        self._usage = {"calls": 0, "rows": 0, "failed_calls": 0, "prompt_tokens": 0, "completion_tokens": 0}
+
+    @classmethod
+    def from_config(cls, judge: BaseModel, config, **kwargs) -> "MultiMetricJudgeEvaluator":
+        """Judge for the default metrics, described as in metrics_config.yaml"""
+        available = config.get_available_metrics()
+        metrics = {metric: available.get(metric, {}) for metric in config.get_default_metrics()}
+        return cls(judge, metrics, **kwargs)
+
+    @property
+    def metrics(self) -> List[str]:
+        return list(self._metrics)
+
+    @property
+    def rubric(self) -> str:
+        return self._rubric
+
+    def _call(self, prompt: str, schema: Dict[str, Any]) -> Tuple[Optional[Any], Optional[str]]:
+        """(parsed reply, error) of one judge call"""
+        kwargs = {"system": self._rubric, "format": schema, "options": self._options}
+        if self._keep_alive is not None:
+            kwargs["keep_alive"] = self._keep_alive
+        record = self._judge.generate(prompt, **kwargs)
+        with self._lock:
+            self._usage["calls"] += 1
+            self._usage["prompt_tokens"] += record.prompt_tokens or 0
+            self._usage["completion_tokens"] += record.completion_tokens or 0
+            if not record.ok:
+                self._usage["failed_calls"] += 1
+        if not record.ok:
+            return None, f"Judge call failed: {record.error}"
+        try:
+            return parse_json(record.text), None
+        except ValueError as e:
+            logger.warning(f"Unreadable reply from judge {self.judge_model}: {str(e)}")
+            return None, f"Unreadable judge reply: {str(e)}"
+
+    def _row_results(self, verdicts: Any, error: Optional[str]) -> Dict[str, Dict[str, Any]]:
+        if error is None and not isinstance(verdicts, dict):
+            error = "Judge reply is not a JSON object"
+        if error is not None:
+            return {metric: {"score": None, "details": f"Evaluation error: {error}"} for metric in self._metrics}
+        return {
+            metric: _verdict(verdicts[metric]) if metric in verdicts
+            else {"score": None, "details": f"Evaluation error: judge gave no {metric} score"}
+            for metric in self._metrics
+        }
+
+    def _score_rows(self, rows: List[Tuple[str, str, str]]) -> List[Dict[str, Dict[str, Any]]]:
+        """Score rows of (input, expected output, response) with one judge call"""
+        with self._lock:
+            self._usage["rows"] += len(rows)
+        if len(rows) == 1:
+            verdicts, error = self._call(_case_text(*rows[0]), score_schema(self.metrics))
+            return [self._row_results(verdicts, error)]
+        prompt = "\n\n".join(f"Item {number}\n{_case_text(*row)}" for number, row in enumerate(rows, start=1))
+        reply, error = self._call(prompt, batch_schema(self.metrics))
+        items = reply.get("results") if isinstance(reply, dict) else None
+        if error is None and not isinstance(items, list):
+            error = "Judge reply has no results list"
+        by_number = {}
+        for position, item in enumerate(items or [], start=1):
+            if isinstance(item, dict):
+                by_number[item.get("item", position)] = item
+        return [
+            self._row_results(by_number.get(number), error or (None if number in by_number
+                                                                else f"judge gave no result for item {number}"))
+            for number in range(1, len(rows) + 1)
+        ]
+
+    def evaluate_metrics(self, input_text, expected_output, response_text, metrics, **kwargs):
+        row = (input_text, expected_output, response_text)
+        results = self._batcher.submit(row) if self._batcher is not None else self._score_rows([row])[0]
+        return {metric: results.get(metric, {"score": None, "details": "Evaluation error: metric not judged"})
+                for metric in metrics}
+
+    def evaluate(self, input_text, expected_output, response_text, **kwargs):
+        """Score of the first configured metric; the runner uses evaluate_metrics for all of them"""
+        metric = kwargs.get('metric', self.metrics[0])
+        return self.evaluate_metrics(input_text, expected_output, response_text, [metric])[metric]
+
+    def evaluate_many(self, rows: List[Tuple[str, str, str]]) -> List[Dict[str, Dict[str, Any]]]:
+        """Scores of every metric for each (input, expected output, response) row, rows_per_call rows a call"""
+        results = []
+        for start in range(0, len(rows), self.rows_per_call):
+            results.extend(self._score_rows(rows[start:start + self.rows_per_call]))
+        return results
+
+    def usage(self) -> Dict[str, Any]:
+        """Judge calls, rows scored and tokens; prompt tokens drop when the rubric prefix is cached"""
+        with self._lock:
+            usage = dict(self._usage)
+        usage["rows_per_call"] = usage["rows"] / usage["calls"] if usage["calls"] else 0.0
+        return usage
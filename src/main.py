@@ -5,6 +5,7 @@ from ui.pages.upload import show_upload_page
 from ui.pages.configure import show_configure_page
 from ui.pages.reports import show_reports_page
 from utils.config import Config
+from ui.components.projects import render_project_selector, run_scheduled_compaction
 from utils.logger import setup_logger
 
 st.set_page_config(
@@ -21,10 +22,11 @@ def initialize_session_state():
         st.session_state.config = Config()
     if 'current_page' not in st.session_state:
         st.session_state.current_page = "Dashboard"
-    if 'evaluation_results' not in st.session_state:
-        st.session_state.evaluation_results = []
-    if 'test_cases' not in st.session_state:
-        st.session_state.test_cases = []
+    # Counts only: test cases and results stay on disk and are streamed when needed
+    if 'evaluation_count' not in st.session_state:
+        st.session_state.evaluation_count = 0
+    if 'test_case_count' not in st.session_state:
+        st.session_state.test_case_count = 0
 
 def render_sidebar():
     st.sidebar.title("🤖 LLM Eval Framework")
@@ -41,10 +43,12 @@ def render_sidebar():
         index=list(pages.values()).index(st.session_state.current_page)
     )
     st.session_state.current_page = pages[selected_page]
-    if st.session_state.evaluation_results:
-        st.sidebar.metric("Total Evaluations", len(st.session_state.evaluation_results))
-    if st.session_state.test_cases:
-        st.sidebar.metric("Test Cases Loaded", len(st.session_state.test_cases))
+    render_project_selector()
+    run_scheduled_compaction()
+    if st.session_state.evaluation_count:
+        st.sidebar.metric("Total Evaluations", st.session_state.evaluation_count)
+    if st.session_state.test_case_count:
+        st.sidebar.metric("Test Cases Loaded", st.session_state.test_case_count)
 
 def main():
     try:
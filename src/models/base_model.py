@@ -1,6 +1,85 @@
+import time
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict, Any, Optional
+
+# Result columns filled from a GenerationRecord
+GENERATION_COLUMNS = [
+    'response_text', 'prompt_tokens', 'completion_tokens', 'duration_ms', 'load_duration_ms',
+    'prompt_eval_duration_ms', 'eval_duration_ms', 'tokens_per_second', 'cost_usd',
+    'status', 'error_message', 'coalesced'
+]
+
+
+def estimate_cost(pricing: Optional[Dict[str, float]], prompt_tokens: Optional[int],
+                  completion_tokens: Optional[int]) -> Optional[float]:
+    """Estimated cost in USD from per-1k-token input and output prices"""
+    if not pricing or prompt_tokens is None or completion_tokens is None:
+        return None
+    return (prompt_tokens / 1000 * pricing.get('input_per_1k', 0.0)
+            + completion_tokens / 1000 * pricing.get('output_per_1k', 0.0))
+
+
+@dataclass
+class GenerationRecord:
+    """Response text plus token counts, timings and cost of a single generation"""
+    text: str
+    model_name: str
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+    latency_ms: Optional[float] = None
+    total_duration_ms: Optional[float] = None
+    load_duration_ms: Optional[float] = None
+    prompt_eval_duration_ms: Optional[float] = None
+    eval_duration_ms: Optional[float] = None
+    cost_usd: Optional[float] = None
+    error: Optional[str] = None
+    # True when the response was shared from an identical request instead of generated
+    coalesced: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def tokens_per_second(self) -> Optional[float]:
+        """Decode throughput, from server-side timing when available"""
+        duration_ms = self.eval_duration_ms or self.total_duration_ms or self.latency_ms
+        if not self.completion_tokens or not duration_ms:
+            return None
+        return self.completion_tokens / (duration_ms / 1000)
+
+    def to_result_fields(self) -> Dict[str, Any]:
+        """Columns persisted with each evaluation result"""
+        return {
+            'response_text': self.text,
+            'prompt_tokens': self.prompt_tokens,
+            'completion_tokens': self.completion_tokens,
+            'duration_ms': self.latency_ms,
+            'load_duration_ms': self.load_duration_ms,
+            'prompt_eval_duration_ms': self.prompt_eval_duration_ms,
+            'eval_duration_ms': self.eval_duration_ms,
+            'tokens_per_second': self.tokens_per_second,
+            'cost_usd': self.cost_usd,
+            'status': 'success' if self.ok else 'error',
+            'error_message': self.error,
+            'coalesced': self.coalesced
+        }
+
 
 class BaseModel(ABC):
+    model_type = None
+
     @abstractmethod
     def generate_response(self, input_text, **kwargs):
-        pass
\ No newline at end of file
+        pass
+
+    def generate(self, input_text, **kwargs) -> GenerationRecord:
+        """Generate a response with accounting; handlers override this to report token usage"""
+        start = time.perf_counter()
+        text = self.generate_response(input_text, **kwargs)
+        return GenerationRecord(
+            text=text,
+            model_name=getattr(self, 'model_name', type(self).__name__),
+            latency_ms=(time.perf_counter() - start) * 1000
+        )
@@ -1,29 +1,78 @@
+import time
 import boto3
 import json
-from .base_model import BaseModel
+from .base_model import BaseModel, GenerationRecord, estimate_cost
+
+
+def _header_int(headers, name):
+    value = headers.get(name)
+    return int(value) if value is not None else None
+
 
 class BedrockHandler(BaseModel):
-    def __init__(self, model_name, region="us-east-1"):
+    model_type = "bedrock"
+
+    def __init__(self, model_name, region="us-east-1", pricing=None, endpoint_url=None, client_config=None):
         self.model_name = model_name
         self.region = region
+        self.pricing = pricing
+        client_kwargs = {}
+        if endpoint_url:
+            client_kwargs['endpoint_url'] = endpoint_url
+        if client_config is not None:
+            client_kwargs['config'] = client_config
         self.bedrock_runtime = boto3.client(
             service_name='bedrock-runtime',
-            region_name=self.region
+            region_name=self.region,
+            **client_kwargs
         )
 
-    def generate_response(self, input_text, **kwargs):
+    def generate(self, input_text, **kwargs):
+        start = time.perf_counter()
         try:
-            body = json.dumps({"prompt": input_text, "max_tokens": 100})
+            # Text completion models have no system role; a system prompt leads the prompt instead
+            prompt = f"{kwargs['system']}\n\n{input_text}" if kwargs.get('system') else input_text
+            body = json.dumps({"prompt": prompt, "max_tokens": 100})
             response = self.bedrock_runtime.invoke_model(
                 modelId=self.model_name,
                 body=body,
                 accept='application/json',
                 contentType='application/json'
             )
+            latency_ms = (time.perf_counter() - start) * 1000
             response_body = json.loads(response.get('body').read().decode())
             if 'results' in response_body and len(response_body['results']) > 0:
-                return response_body['results'][0].get('outputText', '')
+                text = response_body['results'][0].get('outputText', '')
+                completion_tokens = response_body['results'][0].get('tokenCount')
             else:
-                return "No response"
+                text = "No response"
+                completion_tokens = None
+            prompt_tokens = response_body.get('inputTextTokenCount')
+
+            # Bedrock reports token counts and model latency in response headers for every model family
+            headers = response.get('ResponseMetadata', {}).get('HTTPHeaders', {})
+            if prompt_tokens is None:
+                prompt_tokens = _header_int(headers, 'x-amzn-bedrock-input-token-count')
+            if completion_tokens is None:
+                completion_tokens = _header_int(headers, 'x-amzn-bedrock-output-token-count')
+            invocation_latency = _header_int(headers, 'x-amzn-bedrock-invocation-latency')
+
+            return GenerationRecord(
+                text=text,
+                model_name=self.model_name,
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                latency_ms=latency_ms,
+                total_duration_ms=float(invocation_latency) if invocation_latency is not None else None,
+                cost_usd=estimate_cost(self.pricing, prompt_tokens, completion_tokens)
+            )
         except Exception as e:
-            return f"Error generating response: {str(e)}"
\ No newline at end of file
+            return GenerationRecord(
+                text=f"Error generating response: {str(e)}",
+                model_name=self.model_name,
+                latency_ms=(time.perf_counter() - start) * 1000,
+                error=str(e)
+            )
+
+    def generate_response(self, input_text, **kwargs):
+        return self.generate(input_text, **kwargs).text
@@ -1,25 +1,77 @@
+import time
 import ollama
-from .base_model import BaseModel
+from .base_model import BaseModel, GenerationRecord, estimate_cost
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+
+def _ns_to_ms(value):
+    return value / 1e6 if value is not None else None
+
+
 class OllamaHandler(BaseModel):
-    def __init__(self, model_name):
+    model_type = "ollama"
+
+    def __init__(self, model_name, pricing=None, host="http://localhost:11434", keep_alive=None):
         self.model_name = model_name
+        self.pricing = pricing
+        self.host = host
+        # How long the server keeps the model loaded after a request, e.g. "10m"; None uses the server default
+        self.keep_alive = keep_alive
         try:
-            self.client = ollama.Client(host="http://localhost:11434")
+            self.client = ollama.Client(host=host)
         except Exception as e:
             logger.error(f"Failed to initialize Ollama client: {str(e)}")
             raise
 
-    def generate_response(self, input_text, **kwargs):
+    def generate(self, input_text, **kwargs):
+        """Chat with the model; optional kwargs: `system` (a fixed system prompt, kept first so the
+        server can reuse its cached prefix), `format` ("json" or a JSON schema), `options`, `keep_alive`"""
+        start = time.perf_counter()
         try:
+            messages = [{"role": "user", "content": input_text}]
+            if kwargs.get("system"):
+                messages.insert(0, {"role": "system", "content": kwargs["system"]})
             response = self.client.chat(
                 model=self.model_name,
-                messages=[{"role": "user", "content": input_text}]
+                messages=messages,
+                format=kwargs.get("format"),
+                options=kwargs.get("options"),
+                keep_alive=kwargs.get("keep_alive", self.keep_alive)
+            )
+            latency_ms = (time.perf_counter() - start) * 1000
+            prompt_tokens = response.get("prompt_eval_count")
+            completion_tokens = response.get("eval_count")
+            return GenerationRecord(
+                text=response["message"]["content"],
+                model_name=self.model_name,
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                latency_ms=latency_ms,
+                total_duration_ms=_ns_to_ms(response.get("total_duration")),
+                load_duration_ms=_ns_to_ms(response.get("load_duration")),
+                prompt_eval_duration_ms=_ns_to_ms(response.get("prompt_eval_duration")),
+                eval_duration_ms=_ns_to_ms(response.get("eval_duration")),
+                cost_usd=estimate_cost(self.pricing, prompt_tokens, completion_tokens)
             )
-            return response["message"]["content"]
         except Exception as e:
             logger.error(f"Error generating response with {self.model_name}: {str(e)}")
-            return f"Error generating response: {str(e)}"
\ No newline at end of file
+            return GenerationRecord(
+                text=f"Error generating response: {str(e)}",
+                model_name=self.model_name,
+                latency_ms=(time.perf_counter() - start) * 1000,
+                error=str(e)
+            )
+
+    def warm_up(self, keep_alive=None):
+        """Load the model without generating; returns the server-reported load time in ms"""
+        response = self.client.generate(model=self.model_name, prompt="", keep_alive=keep_alive or self.keep_alive)
+        return _ns_to_ms(response.get("load_duration"))
+
+    def unload(self):
+        """Ask the server to evict the model from memory now"""
+        self.client.generate(model=self.model_name, prompt="", keep_alive=0)
+
+    def generate_response(self, input_text, **kwargs):
+        return self.generate(input_text, **kwargs).text
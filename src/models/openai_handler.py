@@ -0,0 +1,248 @@
+import asyncio
+import json
+import os
+import threading
+import time
+import weakref
+from typing import Dict, Any, List, Optional, Tuple
+
+import httpx
+
+from .base_model import BaseModel, GenerationRecord, estimate_cost
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+BATCH_FINAL_STATES = ("completed", "failed", "expired", "cancelled")
+
+_clients: Dict[Tuple[str, int, float], httpx.Client] = {}
+# Async clients belong to the event loop they were created on, so they are kept per loop
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[str, int, float], httpx.AsyncClient]]" = \
+    weakref.WeakKeyDictionary()
+_clients_lock = threading.Lock()
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _limits(max_connections: int) -> httpx.Limits:
+    return httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+
+
+def get_http_client(base_url: str, max_connections: int = 32, timeout: float = 60.0) -> httpx.Client:
+    """Keep-alive connection pool shared by every handler talking to the same endpoint with the same settings"""
+    key = (base_url.rstrip("/"), max_connections, float(timeout))
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None or client.is_closed:
+            client = httpx.Client(timeout=timeout, limits=_limits(max_connections))
+            _clients[key] = client
+        return client
+
+
+def get_async_http_client(base_url: str, max_connections: int = 32, timeout: float = 60.0) -> httpx.AsyncClient:
+    """Async keep-alive pool per endpoint and settings, shared within the running event loop"""
+    loop = asyncio.get_running_loop()
+    key = (base_url.rstrip("/"), max_connections, float(timeout))
+    with _clients_lock:
+        clients = _async_clients.setdefault(loop, {})
+        client = clients.get(key)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(timeout=timeout, limits=_limits(max_connections))
+            clients[key] = client
+        return client
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    """Event loop on a daemon thread running generate_many calls, so their async clients outlive each call"""
+    global _loop
+    with _clients_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="openai-async", daemon=True).start()
+        return _loop
+
+
+def _error_message(error: Exception) -> str:
+    """Include the status code so the concurrency limiter can spot throttling"""
+    if isinstance(error, httpx.HTTPStatusError):
+        return f"HTTP {error.response.status_code}: {error.response.text[:500]}"
+    return str(error)
+
+
+class OpenAIHandler(BaseModel):
+    """Chat completions against OpenAI or any compatible server (vLLM, llama.cpp server).
+
+    Requests share a pooled keep-alive client per endpoint. `generate_many` runs
+    prompts concurrently on a shared async client and `run_batch` submits them
+    through the Batch API for large offline runs; `EvaluationRunner.run_batch`
+    uses both.
+    """
+    model_type = "openai"
+
+    def __init__(self, model_name, base_url="https://api.openai.com/v1", api_key=None, pricing=None,
+                 timeout=60.0, max_connections=32, max_tokens=None, temperature=None):
+        self.model_name = model_name
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key or os.environ.get("OPENAI_API_KEY", "")
+        self.pricing = pricing
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self.client = get_http_client(self.base_url, max_connections, timeout)
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+
+    def _payload(self, input_text: str, **kwargs) -> Dict[str, Any]:
+        """Request body; `system`, `format` ("json" or a JSON schema) and Ollama-style `options`
+        are mapped onto the chat completions fields"""
+        messages = [{"role": "user", "content": input_text}]
+        if kwargs.get("system"):
+            # A fixed system prompt first lets the server reuse its cached prefix
+            messages.insert(0, {"role": "system", "content": kwargs["system"]})
+        payload = {"model": self.model_name, "messages": messages}
+        options = kwargs.get("options") or {}
+        for key in ("max_tokens", "temperature"):
+            value = kwargs.get(key, options.get(key, getattr(self, key)))
+            if value is not None:
+                payload[key] = value
+        response_format = kwargs.get("format")
+        if response_format == "json":
+            payload["response_format"] = {"type": "json_object"}
+        elif isinstance(response_format, dict):
+            payload["response_format"] = {"type": "json_schema",
+                                          "json_schema": {"name": "response", "schema": response_format}}
+        return payload
+
+    def _record(self, body: Dict[str, Any], latency_ms: Optional[float]) -> GenerationRecord:
+        usage = body.get("usage") or {}
+        prompt_tokens = usage.get("prompt_tokens")
+        completion_tokens = usage.get("completion_tokens")
+        return GenerationRecord(
+            text=body["choices"][0]["message"].get("content") or "",
+            model_name=self.model_name,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            latency_ms=latency_ms,
+            cost_usd=estimate_cost(self.pricing, prompt_tokens, completion_tokens)
+        )
+
+    def _error_record(self, error: str, latency_ms: Optional[float]) -> GenerationRecord:
+        return GenerationRecord(
+            text=f"Error generating response: {error}",
+            model_name=self.model_name,
+            latency_ms=latency_ms,
+            error=error
+        )
+
+    def generate(self, input_text, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = self.client.post(f"{self.base_url}/chat/completions",
+                                        json=self._payload(input_text, **kwargs), headers=self.headers)
+            response.raise_for_status()
+            return self._record(response.json(), (time.perf_counter() - start) * 1000)
+        except Exception as e:
+            logger.error(f"Error generating response with {self.model_name}: {_error_message(e)}")
+            return self._error_record(_error_message(e), (time.perf_counter() - start) * 1000)
+
+    def generate_response(self, input_text, **kwargs):
+        return self.generate(input_text, **kwargs).text
+
+    async def agenerate(self, input_text, client: httpx.AsyncClient, **kwargs) -> GenerationRecord:
+        start = time.perf_counter()
+        try:
+            response = await client.post(f"{self.base_url}/chat/completions",
+                                         json=self._payload(input_text, **kwargs), headers=self.headers)
+            response.raise_for_status()
+            return self._record(response.json(), (time.perf_counter() - start) * 1000)
+        except Exception as e:
+            logger.error(f"Error generating response with {self.model_name}: {_error_message(e)}")
+            return self._error_record(_error_message(e), (time.perf_counter() - start) * 1000)
+
+    async def agenerate_many(self, prompts: List[str], concurrency: int = 16, **kwargs) -> List[GenerationRecord]:
+        """Generate for every prompt with at most `concurrency` requests in flight, keeping order"""
+        semaphore = asyncio.Semaphore(concurrency)
+        client = get_async_http_client(self.base_url, self.max_connections, self.timeout)
+
+        async def one(prompt):
+            async with semaphore:
+                return await self.agenerate(prompt, client, **kwargs)
+        return await asyncio.gather(*(one(prompt) for prompt in prompts))
+
+    def generate_many(self, prompts: List[str], concurrency: int = 16, **kwargs) -> List[GenerationRecord]:
+        """Blocking wrapper around agenerate_many, run on a shared background event loop"""
+        return asyncio.run_coroutine_threadsafe(
+            self.agenerate_many(prompts, concurrency, **kwargs), _background_loop()
+        ).result()
+
+    def submit_batch(self, prompts: List[str], **kwargs) -> str:
+        """Upload the prompts as a batch input file and start a batch; returns the batch id.
+
+        Each request's custom_id is the prompt's position in `prompts`.
+        """
+        lines = [
+            json.dumps({"custom_id": str(index), "method": "POST", "url": BATCH_ENDPOINT,
+                        "body": self._payload(prompt, **kwargs)})
+            for index, prompt in enumerate(prompts)
+        ]
+        upload = self.client.post(
+            f"{self.base_url}/files", headers=self.headers, data={"purpose": "batch"},
+            files={"file": ("batch_input.jsonl", ("\n".join(lines) + "\n").encode("utf-8"), "application/jsonl")}
+        )
+        upload.raise_for_status()
+        batch = self.client.post(
+            f"{self.base_url}/batches", headers=self.headers,
+            json={"input_file_id": upload.json()["id"], "endpoint": BATCH_ENDPOINT, "completion_window": "24h"}
+        )
+        batch.raise_for_status()
+        return batch.json()["id"]
+
+    def batch_status(self, batch_id: str) -> Dict[str, Any]:
+        response = self.client.get(f"{self.base_url}/batches/{batch_id}", headers=self.headers)
+        response.raise_for_status()
+        return response.json()
+
+    def collect_batch(self, batch: Dict[str, Any], count: int) -> List[GenerationRecord]:
+        """Records of a finished batch in prompt order; requests without output become errors"""
+        records: List[Optional[GenerationRecord]] = [None] * count
+        for file_key in ("output_file_id", "error_file_id"):
+            if not batch.get(file_key):
+                continue
+            response = self.client.get(f"{self.base_url}/files/{batch[file_key]}/content", headers=self.headers)
+            response.raise_for_status()
+            for line in response.text.splitlines():
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                index = int(item["custom_id"])
+                result = item.get("response") or {}
+                if result.get("status_code") == 200:
+                    records[index] = self._record(result["body"], None)
+                else:
+                    error = item.get("error") or result.get("body", {}).get("error") or "batch request failed"
+                    records[index] = self._error_record(f"HTTP {result.get('status_code')}: {error}", None)
+        status = batch.get("status")
+        return [record or self._error_record(f"No batch output (batch {status})", None) for record in records]
+
+    def run_batch(self, prompts: List[str], poll_interval_s: float = 30.0,
+                  timeout_s: float = 24 * 3600, **kwargs) -> List[GenerationRecord]:
+        """Submit prompts as one batch and wait for the results"""
+        if not prompts:
+            return []
+        try:
+            batch_id = self.submit_batch(prompts, **kwargs)
+            deadline = time.monotonic() + timeout_s
+            batch = self.batch_status(batch_id)
+            while batch.get("status") not in BATCH_FINAL_STATES:
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Batch {batch_id} still {batch.get('status')} after {timeout_s:.0f}s")
+                time.sleep(poll_interval_s)
+                batch = self.batch_status(batch_id)
+            logger.info(f"Batch {batch_id} {batch['status']}: {batch.get('request_counts')}")
+            return self.collect_batch(batch, len(prompts))
+        except Exception as e:
+            logger.error(f"Batch run with {self.model_name} failed: {_error_message(e)}")
+            return [self._error_record(_error_message(e), None) for _ in prompts]
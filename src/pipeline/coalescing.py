@@ -0,0 +1,91 @@
+import json
+import threading
+from dataclasses import replace
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from src.models.base_model import BaseModel, GenerationRecord
+
+
+def request_key(model_name: str, prompt: str, params: Optional[Dict[str, Any]] = None) -> Tuple[str, str, str]:
+    """Identity of a generation request: identical keys produce interchangeable responses"""
+    return model_name, prompt, json.dumps(params or {}, sort_keys=True, default=str)
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error', 'kept')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.kept = False
+
+
+class SingleFlight:
+    """Runs at most one call per key; concurrent and later callers share its result.
+
+    Results are kept for the lifetime of the instance (one evaluation run), unless
+    `keep` rejects them, in which case the next caller with that key retries.
+    With `retain=False` only callers arriving while a call is in flight share it,
+    so memory does not grow with the number of distinct keys.
+    """
+
+    def __init__(self, retain: bool = True):
+        self.retain = retain
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.calls = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any], keep: Callable[[Any], bool] = lambda result: True) -> Tuple[Any, bool]:
+        """Return (result, shared) where shared is True if another caller's call was reused.
+
+        Callers waiting on a call whose result `keep` rejects retry instead of
+        sharing it; only results that were reused count as shared.
+        """
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                leader = call is None
+                if leader:
+                    call = self._calls[key] = _Call()
+                    self.calls += 1
+
+            if leader:
+                break
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            if call.kept:
+                with self._lock:
+                    self.shared += 1
+                return call.result, True
+
+        try:
+            call.result = fn()
+            call.kept = keep(call.result)
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            if not self.retain or not call.kept:
+                with self._lock:
+                    self._calls.pop(key, None)
+            call.done.set()
+        return call.result, False
+
+
+def coalesced_generate(flight: SingleFlight, model: BaseModel, prompt: str,
+                       params: Optional[Dict[str, Any]] = None) -> GenerationRecord:
+    """Generate through the flight; failed generations are not reused by later callers.
+
+    Shared records are flagged coalesced and carry no cost; usage sums leave out
+    their tokens and times, so run totals reflect the work the backend did.
+    """
+    model_name = getattr(model, 'model_name', type(model).__name__)
+    record, shared = flight.do(
+        request_key(model_name, prompt, params),
+        lambda: model.generate(prompt, **(params or {})),
+        keep=lambda generated: generated.ok
+    )
+    return replace(record, cost_usd=0.0 if record.cost_usd is not None else None, coalesced=True) if shared else record
@@ -0,0 +1,181 @@
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, Optional
+
+from src.models.base_model import BaseModel, GenerationRecord
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+SUCCESS = "success"
+ERROR = "error"
+THROTTLED = "throttled"
+
+# Substrings of backend error messages that mean "slow down" rather than "broken"
+THROTTLE_MARKERS = ("throttl", "429", "503", "too many requests", "rate exceeded", "service unavailable")
+
+
+def classify_error(error: Optional[str]) -> str:
+    """Map a generation error message to a limiter outcome"""
+    if not error:
+        return SUCCESS
+    lowered = error.lower()
+    return THROTTLED if any(marker in lowered for marker in THROTTLE_MARKERS) else ERROR
+
+
+class AdaptiveLimiter:
+    """Additive-increase / multiplicative-decrease limit on in-flight requests to one backend.
+
+    Latency is compared against a slowly rising minimum (the baseline). While the
+    smoothed latency stays within `latency_tolerance` times the baseline and the
+    limit is in use, the limit grows by `increase` per window of completions; a
+    throttle, error or latency blow-up cuts it by `decrease_factor`, at most once
+    per window so a burst of failures from the same window counts once.
+    """
+
+    def __init__(self, name: str = "backend", initial_limit: int = 4, min_limit: int = 1, max_limit: int = 64,
+                 increase: float = 1.0, decrease_factor: float = 0.5, latency_tolerance: float = 2.0,
+                 smoothing: float = 0.2, baseline_drift: float = 0.01, goodput_window_s: float = 30.0):
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.smoothing = smoothing
+        self.baseline_drift = baseline_drift
+        self.goodput_window_s = goodput_window_s
+
+        self._limit = float(min(max(initial_limit, min_limit), max_limit))
+        self._in_flight = 0
+        self._condition = threading.Condition()
+        self._baseline_ms: Optional[float] = None
+        self._latency_ms: Optional[float] = None
+        self._last_decrease = 0.0
+        self._completions = deque()
+        self._counts = {SUCCESS: 0, ERROR: 0, THROTTLED: 0}
+        self._tokens = 0
+        self._decreases = 0
+
+    @property
+    def limit(self) -> int:
+        return max(int(self._limit), self.min_limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def acquire(self, timeout: Optional[float] = None) -> Optional[float]:
+        """Wait for a free slot; returns the start time to pass to release, or None on timeout"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while self._in_flight >= self.limit:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._condition.wait(remaining)
+            self._in_flight += 1
+            return time.monotonic()
+
+    def release(self, started_at: float, outcome: str = SUCCESS, tokens: Optional[int] = None):
+        """Return a slot and feed the request's latency and outcome into the limit"""
+        now = time.monotonic()
+        latency_ms = (now - started_at) * 1000
+        with self._condition:
+            saturated = self._in_flight >= self.limit
+            self._in_flight -= 1
+            self._counts[outcome] = self._counts.get(outcome, 0) + 1
+
+            if outcome == SUCCESS:
+                self._completions.append(now)
+                self._tokens += tokens or 0
+                self._observe_latency(latency_ms)
+                if self._latency_ms > self.latency_tolerance * self._baseline_ms:
+                    self._decrease(started_at, now, "latency")
+                elif saturated:
+                    self._limit = min(self._limit + self.increase / self.limit, float(self.max_limit))
+            else:
+                self._decrease(started_at, now, outcome)
+            self._condition.notify_all()
+
+    def _observe_latency(self, latency_ms: float):
+        if self._baseline_ms is None:
+            self._baseline_ms = self._latency_ms = latency_ms
+            return
+        self._latency_ms += self.smoothing * (latency_ms - self._latency_ms)
+        if latency_ms < self._baseline_ms:
+            self._baseline_ms = latency_ms
+        else:
+            # Let the baseline follow genuine shifts (a longer prompt mix) slowly
+            self._baseline_ms += self.baseline_drift * (latency_ms - self._baseline_ms)
+
+    def _decrease(self, started_at: float, now: float, reason: str):
+        # Requests started before the last cut were sent under the old limit
+        if started_at < self._last_decrease:
+            return
+        previous = self.limit
+        self._limit = max(self._limit * self.decrease_factor, float(self.min_limit))
+        self._last_decrease = now
+        self._decreases += 1
+        if reason == "latency":
+            # Restart smoothing from the baseline so one slow window triggers one cut
+            self._latency_ms = self._baseline_ms
+        logger.info(f"{self.name}: concurrency {previous} -> {self.limit} ({reason})")
+
+    def metrics(self) -> Dict[str, Any]:
+        """Live limit, latency estimates, outcome counts and goodput over the recent window"""
+        now = time.monotonic()
+        with self._condition:
+            while self._completions and now - self._completions[0] > self.goodput_window_s:
+                self._completions.popleft()
+            window = min(self.goodput_window_s, now - self._completions[0]) if self._completions else 0.0
+            return {
+                "limit": self.limit,
+                "in_flight": self._in_flight,
+                "baseline_latency_ms": self._baseline_ms,
+                "latency_ms": self._latency_ms,
+                "succeeded": self._counts[SUCCESS],
+                "errors": self._counts[ERROR],
+                "throttled": self._counts[THROTTLED],
+                "decreases": self._decreases,
+                "completion_tokens": self._tokens,
+                "goodput_per_s": len(self._completions) / window if window > 0 else 0.0
+            }
+
+
+class AdaptiveModel(BaseModel):
+    """Runs a handler's generations through an AdaptiveLimiter"""
+
+    def __init__(self, model: BaseModel, limiter: Optional[AdaptiveLimiter] = None):
+        self.model = model
+        self.model_name = getattr(model, 'model_name', type(model).__name__)
+        self.model_type = model.model_type
+        self.limiter = limiter or AdaptiveLimiter(name=self.model_name)
+
+    def generate(self, input_text, **kwargs) -> GenerationRecord:
+        started_at = self.limiter.acquire()
+        record = None
+        try:
+            record = self.model.generate(input_text, **kwargs)
+            return record
+        finally:
+            if record is None:
+                self.limiter.release(started_at, ERROR)
+            else:
+                self.limiter.release(started_at, classify_error(record.error), record.completion_tokens)
+
+    def generate_response(self, input_text, **kwargs):
+        return self.generate(input_text, **kwargs).text
+
+
+_limiters: Dict[str, AdaptiveLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(key: str, **settings) -> AdaptiveLimiter:
+    """Process-wide limiter for a backend, so every handler for it shares one limit"""
+    with _limiters_lock:
+        if key not in _limiters:
+            _limiters[key] = AdaptiveLimiter(name=key, **settings)
+        return _limiters[key]
@@ -0,0 +1,161 @@
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+import pandas as pd
+
+from src.data.csv_manager import CSVDataManager
+from src.data.datasets import case_hash
+from src.evaluators.base_evaluator import BaseEvaluator
+from src.models.base_model import BaseModel
+
+FRESH = "fresh"
+MISSING = "missing"
+STALE = "stale"
+
+
+def version_column(metric: str) -> str:
+    """Result column recording which evaluator configuration produced a metric's score"""
+    return f"{metric}_evaluator_version"
+
+
+def _hash_of(test_case: Dict[str, Any]) -> str:
+    stored = test_case.get('case_hash')
+    return stored if isinstance(stored, str) else case_hash(test_case)
+
+
+@dataclass
+class PlannedTask:
+    """Metrics to (re)compute for one model and test case"""
+    model: BaseModel
+    test_case: Dict[str, Any]
+    metrics: List[str]
+    # A stored successful response to score instead of generating a new one
+    response_text: Optional[str] = None
+
+
+@dataclass
+class EvaluationPlan:
+    """Work needed to complete the test cases x models x metrics matrix"""
+    tasks: List[PlannedTask] = field(default_factory=list)
+    cells: Dict[str, int] = field(default_factory=lambda: {FRESH: 0, MISSING: 0, STALE: 0})
+
+    @property
+    def total_cells(self) -> int:
+        return sum(self.cells.values())
+
+    @property
+    def scheduled_cells(self) -> int:
+        return self.cells[MISSING] + self.cells[STALE]
+
+    @property
+    def generations(self) -> int:
+        return sum(task.response_text is None for task in self.tasks)
+
+    def summary(self) -> Dict[str, int]:
+        return {
+            "total_cells": self.total_cells,
+            "fresh_cells": self.cells[FRESH],
+            "missing_cells": self.cells[MISSING],
+            "stale_cells": self.cells[STALE],
+            "tasks": len(self.tasks),
+            "generations": self.generations,
+            "generations_reused": len(self.tasks) - self.generations
+        }
+
+
+def _case_id(value: Any) -> Optional[int]:
+    """Test case id as an int, or None when missing"""
+    try:
+        return None if pd.isna(value) else int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _cells(df: pd.DataFrame) -> Set[Tuple[str, str, Optional[int]]]:
+    """(case_hash, model, test_case_id) cells of result rows"""
+    ids = df['test_case_id'] if 'test_case_id' in df.columns else [None] * len(df)
+    return set(zip(df['case_hash'], df['model_name'], (_case_id(value) for value in ids)))
+
+
+def _scored_cells(results_df: pd.DataFrame, metric: str, version: str) -> Tuple[Set, Set]:
+    """(case_hash, model, test_case_id) cells scored for a metric by the current evaluator version, and by any version"""
+    score_column = f"{metric}_score"
+    if score_column not in results_df.columns or results_df.empty:
+        return set(), set()
+    scored = results_df[results_df[score_column].notna()]
+    any_version = _cells(scored)
+    column = version_column(metric)
+    if column not in scored.columns:
+        return set(), any_version
+    return _cells(scored[scored[column].astype(str) == version]), any_version
+
+
+def _stored_responses(data_manager: CSVDataManager, wanted: Set[Tuple[str, str]]) -> Dict[Tuple[str, str], str]:
+    """Latest successful response text for each wanted (case_hash, model) pair, read in chunks"""
+    responses = {}
+    if not wanted:
+        return responses
+    for chunk in data_manager.iter_evaluation_results(['case_hash', 'model_name', 'status', 'response_text']):
+        if 'case_hash' not in chunk.columns:
+            return responses
+        chunk = chunk[chunk['status'].eq('success') & chunk['response_text'].notna()] if 'status' in chunk.columns else chunk
+        for key, text in zip(zip(chunk['case_hash'], chunk['model_name']), chunk['response_text']):
+            if key in wanted:
+                responses[key] = text
+    return responses
+
+
+def plan_evaluation(test_cases: List[Dict[str, Any]], models: List[BaseModel],
+                    evaluators: Dict[str, BaseEvaluator], data_manager: CSVDataManager,
+                    reuse_responses: bool = True) -> EvaluationPlan:
+    """Compare the requested matrix with the results store and schedule only missing or stale cells.
+
+    A cell is fresh when a successful result for the same test case id and content,
+    model and evaluator config version exists. Cells scored by an older evaluator
+    version are stale. Where a successful response to the same content is already
+    stored, even under another test case id, it is re-scored instead of generated
+    again.
+    """
+    versions = {metric: evaluator.config_version() for metric, evaluator in evaluators.items()}
+    plan = EvaluationPlan()
+    columns = ['case_hash', 'model_name', 'test_case_id', 'status'] + [
+        col for metric in evaluators for col in (f"{metric}_score", version_column(metric))
+    ]
+    results_df = data_manager.load_evaluation_results(columns=columns)
+    # Archived cells count as done; their responses are not kept live, so stale ones are generated again
+    archived = data_manager.load_archive_latest()
+    if not archived.empty:
+        archived = archived[[col for col in columns if col in archived.columns]]
+        results_df = pd.concat([archived, results_df], ignore_index=True) if not results_df.empty else archived
+    if 'case_hash' not in results_df.columns:
+        results_df = pd.DataFrame(columns=['case_hash', 'model_name'])
+    elif 'status' in results_df.columns:
+        results_df = results_df[results_df['status'].eq('success')]
+    scored = {metric: _scored_cells(results_df, metric, version) for metric, version in versions.items()}
+    # Responses depend only on content and model, so they can be shared across test case ids
+    generated = set(zip(results_df['case_hash'], results_df['model_name']))
+
+    pending = []
+    for test_case in test_cases:
+        h = _hash_of(test_case)
+        for model in models:
+            key = (h, getattr(model, 'model_name', type(model).__name__))
+            cell = key + (_case_id(test_case.get('id')),)
+            metrics = []
+            for metric in evaluators:
+                current, any_version = scored[metric]
+                if cell in current:
+                    plan.cells[FRESH] += 1
+                else:
+                    plan.cells[STALE if cell in any_version else MISSING] += 1
+                    metrics.append(metric)
+            if metrics:
+                pending.append((key, model, test_case, metrics))
+
+    responses = {}
+    if reuse_responses:
+        responses = _stored_responses(data_manager, {key for key, *_ in pending if key in generated})
+    plan.tasks = [
+        PlannedTask(model, test_case, metrics, responses.get(key)) for key, model, test_case, metrics in pending
+    ]
+    return plan
@@ -0,0 +1,466 @@
+import json
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+import pandas as pd
+from datetime import datetime
+from typing import Callable, Dict, Any, Iterable, List, Optional, Tuple
+from src.models.base_model import BaseModel, GenerationRecord
+from src.evaluators.base_evaluator import BaseEvaluator
+from src.data.csv_manager import CSVDataManager
+from src.data.datasets import case_hash
+from src.utils.aggregation import build_usage_partials, finalize_usage, get_metric_rules
+from src.utils.config import Config
+from src.utils.logger import setup_logger
+from src.utils.tracing import Tracer, get_tracer
+from src.pipeline.coalescing import SingleFlight, coalesced_generate
+from src.pipeline.sequential import SequentialTest, case_passed, stratified_order
+from src.pipeline.planner import EvaluationPlan, plan_evaluation, version_column
+from src.pipeline.scheduler import ModelScheduler
+from src.pipeline.streaming import BoundedPipeline
+
+logger = setup_logger(__name__)
+
+
+def _text(value) -> str:
+    """Test case fields read from CSV may be NaN"""
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return ""
+    return str(value)
+
+
+class _ResultWriter:
+    """Appends finished rows to the results store in small batches so live views can follow a run"""
+
+    def __init__(self, data_manager: CSVDataManager, tracer: Tracer, run_id: str,
+                 flush_rows: int, flush_interval_s: float):
+        self.data_manager = data_manager
+        self.tracer = tracer
+        self.run_id = run_id
+        self.flush_rows = flush_rows
+        self.flush_interval_s = flush_interval_s
+        self.pending: List[Dict[str, Any]] = []
+        self.completed = 0
+        self.failed = 0
+        # Running usage sums per model, so a run's summary does not need its rows
+        self.usage = build_usage_partials(pd.DataFrame())
+        self.saved = True
+        self.last_flush = time.monotonic()
+
+    def add(self, row: Dict[str, Any]):
+        self.pending.append(row)
+        if len(self.pending) >= self.flush_rows or time.monotonic() - self.last_flush >= self.flush_interval_s:
+            self.flush()
+
+    def flush(self):
+        self.last_flush = time.monotonic()
+        if not self.pending:
+            return
+        rows, self.pending = self.pending, []
+        with self.tracer.span("persist", rows=len(rows)):
+            self.saved = self.data_manager.save_evaluation_results(rows) and self.saved
+        self.completed += len(rows)
+        self.failed += sum(row.get('status') == 'error' for row in rows)
+        partial = build_usage_partials(pd.DataFrame(rows))
+        self.usage = pd.concat([self.usage, partial]) if not self.usage.empty else partial
+        self.usage = self.usage.groupby('model_name', as_index=False).sum(numeric_only=True)
+        self.data_manager.update_run_status(self.run_id, completed=self.completed, updated_at=datetime.now().isoformat())
+
+    def summary(self, run_id: str) -> Dict[str, Any]:
+        """Run summary from the running totals, in the shape of `EvaluationRunner.summarise`"""
+        usage = finalize_usage(self.usage) if not self.usage.empty else pd.DataFrame()
+        return {
+            "run_id": run_id,
+            "total": self.completed,
+            "succeeded": self.completed - self.failed,
+            "failed": self.failed,
+            "saved": self.saved,
+            "usage": usage.set_index('model_name').to_dict('index') if not usage.empty else {}
+        }
+
+
+class EvaluationRunner:
+    """Generates responses for test cases with each model, scores them and saves the results"""
+
+    def __init__(self, models: List[BaseModel], evaluators: Dict[str, BaseEvaluator],
+                 data_manager: Optional[CSVDataManager] = None, tracer: Optional[Tracer] = None,
+                 max_workers: int = 1, coalesce: bool = True, flush_rows: int = 50, flush_interval_s: float = 2.0,
+                 scheduler: Optional[ModelScheduler] = None):
+        self.models = models
+        self.evaluators = evaluators
+        self.data_manager = data_manager or CSVDataManager()
+        self.tracer = tracer or get_tracer()
+        # Upper bound on concurrent cases; per-backend limits come from AdaptiveModel wrappers
+        self.max_workers = max_workers
+        # Share one generation between identical (model, prompt) requests within a run
+        self.coalesce = coalesce
+        # Results are appended whenever this many rows are pending or this much time has passed
+        self.flush_rows = flush_rows
+        self.flush_interval_s = flush_interval_s
+        # Groups work by model and warms models up ahead of their turn; None keeps case order
+        self.scheduler = scheduler
+
+    def evaluate_case(self, model: BaseModel, test_case: Dict[str, Any], run_id: Optional[str] = None,
+                      flight: Optional[SingleFlight] = None, metrics: Optional[List[str]] = None,
+                      response_text: Optional[str] = None) -> Dict[str, Any]:
+        """Generate and score one (model, test case) pair, returning a result row.
+
+        `metrics` limits scoring to some evaluators and `response_text` re-scores a
+        stored response instead of generating a new one.
+        """
+        model_name = getattr(model, 'model_name', type(model).__name__)
+        with self.tracer.span("test_case", sampled=self.tracer.should_sample(),
+                              model=model_name, test_case_id=test_case.get('id')):
+            record = self.generate_record(model, test_case, flight, response_text)
+            return self.score_record(model, test_case, record, run_id, metrics)
+
+    def generate_record(self, model: BaseModel, test_case: Dict[str, Any], flight: Optional[SingleFlight] = None,
+                        response_text: Optional[str] = None) -> GenerationRecord:
+        """Generate the response to one test case, or wrap a stored `response_text` for re-scoring"""
+        model_name = getattr(model, 'model_name', type(model).__name__)
+        with self.tracer.span("generate", model=model_name, test_case_id=test_case.get('id')) as span:
+            prompt = _text(test_case.get('input_text'))
+            if response_text is not None:
+                record = GenerationRecord(text=response_text, model_name=model_name, coalesced=True)
+            elif flight is not None:
+                record = coalesced_generate(flight, model, prompt)
+            else:
+                record = model.generate(prompt)
+            span.set_attribute("coalesced", record.coalesced)
+            span.set_attribute("prompt_tokens", record.prompt_tokens)
+            span.set_attribute("completion_tokens", record.completion_tokens)
+            if not record.ok:
+                span.set_attribute("error", record.error)
+        return record
+
+    def score_record(self, model: BaseModel, test_case: Dict[str, Any], record: GenerationRecord,
+                     run_id: Optional[str] = None, metrics: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Run the evaluators (all, or those in `metrics`) over a generation and build the result row"""
+        row = {
+            'run_id': run_id,
+            'test_case_id': test_case.get('id'),
+            'case_hash': test_case.get('case_hash') if isinstance(test_case.get('case_hash'), str) else case_hash(test_case),
+            'model_name': record.model_name,
+            'model_type': model.model_type,
+            'evaluation_time': datetime.now().isoformat(),
+            **record.to_result_fields()
+        }
+        details = {}
+        if record.ok:
+            # An evaluator registered under several metrics scores them together
+            groups: Dict[int, Tuple[BaseEvaluator, List[str]]] = {}
+            for metric, evaluator in self.evaluators.items():
+                if metrics is None or metric in metrics:
+                    groups.setdefault(id(evaluator), (evaluator, []))[1].append(metric)
+            for evaluator, names in groups.values():
+                with self.tracer.span("evaluate", evaluator=type(evaluator).__name__, metric=",".join(names),
+                                      model=record.model_name, test_case_id=test_case.get('id')) as span:
+                    results = evaluator.evaluate_metrics(
+                        _text(test_case.get('input_text')), _text(test_case.get('expected_output')), record.text, names
+                    )
+                    if len(names) == 1:
+                        span.set_attribute("score", results[names[0]].get('score'))
+                version = evaluator.config_version()
+                for metric in names:
+                    row[f"{metric}_score"] = results[metric].get('score')
+                    row[version_column(metric)] = version
+                    details[metric] = results[metric].get('details')
+        row['custom_metrics'] = json.dumps(details) if details else None
+        return row
+
+    def _evaluate_pairs(self, pairs: List[Tuple], run_id: str, flight: Optional[SingleFlight],
+                        executor: Optional[ThreadPoolExecutor], writer: _ResultWriter,
+                        draining: Optional[Callable[[], None]] = None) -> List[Dict[str, Any]]:
+        """Evaluate (model, test case[, metrics, response_text]) tuples, in parallel when an
+        executor is given, keeping their order; rows are handed to the writer in that order.
+
+        `draining` is called once the remaining pairs fit in the worker pool.
+        """
+        drain_at = max(len(pairs) - self.max_workers, 0)
+        if executor is None or len(pairs) < 2:
+            rows = []
+            for index, (model, test_case, *rest) in enumerate(pairs):
+                if draining is not None and index == drain_at:
+                    draining()
+                rows.append(self.evaluate_case(model, test_case, run_id, flight, *rest))
+                writer.add(rows[-1])
+            return rows
+        # Each task gets a copy of the context so its spans nest under the run
+        futures = [
+            executor.submit(copy_context().run, self.evaluate_case, model, test_case, run_id, flight, *rest)
+            for model, test_case, *rest in pairs
+        ]
+        rows = []
+        for index, future in enumerate(futures):
+            if draining is not None and index == drain_at:
+                draining()
+            # Written in submission order, as soon as every earlier pair has finished
+            rows.append(future.result())
+            writer.add(rows[-1])
+        return rows
+
+    def _evaluate_tasks(self, tasks: List[Tuple], run_id: str, flight: Optional[SingleFlight],
+                        executor: Optional[ThreadPoolExecutor], writer: _ResultWriter) -> List[Dict[str, Any]]:
+        """Evaluate tasks, one model group at a time when a scheduler is set; rows keep task order"""
+        if self.scheduler is None:
+            return self._evaluate_pairs(tasks, run_id, flight, executor, writer)
+        rows: List[Optional[Dict[str, Any]]] = [None] * len(tasks)
+        groups = self.scheduler.group(tasks)
+        try:
+            for position, (model, indexes) in enumerate(groups):
+                with self.tracer.span("model_load", model=getattr(model, 'model_name', type(model).__name__)):
+                    self.scheduler.activate(model)
+                following = groups[position + 1][0] if position + 1 < len(groups) else None
+                group_rows = self._evaluate_pairs(
+                    [tasks[index] for index in indexes], run_id, flight, executor, writer,
+                    draining=lambda: self.scheduler.prewarm(following, model)
+                )
+                for index, row in zip(indexes, group_rows):
+                    rows[index] = row
+        finally:
+            self.scheduler.drain()
+        return rows
+
+    def _writer(self, run_id: str, mode: str, expected: int) -> _ResultWriter:
+        """Result writer for a run, recording the run's progress for live dashboards"""
+        self.data_manager.update_run_status(
+            run_id, mode=mode, expected=expected, completed=0, started_at=datetime.now().isoformat(),
+            results_offset=self.data_manager.results_offset(), finished_at=None
+        )
+        return _ResultWriter(self.data_manager, self.tracer, run_id, self.flush_rows, self.flush_interval_s)
+
+    def _executor(self) -> Optional[ThreadPoolExecutor]:
+        return ThreadPoolExecutor(max_workers=self.max_workers) if self.max_workers > 1 else None
+
+    def _finish(self, run_id: str, rows: Optional[List[Dict[str, Any]]], flight: Optional[SingleFlight],
+                writer: _ResultWriter) -> Dict[str, Any]:
+        """Flush the writer and summarise the run, from the writer's totals when rows were not kept"""
+        writer.flush()
+        self.data_manager.update_run_status(run_id, finished_at=datetime.now().isoformat())
+        summary = self.summarise(run_id, rows, writer.saved) if rows is not None else writer.summary(run_id)
+        summary["generation_calls_saved"] = flight.shared if flight is not None else 0
+        summary["concurrency"] = {
+            model.model_name: model.limiter.metrics() for model in self.models if hasattr(model, 'limiter')
+        }
+        if self.scheduler is not None:
+            summary["model_loads"] = self.scheduler.metrics()
+        return summary
+
+    def run(self, test_cases: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Evaluate every test case with every model and persist the results"""
+        run_id = uuid.uuid4().hex[:12]
+        logger.info(f"Starting run {run_id}: {len(test_cases)} test cases x {len(self.models)} models")
+        # The run span is always kept so every run has a trace; case subtrees are sampled
+        with self.tracer.span("evaluation_run", sampled=True, trace_id=run_id,
+                              test_cases=len(test_cases), models=len(self.models)):
+            pairs = [(model, test_case) for test_case in test_cases for model in self.models]
+            flight = SingleFlight() if self.coalesce else None
+            writer = self._writer(run_id, "full", len(pairs))
+            executor = self._executor()
+            try:
+                rows = self._evaluate_tasks(pairs, run_id, flight, executor, writer)
+            finally:
+                if executor is not None:
+                    executor.shutdown()
+            return self._finish(run_id, rows, flight, writer)
+
+    def run_stream(self, test_cases: Iterable[Dict[str, Any]], expected: Optional[int] = None,
+                   queue_size: int = 256, batch_size: int = 1000,
+                   evaluate_workers: Optional[int] = None) -> Dict[str, Any]:
+        """Evaluate test cases from an iterator, e.g. `CSVDataManager.iter_test_cases`, with
+        memory that stays flat in the number of test cases.
+
+        Cases flow through bounded generate and evaluate stages into the results
+        file in batches of `batch_size` rows; rows are written in completion order,
+        no run-wide list is kept and the summary comes from running totals. Only
+        generations in flight are coalesced, and the scheduler's grouping by model
+        does not apply since the cases are never all in memory.
+        """
+        run_id = uuid.uuid4().hex[:12]
+        logger.info(f"Starting streaming run {run_id}: {expected if expected is not None else 'unknown'} "
+                    f"test cases x {len(self.models)} models")
+        with self.tracer.span("evaluation_run", sampled=True, trace_id=run_id, mode="stream",
+                              test_cases=expected, models=len(self.models)):
+            flight = SingleFlight(retain=False) if self.coalesce else None
+            writer = self._writer(run_id, "stream", expected * len(self.models) if expected is not None else None)
+            writer.flush_rows = batch_size
+
+            def generate(pair):
+                model, test_case = pair
+                sampled = self.tracer.should_sample()
+                with self.tracer.span("test_case", sampled=sampled, stage="generate",
+                                      model=getattr(model, 'model_name', type(model).__name__),
+                                      test_case_id=test_case.get('id')):
+                    return model, test_case, self.generate_record(model, test_case, flight), sampled
+
+            def evaluate(item):
+                model, test_case, record, sampled = item
+                with self.tracer.span("test_case", sampled=sampled, stage="evaluate",
+                                      model=record.model_name, test_case_id=test_case.get('id')):
+                    return self.score_record(model, test_case, record, run_id)
+
+            pipeline = BoundedPipeline(
+                [("generate", generate, self.max_workers), ("evaluate", evaluate, evaluate_workers or self.max_workers)],
+                queue_size=queue_size
+            )
+            pairs = ((model, test_case) for test_case in test_cases for model in self.models)
+            pipeline.run(pairs, writer.add)
+            summary = self._finish(run_id, None, flight, writer)
+        summary["pipeline"] = pipeline.metrics()
+        return summary
+
+    def _bulk_records(self, model: BaseModel, test_cases: List[Dict[str, Any]], use_batch_api: bool,
+                      poll_interval_s: float) -> List[GenerationRecord]:
+        """Every test case's generation for one model, in one bulk request where the handler supports it"""
+        model_name = getattr(model, 'model_name', type(model).__name__)
+        # Bulk requests go straight to the handler; the provider queues Batch API requests itself
+        handler = getattr(model, 'model', model)
+        prompts = [_text(test_case.get('input_text')) for test_case in test_cases]
+        if use_batch_api and hasattr(handler, 'run_batch'):
+            with self.tracer.span("generate", model=model_name, mode="batch_api", prompts=len(prompts)):
+                return handler.run_batch(prompts, poll_interval_s=poll_interval_s)
+        if hasattr(handler, 'generate_many'):
+            with self.tracer.span("generate", model=model_name, mode="async", prompts=len(prompts)):
+                return handler.generate_many(prompts, concurrency=self.max_workers)
+        return [self.generate_record(model, test_case) for test_case in test_cases]
+
+    def run_batch(self, test_cases: List[Dict[str, Any]], use_batch_api: bool = True,
+                  poll_interval_s: float = 30.0) -> Dict[str, Any]:
+        """Evaluate every test case with every model, generating each model's responses in bulk.
+
+        Handlers with `run_batch` (OpenAIHandler) submit all prompts through the
+        provider's Batch API, which is slower to return but cheaper for large
+        offline runs; with `use_batch_api=False` they send them concurrently on an
+        async client instead. Other models generate case by case. The responses
+        are then scored and saved as in `run`.
+        """
+        run_id = uuid.uuid4().hex[:12]
+        logger.info(f"Starting batch run {run_id}: {len(test_cases)} test cases x {len(self.models)} models")
+        with self.tracer.span("evaluation_run", sampled=True, trace_id=run_id, mode="batch",
+                              test_cases=len(test_cases), models=len(self.models)):
+            writer = self._writer(run_id, "batch", len(test_cases) * len(self.models))
+            executor = self._executor()
+            rows = []
+            try:
+                for model in self.models:
+                    records = self._bulk_records(model, test_cases, use_batch_api, poll_interval_s)
+                    pairs = list(zip(test_cases, records))
+                    if executor is None:
+                        results = (self.score_record(model, test_case, record, run_id) for test_case, record in pairs)
+                    else:
+                        futures = [executor.submit(copy_context().run, self.score_record, model, test_case, record, run_id)
+                                   for test_case, record in pairs]
+                        results = (future.result() for future in futures)
+                    for row in results:
+                        rows.append(row)
+                        writer.add(row)
+            finally:
+                if executor is not None:
+                    executor.shutdown()
+            return self._finish(run_id, rows, None, writer)
+
+    def plan(self, test_cases: List[Dict[str, Any]]) -> EvaluationPlan:
+        """Missing and stale cells of the test cases x models x metrics matrix"""
+        return plan_evaluation(test_cases, self.models, self.evaluators, self.data_manager)
+
+    def run_incremental(self, test_cases: List[Dict[str, Any]], plan: Optional[EvaluationPlan] = None) -> Dict[str, Any]:
+        """Evaluate only the cells missing from, or stale in, the results store"""
+        plan = plan or self.plan(test_cases)
+        run_id = uuid.uuid4().hex[:12]
+        logger.info(f"Starting incremental run {run_id}: {plan.scheduled_cells} of {plan.total_cells} cells")
+        with self.tracer.span("evaluation_run", sampled=True, trace_id=run_id, mode="incremental",
+                              test_cases=len(test_cases), models=len(self.models), tasks=len(plan.tasks)):
+            tasks = [(task.model, task.test_case, task.metrics, task.response_text) for task in plan.tasks]
+            flight = SingleFlight() if self.coalesce else None
+            writer = self._writer(run_id, "incremental", len(tasks))
+            executor = self._executor()
+            try:
+                rows = self._evaluate_tasks(tasks, run_id, flight, executor, writer)
+            finally:
+                if executor is not None:
+                    executor.shutdown()
+            summary = self._finish(run_id, rows, flight, writer)
+        summary["plan"] = plan.summary()
+        return summary
+
+    def run_sequential(self, test_cases: List[Dict[str, Any]], settings: Optional[Dict[str, Any]] = None,
+                       config: Optional[Config] = None) -> Dict[str, Any]:
+        """Evaluate test cases in stratified random order, dropping each model once
+        its pass rate on the configured metric is settled above or below the target"""
+        config = config or Config()
+        settings = settings or config.get_early_stopping_settings()
+        metric = settings.get('metric', 'correctness')
+        if metric not in self.evaluators:
+            raise ValueError(f"Early stopping metric {metric!r} has no evaluator in this run")
+        thresholds, higher_is_better = get_metric_rules(config)
+        threshold = settings.get('threshold', thresholds.get(metric, 0.5))
+
+        tests = {
+            id(model): SequentialTest(
+                settings.get('target_pass_rate', 0.8), settings.get('alpha', 0.05), settings.get('method', 'wilson'),
+                settings.get('min_samples', 20), settings.get('check_every', 1)
+            )
+            for model in self.models
+        }
+        evaluated = {id(model): 0 for model in self.models}
+        ordered = stratified_order(test_cases, settings.get('stratify_by', 'category'), settings.get('seed', 0))
+        batch_size = max(self.max_workers, 1)
+
+        run_id = uuid.uuid4().hex[:12]
+        logger.info(f"Starting sequential run {run_id}: up to {len(ordered)} test cases x {len(self.models)} models")
+        with self.tracer.span("evaluation_run", sampled=True, trace_id=run_id, mode="sequential",
+                              test_cases=len(ordered), models=len(self.models)):
+            flight = SingleFlight() if self.coalesce else None
+            # Early stopping usually ends the run before this upper bound
+            writer = self._writer(run_id, "sequential", len(ordered) * len(self.models))
+            executor = self._executor()
+            rows = []
+            last = None
+            try:
+                for start in range(0, len(ordered), batch_size):
+                    active = [model for model in self.models if tests[id(model)].decision is None]
+                    if not active:
+                        break
+                    # Model by model, starting with the one that ran last, so the scheduler swaps models once per batch
+                    if last in active:
+                        active = [last] + [model for model in active if model is not last]
+                    pairs = [(model, test_case) for model in active for test_case in ordered[start:start + batch_size]]
+                    batch_rows = self._evaluate_tasks(pairs, run_id, flight, executor, writer)
+                    last = active[-1]
+                    for (model, _), row in zip(pairs, batch_rows):
+                        evaluated[id(model)] += 1
+                        tests[id(model)].update(case_passed(row, metric, threshold, higher_is_better.get(metric, True)))
+                    rows.extend(batch_rows)
+            finally:
+                if executor is not None:
+                    executor.shutdown()
+            summary = self._finish(run_id, rows, flight, writer)
+
+        summary["early_stopping"] = {
+            getattr(model, 'model_name', type(model).__name__): {
+                **tests[id(model)].summary(),
+                "metric": metric,
+                "threshold": threshold,
+                # "evaluated" counts the cases the decision used; cases finishing in the same batch also ran
+                "cases_run": evaluated[id(model)],
+                "skipped": len(ordered) - evaluated[id(model)]
+            }
+            for model in self.models
+        }
+        return summary
+
+    @staticmethod
+    def summarise(run_id: str, rows: List[Dict[str, Any]], saved: bool) -> Dict[str, Any]:
+        """Run summary with per-model throughput and cost"""
+        results_df = pd.DataFrame(rows)
+        failed = int((results_df['status'] == 'error').sum()) if 'status' in results_df.columns else 0
+        usage = finalize_usage(build_usage_partials(results_df)) if not results_df.empty else pd.DataFrame()
+        return {
+            "run_id": run_id,
+            "total": len(rows),
+            "succeeded": len(rows) - failed,
+            "failed": failed,
+            "saved": saved,
+            "usage": usage.set_index('model_name').to_dict('index') if not usage.empty else {}
+        }
@@ -0,0 +1,123 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+
+from src.models.base_model import BaseModel
+from src.pipeline.concurrency import AdaptiveModel
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+def _name(model: BaseModel) -> str:
+    return getattr(model, 'model_name', type(model).__name__)
+
+
+def _backend(model: BaseModel) -> BaseModel:
+    return model.model if isinstance(model, AdaptiveModel) else model
+
+
+class ModelScheduler:
+    """Orders work by model and keeps model loads off the critical path.
+
+    Tasks are grouped so each model's cases run back to back instead of
+    alternating between models, which would make a local server swap weights
+    on every case. While one model's group drains, the next model is warmed up
+    in the background if `max_resident` allows two models in memory; models
+    beyond that limit are unloaded, least recently used first. Handlers without
+    `warm_up`/`unload` (remote APIs) are treated as always loaded.
+    """
+
+    def __init__(self, max_resident: int = 1, keep_alive: Optional[str] = "10m", prewarm: bool = True):
+        self.max_resident = max(max_resident, 1)
+        self.keep_alive = keep_alive
+        self.prewarm_enabled = prewarm
+        self.resident: "OrderedDict[str, BaseModel]" = OrderedDict()
+        self.pending: Dict[str, Future] = {}
+        self.loads: Dict[str, Dict[str, Any]] = {}
+        self.lock = threading.Lock()
+        self._warmer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="model-warmup")
+
+    @staticmethod
+    def group(tasks: List[Tuple]) -> List[Tuple[BaseModel, List[int]]]:
+        """(model, task indexes) per model, in order of each model's first task"""
+        groups: Dict[int, Tuple[BaseModel, List[int]]] = {}
+        for index, (model, *_) in enumerate(tasks):
+            groups.setdefault(id(model), (model, []))[1].append(index)
+        return list(groups.values())
+
+    def _stats(self, name: str) -> Dict[str, Any]:
+        return self.loads.setdefault(name, {"loads": 0, "load_ms": 0.0, "wait_ms": 0.0, "unloads": 0})
+
+    def _warm(self, model: BaseModel):
+        backend = _backend(model)
+        name = _name(model)
+        start = time.perf_counter()
+        try:
+            reported_ms = backend.warm_up(self.keep_alive)
+        except Exception as e:
+            logger.warning(f"Warm-up of {name} failed: {str(e)}")
+            return
+        with self.lock:
+            self.resident[name] = model
+            stats = self._stats(name)
+            stats["loads"] += 1
+            stats["load_ms"] += reported_ms if reported_ms is not None else (time.perf_counter() - start) * 1000
+
+    def _evict(self, keep: List[str]):
+        """Unload least recently used models until a slot is free for each name in `keep`"""
+        with self.lock:
+            while len(self.resident) + sum(name not in self.resident for name in keep) > self.max_resident:
+                victim = next((name for name in self.resident if name not in keep), None)
+                if victim is None:
+                    return
+                model = self.resident.pop(victim)
+                self._stats(victim)["unloads"] += 1
+                try:
+                    _backend(model).unload()
+                except Exception as e:
+                    logger.warning(f"Unloading {victim} failed: {str(e)}")
+
+    def activate(self, model: BaseModel):
+        """Make `model` resident before its group starts, waiting for a prewarm in progress"""
+        name = _name(model)
+        if not hasattr(_backend(model), 'warm_up'):
+            return
+        start = time.perf_counter()
+        future = self.pending.pop(name, None)
+        if future is not None:
+            future.result()
+        elif name not in self.resident:
+            self._evict([name])
+            self._warm(model)
+        with self.lock:
+            self.resident[name] = model
+            self.resident.move_to_end(name)
+            self._stats(name)["wait_ms"] += (time.perf_counter() - start) * 1000
+        self._evict([name])
+
+    def prewarm(self, model: Optional[BaseModel], current: Optional[BaseModel] = None):
+        """Start loading the next model in the background if it fits beside the current one"""
+        if model is None or not self.prewarm_enabled or not hasattr(_backend(model), 'warm_up'):
+            return
+        name = _name(model)
+        if name in self.resident or name in self.pending:
+            return
+        keep = [name] + ([_name(current)] if current is not None else [])
+        if len(set(keep)) > self.max_resident:
+            return
+        self._evict(keep)
+        self.pending[name] = self._warmer.submit(self._warm, model)
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Per model: loads, load_ms reported by the server, wait_ms spent blocked on loading, unloads"""
+        with self.lock:
+            return {name: dict(stats) for name, stats in self.loads.items()}
+
+    def drain(self):
+        """Wait for background warm-ups, e.g. at the end of a run"""
+        for future in self.pending.values():
+            future.result()
+        self.pending.clear()
@@ -0,0 +1,117 @@
+import math
+import random
+from statistics import NormalDist
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from src.utils.aggregation import UNCATEGORIZED
+
+PASS = "pass"
+FAIL = "fail"
+UNDECIDED = "undecided"
+METHODS = ("wilson", "hoeffding")
+
+
+def stratified_order(test_cases: List[Dict[str, Any]], key: str = 'category', seed: int = 0) -> List[Dict[str, Any]]:
+    """Random order in which every prefix holds each category in proportion to its size.
+
+    Cases are shuffled within their category and given evenly spaced, jittered
+    positions in [0, 1), so sorting by position interleaves the categories.
+    """
+    rng = random.Random(seed)
+    strata: Dict[Any, List[Dict[str, Any]]] = {}
+    for test_case in test_cases:
+        value = test_case.get(key)
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            value = UNCATEGORIZED
+        strata.setdefault(value, []).append(test_case)
+    positioned = []
+    for cases in strata.values():
+        rng.shuffle(cases)
+        positioned.extend(((i + rng.random()) / len(cases), test_case) for i, test_case in enumerate(cases))
+    positioned.sort(key=lambda item: item[0])
+    return [test_case for _, test_case in positioned]
+
+
+def look_alpha(alpha: float, look: int) -> float:
+    """Error budget spent at the k-th look; the sum over all looks is alpha"""
+    return alpha * 6 / (math.pi ** 2 * look ** 2)
+
+
+def wilson_interval(successes: int, n: int, alpha: float) -> Tuple[float, float]:
+    if n == 0:
+        return 0.0, 1.0
+    z = NormalDist().inv_cdf(1 - alpha / 2)
+    p = successes / n
+    denominator = 1 + z ** 2 / n
+    centre = (p + z ** 2 / (2 * n)) / denominator
+    half_width = z * math.sqrt(p * (1 - p) / n + z ** 2 / (4 * n ** 2)) / denominator
+    return max(centre - half_width, 0.0), min(centre + half_width, 1.0)
+
+
+def hoeffding_interval(successes: int, n: int, alpha: float) -> Tuple[float, float]:
+    if n == 0:
+        return 0.0, 1.0
+    p = successes / n
+    half_width = math.sqrt(math.log(2 / alpha) / (2 * n))
+    return max(p - half_width, 0.0), min(p + half_width, 1.0)
+
+
+class SequentialTest:
+    """Decides whether a pass rate clears `target` while cases are still being evaluated.
+
+    Every `check_every` observations (after `min_samples`) a confidence interval is
+    computed at that look's share of the error budget `alpha`. Because the shares
+    sum to alpha, the chance of ever deciding wrongly stays below alpha however
+    many looks are taken.
+    """
+
+    def __init__(self, target: float, alpha: float = 0.05, method: str = "wilson",
+                 min_samples: int = 20, check_every: int = 1):
+        if method not in METHODS:
+            raise ValueError(f"Unknown method {method!r}; expected one of {METHODS}")
+        self.target = target
+        self.alpha = alpha
+        self.method = method
+        self.min_samples = min_samples
+        self.check_every = max(check_every, 1)
+        self.n = 0
+        self.successes = 0
+        self.looks = 0
+        self.decision: Optional[str] = None
+        self.lower, self.upper = 0.0, 1.0
+
+    def update(self, passed: bool) -> Optional[str]:
+        """Record one case; returns PASS or FAIL once the outcome is settled"""
+        if self.decision is not None:
+            return self.decision
+        self.n += 1
+        self.successes += bool(passed)
+        if self.n >= self.min_samples and (self.n - self.min_samples) % self.check_every == 0:
+            self.looks += 1
+            interval = wilson_interval if self.method == "wilson" else hoeffding_interval
+            self.lower, self.upper = interval(self.successes, self.n, look_alpha(self.alpha, self.looks))
+            if self.lower >= self.target:
+                self.decision = PASS
+            elif self.upper < self.target:
+                self.decision = FAIL
+        return self.decision
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "decision": self.decision or UNDECIDED,
+            "evaluated": self.n,
+            "pass_rate": self.successes / self.n if self.n else None,
+            "lower": self.lower,
+            "upper": self.upper,
+            "target": self.target
+        }
+
+
+def case_passed(row: Dict[str, Any], metric: str, threshold: float, higher_is_better: bool) -> bool:
+    """A result row passes if its score meets the threshold; unscored rows fail"""
+    score = row.get(f"{metric}_score")
+    if score is None or np.isnan(score):
+        return False
+    return score >= threshold if higher_is_better else score <= threshold
@@ -0,0 +1,134 @@
+import queue
+import threading
+from contextvars import copy_context
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+_DONE = object()
+
+
+class BoundedPipeline:
+    """Runs items from a source through worker stages into a sink over bounded queues.
+
+    Each stage reads from a queue holding at most `queue_size` items, so a slow
+    stage blocks the one before it and, in the end, the source: the items alive
+    at any moment are bounded by the queue sizes plus one per worker, however
+    long the source is. Stages with several workers emit items in completion
+    order. The first exception in any stage or the sink stops every stage and
+    is re-raised by `run`.
+    """
+
+    def __init__(self, stages: List[Tuple[str, Callable[[Any], Any], int]], queue_size: int = 256,
+                 poll_s: float = 0.1):
+        self.stages = [(name, fn, max(workers, 1)) for name, fn, workers in stages]
+        self.queue_size = max(queue_size, 1)
+        self.poll_s = poll_s
+        self.stop = threading.Event()
+        self.error: Optional[BaseException] = None
+        self.lock = threading.Lock()
+        # Highest depth seen on each stage's input queue
+        self.max_depth: Dict[str, int] = {name: 0 for name, _, _ in self.stages}
+        self.max_depth["sink"] = 0
+        self.processed: Dict[str, int] = {name: 0 for name, _, _ in self.stages}
+        self._running: List[int] = []
+
+    def _put(self, name: str, target: queue.Queue, item: Any) -> bool:
+        while not self.stop.is_set():
+            try:
+                target.put(item, timeout=self.poll_s)
+            except queue.Full:
+                continue
+            depth = target.qsize()
+            if depth > self.max_depth[name]:
+                self.max_depth[name] = depth
+            return True
+        return False
+
+    def _get(self, source: queue.Queue) -> Any:
+        while not self.stop.is_set():
+            try:
+                return source.get(timeout=self.poll_s)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _fail(self, error: BaseException):
+        with self.lock:
+            if self.error is None:
+                self.error = error
+        self.stop.set()
+
+    def _next_name(self, index: int) -> str:
+        return self.stages[index + 1][0] if index + 1 < len(self.stages) else "sink"
+
+    def _close(self, index: int, target: queue.Queue):
+        """Send one end marker to every worker of the stage after `index`"""
+        workers = self.stages[index + 1][2] if index + 1 < len(self.stages) else 1
+        for _ in range(workers):
+            if not self._put(self._next_name(index), target, _DONE):
+                return
+
+    def _feed(self, source: Iterable[Any], target: queue.Queue):
+        try:
+            for item in source:
+                if not self._put(self.stages[0][0], target, item):
+                    return
+        except BaseException as e:
+            self._fail(e)
+            return
+        self._close(-1, target)
+
+    def _work(self, index: int, source: queue.Queue, target: queue.Queue):
+        name, fn, _ = self.stages[index]
+        try:
+            while True:
+                item = self._get(source)
+                if item is _DONE:
+                    break
+                result = fn(item)
+                with self.lock:
+                    self.processed[name] += 1
+                if not self._put(self._next_name(index), target, result):
+                    return
+        except BaseException as e:
+            self._fail(e)
+            return
+        with self.lock:
+            self._running[index] -= 1
+            last = self._running[index] == 0
+        # The stage's last worker to finish closes the next stage
+        if last:
+            self._close(index, target)
+
+    def run(self, source: Iterable[Any], sink: Callable[[Any], None]):
+        """Drive the source through every stage, calling `sink` on this thread for each output"""
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)]
+        self._running = [workers for _, _, workers in self.stages]
+        # Each thread gets its own copy of the context so tracing spans nest under the caller's
+        threads = [threading.Thread(target=copy_context().run, args=(self._feed, source, queues[0]),
+                                    name="stream-source", daemon=True)]
+        for index, (name, _, workers) in enumerate(self.stages):
+            threads.extend(
+                threading.Thread(target=copy_context().run, args=(self._work, index, queues[index], queues[index + 1]),
+                                 name=f"stream-{name}-{worker}", daemon=True)
+                for worker in range(workers)
+            )
+        for thread in threads:
+            thread.start()
+        try:
+            while True:
+                item = self._get(queues[-1])
+                if item is _DONE:
+                    break
+                sink(item)
+        except BaseException as e:
+            self._fail(e)
+        finally:
+            self.stop.set()
+            for thread in threads:
+                thread.join()
+        if self.error is not None:
+            raise self.error
+
+    def metrics(self) -> Dict[str, Any]:
+        """Items processed per stage and the deepest each input queue got"""
+        return {"queue_size": self.queue_size, "processed": dict(self.processed), "max_depth": dict(self.max_depth)}
@@ -0,0 +1,535 @@
+"""Local stand-in for Ollama, Bedrock and OpenAI-compatible endpoints, for offline load testing.
+
+Usage:
+    python -m src.testing.mock_llm_server --port 11434 --latency lognormal:200:0.5 --tokens-per-second 40
+"""
+import argparse
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+WORDS = ("the a model answer result because therefore value step reason input output example "
+         "first second final number list context question correct simple clear short").split()
+
+
+class LatencyModel:
+    """Samples time-to-first-token in milliseconds from a named distribution.
+
+    Specs are "fixed:MS", "uniform:LOW:HIGH", "exponential:MEAN" or
+    "lognormal:MEDIAN:SIGMA".
+    """
+
+    def __init__(self, spec: str = "fixed:0"):
+        name, *params = spec.split(":")
+        self.name = name
+        self.params = [float(p) for p in params]
+        if name not in ("fixed", "uniform", "exponential", "lognormal"):
+            raise ValueError(f"Unknown latency distribution: {name}")
+
+    def sample(self, rng: random.Random) -> float:
+        if self.name == "fixed":
+            return self.params[0] if self.params else 0.0
+        if self.name == "uniform":
+            return rng.uniform(self.params[0], self.params[1])
+        if self.name == "exponential":
+            return rng.expovariate(1 / self.params[0]) if self.params[0] > 0 else 0.0
+        median, sigma = self.params
+        return rng.lognormvariate(math.log(median), sigma) if median > 0 else 0.0
+
+
+class MockBehaviour:
+    """Tunable behaviour shared by every request the server handles"""
+
+    def __init__(self, latency: str = "fixed:0", tokens_per_second: float = 0.0,
+                 min_tokens: int = 8, max_tokens: int = 64, error_rate: float = 0.0,
+                 throttle_rate: float = 0.0, capacity: int = 0, queue_limit: int = 0, seed: int = 0,
+                 load_ms: float = 0.0, max_resident: int = 0):
+        self.latency = LatencyModel(latency)
+        # 0 disables decode pacing and the capacity limit respectively
+        self.tokens_per_second = tokens_per_second
+        self.min_tokens = min_tokens
+        self.max_tokens = max_tokens
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.capacity = capacity
+        self.queue_limit = queue_limit
+        self.seed = seed
+        # Ollama model loading: time to load a model that is not resident, and how many
+        # models fit in memory before the least recently used one is evicted (0 = unlimited)
+        self.load_ms = load_ms
+        self.max_resident = max_resident
+
+
+def deterministic_completion(model: str, prompt: str, seed: int, min_tokens: int, max_tokens: int) -> str:
+    """Same (model, prompt, seed) always produces the same text"""
+    digest = hashlib.sha256(f"{seed}|{model}|{prompt}".encode()).digest()
+    rng = random.Random(digest)
+    count = rng.randint(min_tokens, max_tokens)
+    return " ".join(rng.choice(WORDS) for _ in range(count))
+
+
+def count_tokens(text: str) -> int:
+    return len(re.findall(r"\S+", text))
+
+
+def chat_completion(model: str, result: Dict[str, Any]) -> Dict[str, Any]:
+    """OpenAI chat.completion body for a simulated generation"""
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": result["text"]},
+            "finish_reason": "stop"
+        }],
+        "usage": {
+            "prompt_tokens": result["prompt_tokens"],
+            "completion_tokens": result["completion_tokens"],
+            "total_tokens": result["prompt_tokens"] + result["completion_tokens"]
+        }
+    }
+
+
+def _chat_prompt(request: Dict[str, Any]) -> str:
+    return "\n".join(str(m.get("content", "")) for m in request.get("messages", []))
+
+
+class MockLLMServer:
+    """Threaded HTTP server speaking the Ollama chat/generate, Bedrock invoke and
+    OpenAI chat completions, files and batches protocols"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, behaviour: Optional[MockBehaviour] = None):
+        self.behaviour = behaviour or MockBehaviour()
+        self._rng = random.Random(self.behaviour.seed)
+        self._rng_lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        self._slots = threading.Semaphore(self.behaviour.capacity) if self.behaviour.capacity else None
+        self.in_flight = 0
+        self.waiting = 0
+        self.stats = {"requests": 0, "errors": 0, "throttled": 0, "max_in_flight": 0, "by_model": {},
+                      "loads": 0, "evictions": 0}
+        # Models resident in (simulated) memory, least recently used first
+        self.resident: "OrderedDict[str, bool]" = OrderedDict()
+        self._load_lock = threading.Lock()
+        # Uploaded files and batches of the OpenAI-compatible API, by id
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.batches: Dict[str, Dict[str, Any]] = {}
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockLLMServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _random(self) -> float:
+        with self._rng_lock:
+            return self._rng.random()
+
+    def _sample_latency_ms(self) -> float:
+        with self._rng_lock:
+            return self.behaviour.latency.sample(self._rng)
+
+    def _admit(self, model: str) -> Optional[str]:
+        """Decide whether a request fails, is throttled or proceeds; returns the failure kind"""
+        with self._state_lock:
+            self.stats["requests"] += 1
+            self.stats["by_model"][model] = self.stats["by_model"].get(model, 0) + 1
+            overloaded = bool(self.behaviour.queue_limit) and self.waiting >= self.behaviour.queue_limit
+        if overloaded or self._random() < self.behaviour.throttle_rate:
+            with self._state_lock:
+                self.stats["throttled"] += 1
+            return "throttle"
+        if self._random() < self.behaviour.error_rate:
+            with self._state_lock:
+                self.stats["errors"] += 1
+            return "error"
+        return None
+
+    def load(self, model: str) -> int:
+        """Make a model resident, evicting the least recently used beyond max_resident; returns load ns"""
+        with self._load_lock:
+            if model in self.resident:
+                self.resident.move_to_end(model)
+                return 0
+            start = time.perf_counter()
+            time.sleep(self.behaviour.load_ms / 1000)
+            self.resident[model] = True
+            with self._state_lock:
+                self.stats["loads"] += 1
+            while self.behaviour.max_resident and len(self.resident) > self.behaviour.max_resident:
+                self.resident.popitem(last=False)
+                with self._state_lock:
+                    self.stats["evictions"] += 1
+            return int((time.perf_counter() - start) * 1e9)
+
+    def unload(self, model: str):
+        with self._load_lock:
+            self.resident.pop(model, None)
+
+    def generate(self, model: str, prompt: str, on_token=None) -> Dict[str, Any]:
+        """Simulate one generation, waiting for a capacity slot first"""
+        queued_at = time.perf_counter()
+        if self._slots:
+            with self._state_lock:
+                self.waiting += 1
+            self._slots.acquire()
+            with self._state_lock:
+                self.waiting -= 1
+        with self._state_lock:
+            self.in_flight += 1
+            self.stats["max_in_flight"] = max(self.stats["max_in_flight"], self.in_flight)
+        try:
+            start = time.perf_counter()
+            first_token_ms = self._sample_latency_ms()
+            time.sleep(first_token_ms / 1000)
+            prompt_eval_end = time.perf_counter()
+
+            text = deterministic_completion(model, prompt, self.behaviour.seed,
+                                            self.behaviour.min_tokens, self.behaviour.max_tokens)
+            tokens = text.split(" ")
+            delay = 1 / self.behaviour.tokens_per_second if self.behaviour.tokens_per_second else 0.0
+            for index, token in enumerate(tokens):
+                if delay:
+                    time.sleep(delay)
+                if on_token:
+                    on_token(token if index == 0 else f" {token}")
+            end = time.perf_counter()
+            return {
+                "text": text,
+                "prompt_tokens": count_tokens(prompt),
+                "completion_tokens": len(tokens),
+                "total_ns": int((end - queued_at) * 1e9),
+                "prompt_eval_ns": int((prompt_eval_end - start) * 1e9),
+                "eval_ns": int((end - prompt_eval_end) * 1e9),
+            }
+        finally:
+            with self._state_lock:
+                self.in_flight -= 1
+            if self._slots:
+                self._slots.release()
+
+    def store_file(self, content: bytes, purpose: str, filename: str) -> Dict[str, Any]:
+        file_id = f"file-{uuid.uuid4().hex[:24]}"
+        meta = {"id": file_id, "object": "file", "bytes": len(content), "created_at": int(time.time()),
+                "filename": filename, "purpose": purpose}
+        with self._state_lock:
+            self.files[file_id] = {**meta, "content": content}
+        return meta
+
+    def create_batch(self, input_file_id: str, endpoint: str) -> Dict[str, Any]:
+        batch = {
+            "id": f"batch_{uuid.uuid4().hex[:24]}", "object": "batch", "endpoint": endpoint,
+            "input_file_id": input_file_id, "completion_window": "24h", "status": "validating",
+            "output_file_id": None, "error_file_id": None, "created_at": int(time.time()),
+            "request_counts": {"total": 0, "completed": 0, "failed": 0}
+        }
+        with self._state_lock:
+            self.batches[batch["id"]] = batch
+        threading.Thread(target=self._process_batch, args=(batch,), daemon=True).start()
+        return dict(batch)
+
+    def _process_batch(self, batch: Dict[str, Any]):
+        """Run every request of a batch input file and write the output and error files"""
+        lines = [json.loads(line) for line in self.files[batch["input_file_id"]]["content"].decode().splitlines()
+                 if line.strip()]
+        batch["request_counts"]["total"] = len(lines)
+        batch["status"] = "in_progress"
+        outputs, errors = [], []
+        for item in lines:
+            body = item.get("body", {})
+            model = body.get("model", "")
+            failure = self._admit(model)
+            if failure:
+                status = 429 if failure == "throttle" else 500
+                errors.append({"id": f"batch_req_{uuid.uuid4().hex[:12]}", "custom_id": item["custom_id"],
+                               "response": {"status_code": status, "body": {"error": {"message": f"mock: {failure}"}}},
+                               "error": None})
+                batch["request_counts"]["failed"] += 1
+                continue
+            result = self.generate(model, _chat_prompt(body))
+            outputs.append({"id": f"batch_req_{uuid.uuid4().hex[:12]}", "custom_id": item["custom_id"],
+                            "response": {"status_code": 200, "body": chat_completion(model, result)}, "error": None})
+            batch["request_counts"]["completed"] += 1
+        if outputs:
+            batch["output_file_id"] = self.store_file(
+                "".join(json.dumps(o) + "\n" for o in outputs).encode(), "batch_output", "output.jsonl")["id"]
+        if errors:
+            batch["error_file_id"] = self.store_file(
+                "".join(json.dumps(e) + "\n" for e in errors).encode(), "batch_output", "errors.jsonl")["id"]
+        batch["status"] = "completed"
+        batch["completed_at"] = int(time.time())
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _read_json(self) -> Dict[str, Any]:
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b"{}"
+                return json.loads(body or b"{}")
+
+            def _send_json(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path == "/api/tags":
+                    models = [{"name": name, "model": name} for name in server.stats["by_model"]]
+                    self._send_json(200, {"models": models})
+                elif self.path == "/mock/stats":
+                    self._send_json(200, server.stats)
+                elif self.path == "/v1/models":
+                    self._send_json(200, {"object": "list", "data": [
+                        {"id": name, "object": "model", "owned_by": "mock"} for name in server.stats["by_model"]
+                    ]})
+                elif re.match(r"^/v1/files/[^/]+/content$", self.path):
+                    stored = server.files.get(self.path.split("/")[3])
+                    if stored is None:
+                        self._send_json(404, {"error": {"message": "No such file"}})
+                        return
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/octet-stream")
+                    self.send_header("Content-Length", str(len(stored["content"])))
+                    self.end_headers()
+                    self.wfile.write(stored["content"])
+                elif re.match(r"^/v1/batches/[^/]+$", self.path):
+                    batch = server.batches.get(self.path.split("/")[3])
+                    if batch is None:
+                        self._send_json(404, {"error": {"message": "No such batch"}})
+                    else:
+                        self._send_json(200, dict(batch))
+                else:
+                    self._send_json(404, {"error": f"unknown path {self.path}"})
+
+            def do_POST(self):
+                if self.path in ("/api/chat", "/api/generate"):
+                    self._ollama(self.path == "/api/chat")
+                    return
+                if self.path == "/v1/chat/completions":
+                    self._openai_chat()
+                    return
+                if self.path == "/v1/files":
+                    self._openai_upload()
+                    return
+                if self.path == "/v1/batches":
+                    request = self._read_json()
+                    if request.get("input_file_id") not in server.files:
+                        self._send_json(400, {"error": {"message": "Unknown input_file_id"}})
+                        return
+                    self._send_json(200, server.create_batch(request["input_file_id"], request.get("endpoint", "")))
+                    return
+                match = re.match(r"^/model/(?P<model>[^/]+)/invoke$", self.path)
+                if match:
+                    self._bedrock(match.group("model"))
+                    return
+                self._send_json(404, {"error": f"unknown path {self.path}"})
+
+            def _ollama(self, chat: bool):
+                request = self._read_json()
+                model = request.get("model", "")
+                if chat:
+                    prompt = "\n".join(str(m.get("content", "")) for m in request.get("messages", []))
+                else:
+                    prompt = str(request.get("prompt", ""))
+                failure = server._admit(model)
+                if failure == "throttle":
+                    self._send_json(503, {"error": "server busy, please try again. maximum pending requests exceeded"})
+                    return
+                if failure == "error":
+                    self._send_json(500, {"error": "mock: injected server error"})
+                    return
+
+                created_at = datetime.now(timezone.utc).isoformat()
+
+                # An empty prompt only loads the model, or unloads it when keep_alive is 0
+                if not prompt.strip():
+                    if str(request.get("keep_alive")) in ("0", "0s", "0m"):
+                        server.unload(model)
+                        done_reason, load_ns = "unload", 0
+                    else:
+                        done_reason, load_ns = "load", server.load(model)
+                    payload = {"model": model, "created_at": created_at, "done": True, "done_reason": done_reason,
+                               "load_duration": load_ns, "total_duration": load_ns}
+                    payload.update({"message": {"role": "assistant", "content": ""}} if chat else {"response": ""})
+                    self._send_json(200, payload)
+                    return
+                load_ns = server.load(model)
+
+                def chunk(content: str, done: bool) -> Dict[str, Any]:
+                    payload = {"model": model, "created_at": created_at, "done": done}
+                    if chat:
+                        payload["message"] = {"role": "assistant", "content": content}
+                    else:
+                        payload["response"] = content
+                    return payload
+
+                def final(result: Dict[str, Any], content: str) -> Dict[str, Any]:
+                    payload = chunk(content, True)
+                    payload.update({
+                        "done_reason": "stop",
+                        "total_duration": result["total_ns"] + load_ns,
+                        "load_duration": load_ns,
+                        "prompt_eval_count": result["prompt_tokens"],
+                        "prompt_eval_duration": result["prompt_eval_ns"],
+                        "eval_count": result["completion_tokens"],
+                        "eval_duration": result["eval_ns"],
+                    })
+                    return payload
+
+                if not request.get("stream", True):
+                    result = server.generate(model, prompt)
+                    self._send_json(200, final(result, result["text"]))
+                    return
+
+                # Stream NDJSON chunks as tokens are produced
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+
+                def write_line(payload: Dict[str, Any]):
+                    data = (json.dumps(payload) + "\n").encode()
+                    self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                    self.wfile.flush()
+
+                result = server.generate(model, prompt, on_token=lambda token: write_line(chunk(token, False)))
+                write_line(final(result, ""))
+                self.wfile.write(b"0\r\n\r\n")
+
+            def _openai_chat(self):
+                request = self._read_json()
+                model = request.get("model", "")
+                failure = server._admit(model)
+                if failure == "throttle":
+                    self._send_json(429, {"error": {"message": "Rate limit reached, please try again.",
+                                                    "type": "rate_limit_error"}}, {"retry-after": "1"})
+                    return
+                if failure == "error":
+                    self._send_json(500, {"error": {"message": "mock: injected server error", "type": "server_error"}})
+                    return
+                self._send_json(200, chat_completion(model, server.generate(model, _chat_prompt(request))))
+
+            def _openai_upload(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length)
+                message = BytesParser(policy=HTTP).parsebytes(
+                    f"Content-Type: {self.headers.get('Content-Type')}\r\n\r\n".encode() + raw
+                )
+                fields = {}
+                for part in message.iter_parts():
+                    fields[part.get_param("name", header="content-disposition")] = (
+                        part.get_filename(), part.get_payload(decode=True)
+                    )
+                if "file" not in fields:
+                    self._send_json(400, {"error": {"message": "Missing file"}})
+                    return
+                filename, content = fields["file"]
+                purpose = fields.get("purpose", (None, b""))[1].decode()
+                self._send_json(200, server.store_file(content, purpose, filename or "upload.jsonl"))
+
+            def _bedrock(self, model: str):
+                request = self._read_json()
+                prompt = str(request.get("prompt") or request.get("inputText") or "")
+                failure = server._admit(model)
+                if failure == "throttle":
+                    self._send_json(429, {"message": "Too many requests, please wait before trying again."},
+                                    {"x-amzn-ErrorType": "ThrottlingException"})
+                    return
+                if failure == "error":
+                    self._send_json(500, {"message": "mock: injected server error"},
+                                    {"x-amzn-ErrorType": "InternalServerException"})
+                    return
+                result = server.generate(model, prompt)
+                body = {
+                    "inputTextTokenCount": result["prompt_tokens"],
+                    "results": [{
+                        "tokenCount": result["completion_tokens"],
+                        "outputText": result["text"],
+                        "completionReason": "FINISH"
+                    }]
+                }
+                self._send_json(200, body, {
+                    "x-amzn-bedrock-input-token-count": str(result["prompt_tokens"]),
+                    "x-amzn-bedrock-output-token-count": str(result["completion_tokens"]),
+                    "x-amzn-bedrock-invocation-latency": str(result["total_ns"] // 1_000_000),
+                })
+
+        return Handler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mock Ollama / Bedrock / OpenAI-compatible server for load testing")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--latency", default="lognormal:200:0.5", help="Time-to-first-token distribution")
+    parser.add_argument("--tokens-per-second", type=float, default=40.0)
+    parser.add_argument("--min-tokens", type=int, default=8)
+    parser.add_argument("--max-tokens", type=int, default=64)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--capacity", type=int, default=0, help="Concurrent generations before queueing (0 = unlimited)")
+    parser.add_argument("--queue-limit", type=int, default=0, help="Queued requests before throttling (0 = unlimited)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--load-ms", type=float, default=0.0, help="Time to load an Ollama model that is not resident")
+    parser.add_argument("--max-resident", type=int, default=0, help="Ollama models kept loaded at once (0 = unlimited)")
+    args = parser.parse_args(argv)
+
+    behaviour = MockBehaviour(
+        latency=args.latency, tokens_per_second=args.tokens_per_second, min_tokens=args.min_tokens,
+        max_tokens=args.max_tokens, error_rate=args.error_rate, throttle_rate=args.throttle_rate,
+        capacity=args.capacity, queue_limit=args.queue_limit, seed=args.seed,
+        load_ms=args.load_ms, max_resident=args.max_resident
+    )
+    server = MockLLMServer(args.host, args.port, behaviour)
+    print(f"Mock LLM server listening on {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
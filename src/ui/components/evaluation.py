@@ -1,13 +1,190 @@
 import streamlit as st
+import pandas as pd
 from src.models.ollama_handler import OllamaHandler
 from src.models.bedrock_handler import BedrockHandler
+from src.models.openai_handler import OpenAIHandler
 from src.evaluators.deepeval_evaluator import DeepEvalEvaluator
 from src.evaluators.custom_evaluator import CustomGEvalEvaluator
+from src.evaluators.judge_evaluator import MultiMetricJudgeEvaluator
+from src.evaluators.classifier_evaluator import classifier_evaluators
 from src.data.csv_manager import CSVDataManager
+from src.pipeline.runner import EvaluationRunner
+from src.pipeline.concurrency import AdaptiveModel, get_limiter
+from src.pipeline.scheduler import ModelScheduler
+from src.utils.config import Config
+from src.ui.components.projects import get_data_manager
+
+CORRECTNESS_EVALUATORS = {
+    "Exact match": CustomGEvalEvaluator,
+    "DeepEval G-Eval": DeepEvalEvaluator
+}
+# Scores every default metric, not just correctness, in one judge call per row
+JUDGE_EVALUATOR = "LLM judge (all default metrics)"
+
+
+def create_handler(model_config, config):
+    """Build the backend handler for a saved model configuration"""
+    pricing = config.get_model_pricing(model_config["name"])
+    if model_config["type"] == "bedrock":
+        region = config.models_config.get("bedrock", {}).get("region", "us-east-1")
+        return BedrockHandler(model_config["name"], region=region, pricing=pricing)
+    if model_config["type"] == "openai":
+        settings = config.models_config.get("openai", {})
+        return OpenAIHandler(model_config["name"], base_url=settings.get("base_url", "https://api.openai.com/v1"),
+                             pricing=pricing, timeout=settings.get("timeout", 60),
+                             max_connections=settings.get("max_connections", 32))
+    host = config.models_config.get("ollama", {}).get("base_url", "http://localhost:11434")
+    return OllamaHandler(model_config["name"], pricing=pricing, host=host,
+                         keep_alive=config.get_scheduling_settings().get("keep_alive"))
+
+
+def create_adaptive_handler(model_config, config):
+    """Wrap the backend handler in the limiter shared by every model on the same backend"""
+    handler = create_handler(model_config, config)
+    if model_config["type"] == "bedrock":
+        key = f"bedrock:{handler.region}:{model_config['name']}"
+    elif model_config["type"] == "openai":
+        key = f"openai:{handler.base_url}:{model_config['name']}"
+    else:
+        # One local Ollama server shares its GPU between all models
+        key = f"ollama:{handler.host}"
+    return AdaptiveModel(handler, get_limiter(key, **config.get_concurrency_settings(model_config["type"])))
+
+
+def create_judge(config):
+    """Multi-metric judge on the model configured under judge in metrics_config.yaml"""
+    settings = config.get_judge_settings()
+    handler = create_adaptive_handler(
+        {"type": settings.get("model_type", "ollama"), "name": settings.get("model", "llama3:8b")}, config
+    )
+    return MultiMetricJudgeEvaluator.from_config(
+        handler, config, rows_per_call=settings.get("rows_per_call", 1),
+        max_wait_ms=settings.get("max_wait_ms", 50), keep_alive=settings.get("keep_alive")
+    )
+
 
 def render_evaluation():
     st.subheader("Run Evaluation")
-    if 'model_config' not in st.session_state or 'test_cases' not in st.session_state:
+    if 'model_config' not in st.session_state:
+        st.warning("Please configure model and upload test cases first!")
+        return
+    model_config = st.session_state.model_config
+    data_manager = get_data_manager()
+    case_count = st.session_state.get('test_case_count') or data_manager.count_test_cases()
+    if not case_count:
         st.warning("Please configure model and upload test cases first!")
         return
-    model_config
\ No newline at end of file
+
+    subset = st.text_input(
+        "Test case subset (optional)", placeholder="category:reasoning AND (tag:math OR tag:multi-step)",
+        help="Combine category: and tag: terms with AND, OR, NOT and parentheses"
+    )
+    ids = None
+    if subset.strip():
+        try:
+            ids = set(data_manager.get_tag_index().query(subset).tolist())
+        except ValueError as e:
+            st.error(f"Invalid subset query: {str(e)}")
+            return
+        case_count = len(ids)
+        if not case_count:
+            st.warning("No test cases match the subset query.")
+            return
+
+    evaluator_name = st.selectbox("Correctness evaluator", list(CORRECTNESS_EVALUATORS) + [JUDGE_EVALUATOR])
+    safety_classifiers = st.checkbox(
+        "Score toxicity and bias with local classifiers",
+        help="Runs the transformers models under classifiers in metrics_config.yaml on CPU, loaded once per process"
+    )
+    max_workers = st.slider("Maximum parallel requests", 1, 32, 8,
+                            help="The adaptive limiter keeps the backend's in-flight requests at or below this")
+    incremental = st.checkbox(
+        "Only evaluate missing or stale results", value=True,
+        help="Skips test case, model and metric combinations already scored by the same evaluator configuration"
+    )
+    early_stopping = st.checkbox(
+        "Stop early once the pass/fail decision is settled",
+        help="Samples test cases stratified by category; settings are under early_stopping in metrics_config.yaml"
+    )
+    streaming = st.checkbox(
+        "Stream test cases from disk",
+        help="Evaluates every case through bounded queues with flat memory, for very large suites; "
+             "incremental evaluation and early stopping do not apply"
+    )
+    batch_api = model_config["type"] == "openai" and st.checkbox(
+        "Generate through the Batch API",
+        help="Submits every prompt as one batch job; cheaper for large offline runs but can take up to 24 hours. "
+             "Incremental evaluation, early stopping and streaming do not apply"
+    )
+    st.caption(f"{case_count} test cases with {model_config['type']} model {model_config['name']}")
+    if st.button("Run Evaluation"):
+        try:
+            config = data_manager.config
+            judge = None
+            if evaluator_name == JUDGE_EVALUATOR:
+                judge = create_judge(config)
+                evaluators = {metric: judge for metric in judge.metrics}
+            else:
+                evaluators = {"correctness": CORRECTNESS_EVALUATORS[evaluator_name]()}
+            if safety_classifiers:
+                evaluators.update(classifier_evaluators(config))
+            runner = EvaluationRunner(
+                [create_adaptive_handler(model_config, config)],
+                evaluators,
+                data_manager,
+                max_workers=max_workers,
+                scheduler=ModelScheduler(**config.get_scheduling_settings()) if model_config["type"] == "ollama" else None
+            )
+            with st.spinner("Evaluating..."):
+                if batch_api:
+                    summary = runner.run_batch(list(data_manager.iter_test_cases(ids)))
+                elif streaming:
+                    summary = runner.run_stream(data_manager.iter_test_cases(ids), expected=case_count)
+                else:
+                    test_cases = list(data_manager.iter_test_cases(ids))
+                    if early_stopping:
+                        summary = runner.run_sequential(test_cases, config=config)
+                    elif incremental:
+                        summary = runner.run_incremental(test_cases)
+                    else:
+                        summary = runner.run(test_cases)
+            st.session_state.evaluation_count = st.session_state.get('evaluation_count', 0) + summary['total']
+            st.success(f"Run {summary['run_id']}: {summary['succeeded']} succeeded, {summary['failed']} failed")
+            if "plan" in summary:
+                plan = summary["plan"]
+                st.caption(
+                    f"{plan['fresh_cells']} of {plan['total_cells']} results were already up to date; "
+                    f"{plan['generations']} generations run and {plan['generations_reused']} stored responses re-scored"
+                )
+            if judge is not None:
+                usage = judge.usage()
+                st.caption(
+                    f"Judge {judge.judge_model}: {usage['calls']} calls for {usage['rows']} rows "
+                    f"({len(judge.metrics)} metrics each), {usage['prompt_tokens']} prompt tokens processed"
+                )
+            if summary["generation_calls_saved"]:
+                st.caption(f"{summary['generation_calls_saved']} duplicate generations were served from identical prompts")
+            for model_name, outcome in summary.get("early_stopping", {}).items():
+                st.info(
+                    f"{model_name}: {outcome['decision']} - {outcome['metric']} pass rate "
+                    f"{outcome['pass_rate'] or 0:.1%} in [{outcome['lower']:.1%}, {outcome['upper']:.1%}] "
+                    f"vs target {outcome['target']:.0%} after {outcome['evaluated']} cases "
+                    f"({outcome['cases_run']} run, {outcome['skipped']} skipped)"
+                )
+            for model_name, usage in summary["usage"].items():
+                col1, col2, col3 = st.columns(3)
+                col1.metric("Tokens / s", f"{usage['tokens_per_second']:.1f}" if pd.notna(usage['tokens_per_second']) else "n/a")
+                col2.metric("Completion tokens", int(usage['completion_tokens']))
+                col3.metric("Cost per 1k cases", f"${usage['cost_per_1k_cases']:.4f}")
+            for model_name, loads in summary.get("model_loads", {}).items():
+                st.caption(
+                    f"{model_name}: {loads['loads']} model loads taking {loads['load_ms'] / 1000:.1f}s, "
+                    f"{loads['wait_ms'] / 1000:.1f}s spent waiting for them (not counted as generation time)"
+                )
+            for model_name, metrics in summary["concurrency"].items():
+                col1, col2, col3 = st.columns(3)
+                col1.metric("Concurrency limit", metrics["limit"])
+                col2.metric("Goodput (req/s)", f"{metrics['goodput_per_s']:.2f}")
+                col3.metric("Throttled / errors", f"{metrics['throttled']} / {metrics['errors']}")
+        except Exception as e:
+            st.error(f"Error running evaluation: {str(e)}")
@@ -0,0 +1,56 @@
+import streamlit as st
+import pandas as pd
+from src.data.live_results import LiveAggregator
+from src.ui.components.projects import current_project, get_data_manager
+
+LIVE_REFRESH_SECONDS = 2
+
+
+def _latest_run(runs):
+    """The most recently started run, preferring ones still in progress"""
+    return max(runs.items(), key=lambda item: (item[1].get('finished_at') is None, item[1].get('started_at') or ""))
+
+
+@st.fragment(run_every=LIVE_REFRESH_SECONDS)
+def render_live_run():
+    """Show progress, throughput and running pass rates of the latest run, tailing new results only."""
+    data_manager = get_data_manager()
+    runs = data_manager.load_run_status()
+    if not runs:
+        st.info("No runs recorded yet.")
+        return
+    run_id, status = _latest_run(runs)
+
+    # The aggregator keeps its file offset between refreshes, so each refresh reads only new rows
+    key = (current_project(), run_id)
+    if st.session_state.get('live_aggregator_key') != key:
+        st.session_state.live_aggregator = LiveAggregator(data_manager, run_id=run_id, offset=status.get('results_offset'))
+        st.session_state.live_aggregator_key = key
+    aggregator = st.session_state.live_aggregator
+    aggregator.refresh()
+    snapshot = aggregator.snapshot()
+
+    finished = status.get('finished_at') is not None
+    expected = status.get('expected') or 0
+    completed = max(snapshot["rows"], status.get('completed', 0))
+    st.subheader(f"{'Last' if finished else 'Live'} run {run_id} ({status.get('mode', 'full')})")
+    st.progress(min(completed / expected, 1.0) if expected else 1.0,
+                text=f"{completed} of {expected} results" + (" - finished" if finished else ""))
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Results", completed)
+    col2.metric("Throughput", f"{snapshot['rows_per_second']:.1f} rows/s")
+    col3.metric("Errors", snapshot["errors"])
+
+    if snapshot["pass_rates"]:
+        st.write("Running pass rates: " + ", ".join(
+            f"{metric.replace('_score', '').title()} {rate:.1f}%" for metric, rate in snapshot["pass_rates"].items()
+        ))
+    cells = snapshot["cells"]
+    if not cells.empty:
+        st.dataframe(pd.DataFrame({
+            "Model": cells["model_name"],
+            "Metric": cells["metric"].str.replace('_score', ''),
+            "Results": cells["rows"],
+            "Mean": cells["mean"].round(3),
+            "Pass rate (%)": cells["pass_rate"].round(1)
+        }), hide_index=True)
@@ -4,12 +4,14 @@ from src.utils.config import Config
 def render_model_config():
     st.subheader("Configure Models")
     config = Config()
-    model_type = st.selectbox("Model Type", ["ollama", "bedrock"])
+    model_type = st.selectbox("Model Type", ["ollama", "bedrock", "openai"])
     try:
         if model_type == "ollama":
             model_name = st.selectbox("Ollama Model", config.get_available_ollama_models())
-        else:
+        elif model_type == "bedrock":
             model_name = st.selectbox("Bedrock Model", config.get_available_bedrock_models())
+        else:
+            model_name = st.selectbox("OpenAI-compatible Model", config.get_available_openai_models())
         if st.button("Save Configuration"):
             st.session_state.model_config = {"type": model_type, "name": model_name}
             st.success("Model configured!")
@@ -0,0 +1,56 @@
+import streamlit as st
+from src.data.csv_manager import CSVDataManager
+from src.data.projects import DEFAULT_PROJECT, ProjectStore
+from src.data.retention import RetentionManager
+from src.utils.config import Config
+
+
+def current_project() -> str:
+    return st.session_state.get('project', DEFAULT_PROJECT)
+
+
+def get_data_manager() -> CSVDataManager:
+    """Data manager for the project selected in the sidebar"""
+    return ProjectStore().get_data_manager(current_project())
+
+
+def get_project_config() -> Config:
+    """Config with the selected project's overrides applied"""
+    return ProjectStore().get_config(current_project())
+
+
+def run_scheduled_compaction():
+    """Archive and compact the selected project's results at most once per session, when retention is enabled"""
+    checked = st.session_state.setdefault('compaction_checked', set())
+    if current_project() in checked:
+        return
+    checked.add(current_project())
+    try:
+        report = RetentionManager(get_data_manager()).maybe_compact()
+        if report and report["archived_rows"]:
+            st.sidebar.caption(f"Archived {report['archived_rows']} results older than the retention window")
+    except Exception as e:
+        st.sidebar.warning(f"Results compaction failed: {str(e)}")
+
+
+def render_project_selector():
+    """Render the sidebar project switcher and project creation form."""
+    store = ProjectStore()
+    projects = store.list_projects()
+    if current_project() not in projects:
+        st.session_state.project = DEFAULT_PROJECT
+    selected = st.sidebar.selectbox("Project", projects, index=projects.index(current_project()))
+    if selected != current_project():
+        # Loaded test cases belong to the previous project
+        st.session_state.test_case_count = 0
+    st.session_state.project = selected
+    with st.sidebar.expander("New project"):
+        name = st.text_input("Project name", key="new_project_name")
+        if st.button("Create project", disabled=not name):
+            try:
+                store.create_project(name)
+                st.session_state.project = name
+                st.session_state.test_case_count = 0
+                st.rerun()
+            except ValueError as e:
+                st.error(str(e))
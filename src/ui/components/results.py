@@ -1,40 +1,276 @@
 import streamlit as st
 import pandas as pd
+from typing import List
+import plotly.graph_objects as go
 from src.data.csv_manager import CSVDataManager
 from src.utils.report_generator import generate_report
+from src.utils.report_exporter import ReportExporter, SUPPORTED_FORMATS
+from src.utils.aggregation import ALL_CATEGORIES, get_metric_rules, latest_results
+from src.utils.statistics import bootstrap_metric_intervals, paired_comparison
+from src.utils.config import Config
+from src.ui.components.projects import get_data_manager
+from src.utils.tracing import get_ring_buffer, load_trace, summarise_trace
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Columns shown in the results browser; response_text is loaded per row on demand
+BROWSER_COLUMNS = [
+    "id", "test_case_id", "model_name", "model_type",
+    "correctness_score", "relevancy_score", "fluency_score", "coherence_score",
+    "status", "evaluation_time"
+]
+SCORE_COLUMNS = [
+    "correctness_score", "relevancy_score", "fluency_score", "coherence_score",
+    "toxicity_score", "bias_score"
+]
+PAGE_SIZES = [25, 50, 100, 250]
+# Spans drawn in the trace waterfall; the stage summary always covers the whole trace
+MAX_WATERFALL_SPANS = 300
+
+
+def render_results_browser(data_manager: CSVDataManager):
+    """Render a paginated results table whose filtering, sorting and paging run server side."""
+    st.write("**Results Table**")
+
+    # Filters
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        models = st.multiselect("Model", data_manager.get_distinct_values("model_name"))
+    with col2:
+        statuses = st.multiselect("Status", data_manager.get_distinct_values("status"))
+    with col3:
+        test_cases_df = data_manager.load_test_cases()
+        category_options = (
+            sorted(test_cases_df["category"].dropna().unique().tolist(), key=str)
+            if "category" in test_cases_df.columns else []
+        )
+        categories = st.multiselect("Category", category_options)
+
+    score_ranges = {}
+    with st.expander("Score ranges"):
+        for metric in SCORE_COLUMNS:
+            low, high = st.slider(
+                metric.replace("_score", "").title(), 0.0, 1.0, (0.0, 1.0), 0.05, key=f"range_{metric}"
+            )
+            if (low, high) != (0.0, 1.0):
+                score_ranges[metric] = (low, high)
+
+    # Sorting and paging
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        sort_by = st.selectbox("Sort by", BROWSER_COLUMNS, index=0)
+    with col2:
+        ascending = st.radio("Order", ["Ascending", "Descending"], horizontal=True) == "Ascending"
+    with col3:
+        page_size = st.selectbox("Rows per page", PAGE_SIZES, index=1)
+
+    filter_conditions = {}
+    if models:
+        filter_conditions["model_name"] = models
+    if statuses:
+        filter_conditions["status"] = statuses
+
+    # The widget owns the 1-based page; clamp it to the page count of the previous render before drawing it
+    page_count = st.session_state.get("results_page_count", 1)
+    if st.session_state.get("results_page", 1) > page_count:
+        st.session_state.results_page = page_count
+    page = st.number_input("Page", min_value=1, step=1, key="results_page") - 1
+
+    query = dict(
+        columns=BROWSER_COLUMNS,
+        filter_conditions=filter_conditions,
+        categories=categories or None,
+        score_ranges=score_ranges,
+        sort_by=sort_by,
+        ascending=ascending,
+        page_size=page_size
+    )
+    page_df, total = data_manager.query_evaluation_results(page=page, **query)
+    page_count = max((total + page_size - 1) // page_size, 1)
+    st.session_state.results_page_count = page_count
+    if page >= page_count:
+        # Filters narrowed the results: show the last page now, the widget follows on the next render
+        page = page_count - 1
+        page_df, total = data_manager.query_evaluation_results(page=page, **query)
+
+    if total == 0:
+        st.info("No results match the selected filters.")
+        return
+
+    first_row = page * page_size + 1
+    st.caption(f"Page {page + 1} of {page_count}: showing rows {first_row}–{first_row + len(page_df) - 1} of {total}")
+    st.dataframe(page_df, hide_index=True)
+
+    # Load the full response only for the row being inspected
+    result_id = st.selectbox("Inspect result", page_df["id"].tolist(), index=None,
+                             placeholder="Select a result id to view its response")
+    if result_id is not None:
+        with st.expander(f"Response for result {result_id}", expanded=True):
+            response_text = data_manager.get_response_text(result_id)
+            st.text(response_text if response_text is not None else "(no response)")
+
+
+def render_category_breakdown(cube: pd.DataFrame):
+    """Render per-category statistics for one metric from the summary cube."""
+    cells = cube[cube["category"] != ALL_CATEGORIES] if not cube.empty else cube
+    if cells.empty:
+        return
+    st.subheader("Breakdown by Category")
+    metric = st.selectbox(
+        "Metric", sorted(cells["metric"].unique()),
+        format_func=lambda name: name.replace("_score", "").title(), key="breakdown_metric"
+    )
+    view = cells[cells["metric"] == metric][
+        ["model_name", "category", "count", "mean", "std", "p50", "p90", "pass_rate"]
+    ]
+    st.dataframe(view.round(3), hide_index=True)
+
+
+def render_report_export(data_manager: CSVDataManager):
+    """Render controls that export the full results store to files under reports/."""
+    st.subheader("Export Report")
+    formats = st.multiselect("Formats", list(SUPPORTED_FORMATS), default=list(SUPPORTED_FORMATS))
+    if st.button("Export", disabled=not formats):
+        with st.spinner("Exporting report..."):
+            paths = ReportExporter(data_manager, data_manager.config).export(formats)
+        st.success(f"Report written to {', '.join(str(path) for path in paths.values())}")
+        for fmt, path in paths.items():
+            st.download_button(f"Download {fmt.upper()}", path.read_bytes(), file_name=path.name, key=f"download_{fmt}")
+
+
+def _load_model_scores(data_manager: CSVDataManager, models: List[str], metrics: List[str]) -> pd.DataFrame:
+    """Latest scores of the given models, as counted by the summary cube.
+
+    Live results are read chunk by chunk and only the given models' rows kept;
+    archived latest rows come first, so a live result for the same cell wins.
+    """
+    columns = ["test_case_id", "model_name", "case_hash", "status"] + metrics
+    archived = data_manager.load_archive_latest()
+    frames = [archived[archived["model_name"].isin(models)].reindex(columns=columns)] if not archived.empty else []
+    frames += [chunk[chunk["model_name"].isin(models)] for chunk in data_manager.iter_evaluation_results(columns)]
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    return latest_results(pd.concat(frames, ignore_index=True))
+
+
+def render_significance(data_manager: CSVDataManager, cube: pd.DataFrame):
+    """Render bootstrap confidence intervals and a paired comparison between two models.
+
+    Model and metric choices come from the summary cube; raw scores are read only
+    when a computation is requested, and only for the selected models.
+    """
+    st.subheader("Confidence Intervals")
+    if cube.empty:
+        return
+    models = sorted(cube["model_name"].dropna().unique().tolist(), key=str)
+    metrics = [col for col in SCORE_COLUMNS if col in set(cube["metric"])]
+    confidence = st.select_slider("Confidence level", [0.9, 0.95, 0.99], value=0.95)
+    thresholds, higher_is_better = get_metric_rules(data_manager.config or Config())
+
+    interval_models = st.multiselect("Models", models, default=models[:2], key="interval_models")
+    if st.button("Compute confidence intervals", disabled=not interval_models):
+        results_df = _load_model_scores(data_manager, interval_models, metrics)
+        intervals = bootstrap_metric_intervals(results_df, thresholds, higher_is_better, confidence=confidence)
+        st.dataframe(intervals.round(4), hide_index=True)
+
+    if len(models) < 2 or not metrics:
+        return
+    st.write("**Paired Model Comparison**")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        model_a = st.selectbox("Model A", models, index=0)
+    with col2:
+        model_b = st.selectbox("Model B", models, index=1)
+    with col3:
+        metric = st.selectbox("Compared metric", metrics, format_func=lambda name: name.replace("_score", "").title())
+    if metric and model_a != model_b and st.button("Compare models"):
+        results_df = _load_model_scores(data_manager, [model_a, model_b], [metric])
+        comparison = paired_comparison(results_df, model_a, model_b, metric, confidence=confidence)
+        if comparison["n_pairs"] < 2:
+            st.warning("The two models share fewer than two scored test cases.")
+            return
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Mean difference (A - B)", f"{comparison['mean_difference']:+.4f}")
+        col2.metric(f"{int(confidence * 100)}% interval",
+                    f"[{comparison['lower']:+.4f}, {comparison['upper']:+.4f}]")
+        col3.metric("p-value", f"{comparison['p_value']:.4f}")
+        # Wins count cases where A scored higher, which is worse for metrics like toxicity
+        better, worse = comparison["wins"], comparison["losses"]
+        if not higher_is_better.get(metric.replace("_score", ""), True):
+            better, worse = worse, better
+        st.caption(
+            f"{comparison['n_pairs']} shared test cases: A better on {better}, "
+            f"tied on {comparison['ties']}, worse on {worse}. "
+            + ("The difference is significant." if comparison["significant"] else "The difference is not significant.")
+        )
+
+
+def render_run_traces(data_manager: CSVDataManager):
+    """Render a per-stage time summary and span waterfall for one evaluation run."""
+    st.subheader("Run Traces")
+    # Runs traced in this process, then the recent runs recorded in run_status.json, newest first
+    run_ids = list(dict.fromkeys(get_ring_buffer().trace_ids() + list(data_manager.load_run_status())[::-1]))
+    if not run_ids:
+        st.info("No traced runs yet.")
+        return
+    run_id = st.selectbox("Run", run_ids)
+    spans = load_trace(run_id)
+    if not spans:
+        st.info("No spans were recorded for this run.")
+        return
+
+    stages = pd.DataFrame(summarise_trace(spans))
+    st.dataframe(stages[["stage", "count", "total_ms", "mean_ms", "self_ms", "self_share"]].round(2), hide_index=True)
+
+    spans = sorted(spans, key=lambda span: span["start_ns"])
+    run_start = spans[0]["start_ns"]
+    shown = spans[:MAX_WATERFALL_SPANS]
+    labels = [
+        f"{span['name']} {span['attributes'].get('model', '')} {span['attributes'].get('test_case_id', '')}".strip()
+        for span in shown
+    ]
+    fig = go.Figure(go.Bar(
+        y=list(range(len(shown))),
+        x=[span["duration_ms"] for span in shown],
+        base=[(span["start_ns"] - run_start) / 1e6 for span in shown],
+        orientation="h",
+        hovertext=labels,
+        marker_color=["#d62728" if span["status"] == "error" else "#1f77b4" for span in shown]
+    ))
+    fig.update_layout(
+        xaxis_title="ms since run start",
+        yaxis=dict(tickvals=list(range(len(shown))), ticktext=labels, autorange="reversed"),
+        height=max(300, 18 * len(shown))
+    )
+    st.plotly_chart(fig, use_container_width=True)
+    if len(spans) > len(shown):
+        st.caption(f"Showing the first {len(shown)} of {len(spans)} spans.")
+
+
 def render_results():
     """Render evaluation results and summary report in the Streamlit UI."""
     try:
         st.subheader("Evaluation Results")
-        
+
         # Initialize CSVDataManager
-        data_manager = CSVDataManager()
-        
-        # Load evaluation results
-        results_df = data_manager.load_evaluation_results()
-        
-        if results_df.empty:
+        data_manager = get_data_manager()
+
+        # The summary sections read the materialised cube rather than raw rows
+        stats = data_manager.get_summary_statistics()
+
+        if stats["total_evaluations"] == 0:
             st.info("No evaluation results available. Run an evaluation first.")
             return
 
         # Display results table
-        st.write("**Results Table**")
-        display_columns = [
-            "test_case_id", "model_name", "model_type", "response_text",
-            "correctness_score", "relevancy_score", "status", "evaluation_time"
-        ]
-        # Filter columns that exist in the DataFrame
-        display_columns = [col for col in display_columns if col in results_df.columns]
-        st.dataframe(results_df[display_columns])
+        render_results_browser(data_manager)
 
         # Display summary report
         st.subheader("Summary Report")
-        report = generate_report(results_df)
-        
+        cube = data_manager.get_aggregation_cube()
+        report = generate_report(cube=cube)
+
         if isinstance(report, str):
             st.warning(report)
         else:
@@ -44,22 +280,37 @@ def render_results():
                         if key != 'model_name' and pd.notna(value):
                             st.write(f"{key.replace('_score', '').title()}: {value:.2f}")
 
+        render_category_breakdown(cube)
+
         # Display summary statistics
         st.subheader("Summary Statistics")
-        stats = data_manager.get_summary_statistics()
-        
+
         col1, col2 = st.columns(2)
         with col1:
             st.metric("Total Evaluations", stats["total_evaluations"])
             st.metric("Total Test Cases", stats["total_test_cases"])
         with col2:
             st.metric("Models Evaluated", len(stats["models_evaluated"]))
-        
+
         if stats["pass_rates"]:
             st.write("**Pass Rates by Metric**")
             for metric, rate in stats["pass_rates"].items():
                 st.write(f"{metric.replace('_score', '').title()}: {rate:.1f}%")
 
+        if stats.get("usage"):
+            st.write("**Throughput and Cost by Model**")
+            usage_df = pd.DataFrame.from_dict(stats["usage"], orient="index")[
+                ["cases", "prompt_tokens", "completion_tokens", "tokens_per_second",
+                 "avg_latency_ms", "avg_generation_ms", "load_duration_ms", "cost_usd", "cost_per_1k_cases"]
+            ]
+            st.dataframe(usage_df.round(4))
+
+        render_significance(data_manager, cube)
+
+        render_run_traces(data_manager)
+
+        render_report_export(data_manager)
+
     except Exception as e:
         logger.error(f"Error rendering results: {str(e)}")
-        st.error(f"Error displaying results: {str(e)}")
\ No newline at end of file
+        st.error(f"Error displaying results: {str(e)}")
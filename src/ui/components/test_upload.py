@@ -1,18 +1,33 @@
 import streamlit as st
 from src.data.csv_manager import CSVDataManager
+from src.ui.components.projects import get_data_manager
 import pandas as pd
 
+def render_dataset_diff(manager: CSVDataManager):
+    """Summarise how the latest dataset version differs from its parent."""
+    version = manager.datasets.latest_version()
+    if version is None:
+        return
+    parent = manager.datasets.load_manifest(version)['parent']
+    diff = manager.datasets.diff(parent, version)
+    st.caption(
+        f"Dataset {version}: {len(diff['new'])} new, {len(diff['changed'])} changed, "
+        f"{len(diff['removed'])} removed, {len(diff['unchanged'])} unchanged"
+        + (f" since {parent}" if parent else "")
+    )
+
 def render_test_upload():
     st.subheader("Upload Test Cases")
     uploaded_file = st.file_uploader("Choose a CSV file", type="csv")
     if uploaded_file is not None:
         try:
             df = pd.read_csv(uploaded_file)
-            manager = CSVDataManager()
+            manager = get_data_manager()
             if manager.save_test_cases(df.to_dict('records')):
-                st.session_state.test_cases = df.to_dict('records')
+                st.session_state.test_case_count = manager.count_test_cases()
                 st.success("Test cases uploaded successfully!")
+                render_dataset_diff(manager)
             else:
                 st.error("Failed to upload test cases.")
         except Exception as e:
-            st.error(f"Error uploading file: {str(e)}")
\ No newline at end of file
+            st.error(f"Error uploading file: {str(e)}")
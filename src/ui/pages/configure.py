@@ -1,5 +1,6 @@
 import streamlit as st
 from src.ui.components.model_config import render_model_config
+from src.ui.components.evaluation import render_evaluation
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -10,6 +11,7 @@ def show_configure_page():
         st.title("⚙️ Configure Models")
         st.markdown("Select a model type and specific model to use for evaluations.")
         render_model_config()
+        render_evaluation()
     except Exception as e:
         logger.error(f"Configure page error: {str(e)}")
         st.error(f"Error loading configure page: {str(e)}")
\ No newline at end of file
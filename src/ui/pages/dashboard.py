@@ -1,5 +1,8 @@
 import streamlit as st
-from src.data.csv_manager import CSVDataManager
+import pandas as pd
+from src.data.projects import ProjectStore
+from src.ui.components.projects import current_project, get_data_manager
+from src.ui.components.live_run import render_live_run
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -10,9 +13,15 @@ def show_dashboard():
         st.title("🏠 LLM Evaluation Framework Dashboard")
         st.markdown("Welcome to the LLM Evaluation Framework! Use the sidebar to navigate.")
 
-        # Display summary statistics
-        data_manager = CSVDataManager()
-        stats = data_manager.get_summary_statistics()
+        # Display summary statistics, merged from every project's cached summary when requested
+        all_projects = st.checkbox("All projects", help="Combine the summaries of every project")
+        if all_projects:
+            stats = ProjectStore().cross_project_summary()
+        else:
+            st.caption(f"Project: {current_project()}")
+            if st.checkbox("Live updates", help="Follow the latest run, reading only results appended since the last refresh"):
+                render_live_run()
+            stats = get_data_manager().get_summary_statistics()
 
         st.subheader("📊 Summary Statistics")
         col1, col2 = st.columns(2)
@@ -41,6 +50,10 @@ def show_dashboard():
             for metric, rate in stats["pass_rates"].items():
                 st.write(f"{metric.replace('_score', '').title()}: {rate:.1f}%")
 
+        if stats.get("projects"):
+            st.subheader("Projects")
+            st.dataframe(pd.DataFrame.from_dict(stats["projects"], orient="index"))
+
     except Exception as e:
         logger.error(f"Dashboard error: {str(e)}")
         st.error(f"Error loading dashboard: {str(e)}")
\ No newline at end of file
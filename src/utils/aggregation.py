@@ -0,0 +1,249 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+
+# Category label used for the per-model rollup rows of the cube
+ALL_CATEGORIES = "__all__"
+UNCATEGORIZED = "uncategorized"
+
+GROUP_KEYS = ['model_name', 'category', 'metric']
+ADDITIVE_COLUMNS = ['rows', 'count', 'sum', 'sum_sq', 'pass_count']
+PERCENTILES = [0.25, 0.5, 0.75, 0.9]
+USAGE_COLUMNS = ['prompt_tokens', 'completion_tokens', 'eval_duration_ms', 'duration_ms', 'load_duration_ms', 'cost_usd']
+
+
+def get_score_columns(df: pd.DataFrame) -> List[str]:
+    """Numeric columns holding metric scores"""
+    return [col for col in df.columns if col.endswith('_score') and pd.api.types.is_numeric_dtype(df[col])]
+
+
+def get_metric_rules(config) -> Tuple[Dict[str, float], Dict[str, bool]]:
+    """Read pass thresholds and score direction for every metric from a Config"""
+    thresholds = (config.metrics_config or {}).get('thresholds', {}) or {}
+    available = config.get_available_metrics() or {}
+    higher_is_better = {name: spec.get('higher_is_better', True) for name, spec in available.items()}
+    return thresholds, higher_is_better
+
+
+def latest_results(results_df: pd.DataFrame) -> pd.DataFrame:
+    """Union of old and new results: one row per (case_hash, model_name) holding the
+    most recent value of every column, so a later run that scored only some metrics
+    fills in rather than replaces. Test cases with identical content but different
+    ids (e.g. in different categories) keep a row each. Successful rows win over
+    errors; rows without a case_hash are kept as they are."""
+    if 'case_hash' not in results_df.columns or 'model_name' not in results_df.columns:
+        return results_df
+    keyed = results_df['case_hash'].notna()
+    if not keyed.any():
+        return results_df
+    hashed = results_df[keyed]
+    if 'status' in hashed.columns:
+        hashed = hashed.sort_values('status', key=lambda status: status.eq('success'), kind='stable')
+    keys = ['case_hash', 'model_name'] + (['test_case_id'] if 'test_case_id' in hashed.columns else [])
+    latest = hashed.groupby(keys, sort=False, as_index=False, dropna=False).last()
+    return pd.concat([results_df[~keyed], latest], ignore_index=True)
+
+
+def _melt_scores(results_df: pd.DataFrame, category_map: Optional[pd.Series]) -> pd.DataFrame:
+    """Reshape results to one row per (result, metric) with the test case category attached"""
+    score_columns = get_score_columns(results_df)
+    frame = pd.DataFrame({'model_name': results_df['model_name'].values})
+    if category_map is not None and 'test_case_id' in results_df.columns:
+        frame['category'] = results_df['test_case_id'].map(category_map).values
+    else:
+        frame['category'] = UNCATEGORIZED
+    frame['category'] = frame['category'].fillna(UNCATEGORIZED).astype(str)
+    frame['model_name'] = frame['model_name'].astype(str)
+    for col in score_columns:
+        frame[col] = results_df[col].astype(float).values
+    return frame.melt(id_vars=['model_name', 'category'], value_vars=score_columns,
+                      var_name='metric', value_name='score')
+
+
+def _flag_passes(long_df: pd.DataFrame, thresholds: Dict[str, float],
+                 higher_is_better: Dict[str, bool]) -> np.ndarray:
+    """Vectorised threshold check; missing scores never pass"""
+    codes, metrics = pd.factorize(long_df['metric'])
+    names = [metric.replace('_score', '') for metric in metrics]
+    threshold = np.array([thresholds.get(name, 0.5) for name in names], dtype=float)[codes]
+    higher = np.array([higher_is_better.get(name, True) for name in names], dtype=bool)[codes]
+    scores = long_df['score'].values
+    with np.errstate(invalid='ignore'):
+        passed = np.where(higher, scores >= threshold, scores <= threshold)
+    return passed & ~np.isnan(scores)
+
+
+def _prepare_long(results_df: pd.DataFrame, category_map: Optional[pd.Series],
+                  thresholds: Dict[str, float], higher_is_better: Dict[str, bool]) -> pd.DataFrame:
+    long_df = _melt_scores(results_df, category_map)
+    long_df['pass'] = _flag_passes(long_df, thresholds, higher_is_better)
+    long_df['score_sq'] = long_df['score'] ** 2
+    return long_df
+
+
+def _aggregate_cells(long_df: pd.DataFrame, keys: List[str]) -> pd.DataFrame:
+    return long_df.groupby(keys, sort=True).agg(
+        rows=('score', 'size'),
+        count=('score', 'count'),
+        sum=('score', 'sum'),
+        sum_sq=('score_sq', 'sum'),
+        pass_count=('pass', 'sum'),
+        min=('score', 'min'),
+        max=('score', 'max')
+    )
+
+
+def _has_scores(results_df: pd.DataFrame) -> bool:
+    return not results_df.empty and 'model_name' in results_df.columns and bool(get_score_columns(results_df))
+
+
+def build_partial_aggregates(results_df: pd.DataFrame,
+                             category_map: Optional[pd.Series],
+                             thresholds: Dict[str, float],
+                             higher_is_better: Dict[str, bool]) -> pd.DataFrame:
+    """Additive per (model, category, metric) statistics that can be merged across chunks or stores.
+
+    `rows` counts every result in the cell while `count` only counts scored results,
+    so pass rates keep treating a missing score as a failure.
+    """
+    if not _has_scores(results_df):
+        return pd.DataFrame(columns=GROUP_KEYS + ADDITIVE_COLUMNS + ['min', 'max'])
+    long_df = _prepare_long(results_df, category_map, thresholds, higher_is_better)
+    partial = _aggregate_cells(long_df, GROUP_KEYS).reset_index()
+    partial['pass_count'] = partial['pass_count'].astype(int)
+    return partial
+
+
+def merge_partial_aggregates(partials: List[pd.DataFrame]) -> pd.DataFrame:
+    """Combine partial aggregates computed over disjoint sets of results"""
+    partials = [p for p in partials if p is not None and not p.empty]
+    if not partials:
+        return pd.DataFrame(columns=GROUP_KEYS + ADDITIVE_COLUMNS + ['min', 'max'])
+    combined = pd.concat(partials, ignore_index=True)
+    aggregations = {col: 'sum' for col in ADDITIVE_COLUMNS}
+    if 'min' in combined.columns:
+        aggregations.update({'min': 'min', 'max': 'max'})
+    keys = [key for key in GROUP_KEYS if key in combined.columns]
+    return combined.groupby(keys, sort=True).agg(aggregations).reset_index()
+
+
+def finalize_aggregates(partial: pd.DataFrame) -> pd.DataFrame:
+    """Derive mean, standard deviation and pass rate from additive statistics"""
+    cube = partial.copy()
+    count = cube['count'].astype(float)
+    cube['mean'] = np.where(count > 0, cube['sum'] / count.where(count > 0), np.nan)
+    variance = (cube['sum_sq'] - cube['sum'] ** 2 / count.where(count > 0)) / (count - 1).where(count > 1)
+    cube['std'] = np.sqrt(variance.clip(lower=0))
+    rows = cube['rows'].astype(float)
+    cube['pass_rate'] = np.where(rows > 0, cube['pass_count'] / rows.where(rows > 0) * 100, 0.0)
+    return cube
+
+
+def rollup(cube: pd.DataFrame, by: List[str]) -> pd.DataFrame:
+    """Roll cube cells up to coarser groups, e.g. by=['metric'] for cross-model pass rates.
+
+    Only the additive statistics survive a rollup; percentiles are dropped.
+    """
+    cells = cube[cube['category'] != ALL_CATEGORIES]
+    aggregations = {col: 'sum' for col in ADDITIVE_COLUMNS}
+    if 'min' in cells.columns:
+        aggregations.update({'min': 'min', 'max': 'max'})
+    return finalize_aggregates(cells.groupby(by, sort=True).agg(aggregations).reset_index())
+
+
+def build_aggregation_cube(results_df: pd.DataFrame,
+                           test_cases_df: Optional[pd.DataFrame] = None,
+                           thresholds: Optional[Dict[str, float]] = None,
+                           higher_is_better: Optional[Dict[str, bool]] = None) -> pd.DataFrame:
+    """Build the model x category x metric cube in one pass over the results.
+
+    Each cell carries rows, count, mean, std, min, max, pass count, pass rate and
+    percentiles. Rows with category `ALL_CATEGORIES` hold the per-model rollup.
+    """
+    thresholds = thresholds or {}
+    higher_is_better = higher_is_better or {}
+    category_map = None
+    if test_cases_df is not None and not test_cases_df.empty and {'id', 'category'} <= set(test_cases_df.columns):
+        category_map = test_cases_df.drop_duplicates('id').set_index('id')['category']
+
+    columns = GROUP_KEYS + ADDITIVE_COLUMNS + ['min', 'max', 'mean', 'std', 'pass_rate'] + \
+        [f"p{int(q * 100)}" for q in PERCENTILES]
+    if not _has_scores(results_df):
+        return pd.DataFrame(columns=columns)
+
+    long_df = _prepare_long(results_df, category_map, thresholds, higher_is_better)
+
+    cubes = []
+    for keys in (GROUP_KEYS, ['model_name', 'metric']):
+        cells = _aggregate_cells(long_df, keys)
+        grouped = long_df.groupby(keys, sort=True)
+        quantiles = grouped['score'].quantile(PERCENTILES).unstack()
+        quantiles.columns = [f"p{int(q * 100)}" for q in quantiles.columns]
+        cells = cells.join(quantiles).reset_index()
+        if 'category' not in keys:
+            cells['category'] = ALL_CATEGORIES
+        cubes.append(cells)
+
+    cube = finalize_aggregates(pd.concat(cubes, ignore_index=True))
+    cube['pass_count'] = cube['pass_count'].astype(int)
+    return cube[columns]
+
+
+def model_averages(cube: pd.DataFrame) -> Dict[str, Dict[str, float]]:
+    """Mean score of every metric per model, read from the cube rollup rows"""
+    if cube.empty:
+        return {}
+    totals = cube[cube['category'] == ALL_CATEGORIES]
+    return totals.pivot(index='model_name', columns='metric', values='mean').to_dict('index')
+
+
+def metric_pass_rates(cube: pd.DataFrame) -> Dict[str, float]:
+    """Pass rate of every metric across all models"""
+    if cube.empty:
+        return {}
+    return rollup(cube, ['metric']).set_index('metric')['pass_rate'].to_dict()
+
+
+def coalesced_rows(results_df: pd.DataFrame) -> np.ndarray:
+    """Rows whose response was reused from another generation rather than generated for them"""
+    if 'coalesced' not in results_df.columns:
+        return np.zeros(len(results_df), dtype=bool)
+    return results_df['coalesced'].astype(str).str.lower().isin(('true', '1', '1.0')).values
+
+
+def build_usage_partials(results_df: pd.DataFrame) -> pd.DataFrame:
+    """Additive token, timing and cost sums per model.
+
+    Coalesced rows (shared generations and re-scored stored responses) reuse
+    another row's generation, so they are left out of `cases` and of the
+    token, time and cost sums rather than counted twice.
+    """
+    columns = ['model_name', 'cases', 'generated_tokens', 'generation_ms'] + USAGE_COLUMNS
+    if results_df.empty or 'model_name' not in results_df.columns:
+        return pd.DataFrame(columns=columns)
+    reused = coalesced_rows(results_df)
+    frame = pd.DataFrame({'model_name': results_df['model_name'].astype(str).values, 'generated': ~reused})
+    for col in USAGE_COLUMNS:
+        frame[col] = pd.to_numeric(results_df[col], errors='coerce').values if col in results_df.columns else np.nan
+        frame.loc[reused, col] = np.nan
+    # Throughput only counts rows where both tokens and decode time are known
+    timed = frame['completion_tokens'].notna() & frame['eval_duration_ms'].notna()
+    frame['generated_tokens'] = frame['completion_tokens'].where(timed)
+    frame['generation_ms'] = frame['eval_duration_ms'].where(timed)
+    grouped = frame.groupby('model_name', sort=True)
+    partial = grouped[USAGE_COLUMNS + ['generated_tokens', 'generation_ms']].sum(min_count=0)
+    partial['cases'] = grouped['generated'].sum()
+    return partial.reset_index()[columns]
+
+
+def finalize_usage(partial: pd.DataFrame) -> pd.DataFrame:
+    """Tokens per second and cost per 1k cases per model from usage sums"""
+    usage = partial.groupby('model_name', sort=True).sum(numeric_only=True).reset_index()
+    generation_s = usage['generation_ms'] / 1000
+    usage['tokens_per_second'] = (usage['generated_tokens'] / generation_s.where(generation_s > 0)).astype(float)
+    cases = usage['cases'].where(usage['cases'] > 0)
+    usage['avg_latency_ms'] = usage['duration_ms'] / cases
+    # Model load time is reported on its own and left out of generation time
+    usage['avg_generation_ms'] = (usage['duration_ms'] - usage['load_duration_ms']) / cases
+    usage['cost_per_1k_cases'] = usage['cost_usd'] / cases * 1000
+    return usage
@@ -9,9 +9,11 @@ class Config:
         self.config_dir = Path(config_dir)
         self.models_config_path = self.config_dir / "models_config.yaml"
         self.metrics_config_path = self.config_dir / "metrics_config.yaml"
+        self.logging_config_path = self.config_dir / "logging_config.yaml"
         self.config_dir.mkdir(exist_ok=True)
         self.models_config = self._load_models_config()
         self.metrics_config = self._load_metrics_config()
+        self.logging_config = self._load_logging_config()
 
     def _load_models_config(self) -> Dict[str, Any]:
         default_config = {
@@ -41,12 +43,38 @@ class Config:
                     'meta.llama2-13b-chat-v1',
                     'meta.llama2-70b-chat-v1'
                 ]
-            }
+            },
+            # Any OpenAI-compatible endpoint (OpenAI, vLLM, llama.cpp server); the key is read from OPENAI_API_KEY
+            'openai': {
+                'base_url': 'https://api.openai.com/v1',
+                'timeout': 60,
+                'max_connections': 32,
+                'models': ['gpt-4o-mini', 'gpt-4o', 'gpt-3.5-turbo']
+            },
+            # USD per 1k tokens; models without an entry are costed at zero
+            'pricing': {
+                'anthropic.claude-v2': {'input_per_1k': 0.008, 'output_per_1k': 0.024},
+                'anthropic.claude-v2:1': {'input_per_1k': 0.008, 'output_per_1k': 0.024},
+                'anthropic.claude-instant-v1': {'input_per_1k': 0.0008, 'output_per_1k': 0.0024},
+                'amazon.titan-text-express-v1': {'input_per_1k': 0.0002, 'output_per_1k': 0.0006},
+                'amazon.titan-text-lite-v1': {'input_per_1k': 0.00015, 'output_per_1k': 0.0002},
+                'meta.llama2-13b-chat-v1': {'input_per_1k': 0.00075, 'output_per_1k': 0.001},
+                'meta.llama2-70b-chat-v1': {'input_per_1k': 0.00195, 'output_per_1k': 0.00256}
+            },
+            # Adaptive in-flight request limits per backend (see src/pipeline/concurrency.py)
+            'concurrency': {
+                'ollama': {'initial_limit': 1, 'min_limit': 1, 'max_limit': 8, 'latency_tolerance': 2.0},
+                'bedrock': {'initial_limit': 4, 'min_limit': 1, 'max_limit': 32, 'latency_tolerance': 2.0},
+                'openai': {'initial_limit': 8, 'min_limit': 1, 'max_limit': 64, 'latency_tolerance': 2.0}
+            },
+            # Ollama model residency: models kept loaded at once, how long the server keeps
+            # them after use, and whether the next model is loaded while the current one drains
+            'scheduling': {'max_resident': 1, 'keep_alive': '10m', 'prewarm': True}
         }
         if self.models_config_path.exists():
             try:
                 with open(self.models_config_path, 'r') as f:
-                    config = yaml.safe_load(f)
+                    config = yaml.safe_load(f) or {}
                     for key, value in default_config.items():
                         if key not in config:
                             config[key] = value
@@ -108,12 +136,55 @@ class Config:
                 'coherence': 0.7,
                 'toxicity': 0.2,
                 'bias': 0.3
+            },
+            # Sequential evaluation: stop a model once its pass rate on `metric` is
+            # settled above or below `target_pass_rate` with error probability `alpha`
+            'early_stopping': {
+                'metric': 'correctness',
+                'target_pass_rate': 0.8,
+                'alpha': 0.05,
+                'method': 'wilson',
+                'min_samples': 20,
+                'check_every': 10,
+                'stratify_by': 'category',
+                'seed': 0
+            },
+            # Judge model scoring all default metrics in one call per row (or per
+            # `rows_per_call` rows packed together) with a cacheable rubric prefix
+            'judge': {
+                'model_type': 'ollama',
+                'model': 'llama3:8b',
+                'rows_per_call': 1,
+                'max_wait_ms': 50,
+                'keep_alive': '30m'
+            },
+            # Local CPU classifiers producing toxicity_score and bias_score; `quantize`
+            # applies dynamic int8 quantisation and backend 'onnx' runs ONNX Runtime
+            'classifiers': {
+                'toxicity_model': 'unitary/toxic-bert',
+                'bias_model': 'valurank/distilroberta-bias',
+                'backend': 'torch',
+                'quantize': True,
+                'batch_size': 32,
+                'max_wait_ms': 10
+            },
+            # Results older than `max_age_days` move to compressed archive segments;
+            # their aggregates stay in the dashboard summaries
+            'retention': {
+                # Archiving moves raw rows out of the results file, so it is opt-in
+                'enabled': False,
+                'max_age_days': 180,
+                'compaction_interval_hours': 24
             }
         }
         if self.metrics_config_path.exists():
             try:
                 with open(self.metrics_config_path, 'r') as f:
-                    return yaml.safe_load(f)
+                    config = yaml.safe_load(f) or {}
+                    for key, value in default_config.items():
+                        if key not in config:
+                            config[key] = value
+                    return config
             except Exception as e:
                 st.warning(f"Error loading metrics config: {e}. Using defaults.")
                 return default_config
@@ -121,6 +192,37 @@ class Config:
             self._save_metrics_config(default_config)
             return default_config
 
+    def _load_logging_config(self) -> Dict[str, Any]:
+        default_config = {
+            'level': 'INFO',
+            'console': True,
+            'file': {
+                'filename': 'app.jsonl',
+                'max_bytes': 10 * 1024 * 1024,
+                'backup_count': 5
+            },
+            # Per-logger levels, e.g. src.pipeline: DEBUG
+            'levels': {
+                'botocore': 'WARNING',
+                'urllib3': 'WARNING',
+                'httpx': 'WARNING'
+            }
+        }
+        if self.logging_config_path.exists():
+            try:
+                with open(self.logging_config_path, 'r') as f:
+                    config = yaml.safe_load(f) or {}
+                    for key, value in default_config.items():
+                        if key not in config:
+                            config[key] = value
+                    return config
+            except Exception as e:
+                st.warning(f"Error loading logging config: {e}. Using defaults.")
+                return default_config
+        else:
+            self._save_logging_config(default_config)
+            return default_config
+
     def _save_models_config(self, config: Dict[str, Any]):
         with open(self.models_config_path, 'w') as f:
             yaml.dump(config, f, default_flow_style=False)
@@ -129,6 +231,10 @@ class Config:
         with open(self.metrics_config_path, 'w') as f:
             yaml.dump(config, f, default_flow_style=False)
 
+    def _save_logging_config(self, config: Dict[str, Any]):
+        with open(self.logging_config_path, 'w') as f:
+            yaml.dump(config, f, default_flow_style=False)
+
     def get_available_ollama_models(self) -> List[str]:
         return self.models_config.get('ollama', {}).get('models', [])
 
@@ -138,6 +244,16 @@ class Config:
     def get_available_openai_models(self) -> List[str]:
         return self.models_config.get('openai', {}).get('models', [])
 
+    def get_model_pricing(self, model_name: str) -> Dict[str, float]:
+        pricing = self.models_config.get('pricing', {}) or {}
+        return pricing.get(model_name, pricing.get(model_name.strip(), {'input_per_1k': 0.0, 'output_per_1k': 0.0}))
+
+    def get_concurrency_settings(self, model_type: str) -> Dict[str, Any]:
+        return (self.models_config.get('concurrency', {}) or {}).get(model_type, {})
+
+    def get_scheduling_settings(self) -> Dict[str, Any]:
+        return self.models_config.get('scheduling', {}) or {}
+
     def get_available_metrics(self) -> Dict[str, Any]:
         return self.metrics_config.get('available_metrics', {})
 
@@ -147,6 +263,18 @@ class Config:
     def get_metric_threshold(self, metric_name: str) -> float:
         return self.metrics_config.get('thresholds', {}).get(metric_name, 0.5)
 
+    def get_early_stopping_settings(self) -> Dict[str, Any]:
+        return self.metrics_config.get('early_stopping', {})
+
+    def get_retention_settings(self) -> Dict[str, Any]:
+        return self.metrics_config.get('retention', {})
+
+    def get_judge_settings(self) -> Dict[str, Any]:
+        return self.metrics_config.get('judge', {})
+
+    def get_classifier_settings(self) -> Dict[str, Any]:
+        return self.metrics_config.get('classifiers', {})
+
     def update_models_config(self, new_config: Dict[str, Any]):
         self.models_config.update(new_config)
         self._save_models_config(self.models_config)
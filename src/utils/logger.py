@@ -1,10 +1,139 @@
+import atexit
+import copy
+import json
 import logging
+import logging.handlers
+import queue
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+CONSOLE_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# LogRecord attributes that are not user-supplied `extra` fields
+_RESERVED_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime'}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.Handler] = None
+_configure_lock = threading.Lock()
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as single-line JSON objects, including any `extra` fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'module': record.module,
+            'line': record.lineno,
+            'thread': record.threadName
+        }
+        for key, value in vars(record).items():
+            if key not in _RESERVED_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class _EnqueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that only renders the message and traceback before enqueueing"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _build_handlers(settings: Dict[str, Any], logs_dir: Path):
+    handlers = []
+    file_settings = settings.get('file')
+    if file_settings:
+        logs_dir.mkdir(parents=True, exist_ok=True)
+        file_handler = logging.handlers.RotatingFileHandler(
+            logs_dir / file_settings.get('filename', 'app.jsonl'),
+            maxBytes=int(file_settings.get('max_bytes', 10 * 1024 * 1024)),
+            backupCount=int(file_settings.get('backup_count', 5)),
+            encoding='utf-8'
+        )
+        file_handler.setFormatter(JsonFormatter())
+        handlers.append(file_handler)
+    if settings.get('console', True):
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+        handlers.append(console_handler)
+    return handlers
+
+
+def configure_logging(settings: Optional[Dict[str, Any]] = None, logs_dir: Optional[Path] = None,
+                      force: bool = False) -> logging.handlers.QueueListener:
+    """Route all logging through a queue drained by a background listener.
+
+    Safe to call repeatedly: only the first call (or one with `force`) installs
+    handlers, so Streamlit reruns never duplicate output. Settings default to
+    config/logging_config.yaml and files are written under Config.logs_dir.
+    """
+    global _listener, _queue_handler
+    with _configure_lock:
+        if _listener is not None and not force:
+            return _listener
+        _shutdown_locked()
+
+        if settings is None or logs_dir is None:
+            from src.utils.config import Config
+            config = Config()
+            settings = settings if settings is not None else config.logging_config
+            logs_dir = logs_dir if logs_dir is not None else config.logs_dir
+
+        log_queue = queue.SimpleQueue()
+        _listener = logging.handlers.QueueListener(
+            log_queue, *_build_handlers(settings, Path(logs_dir)), respect_handler_level=True
+        )
+        _queue_handler = _EnqueueHandler(log_queue)
+
+        root = logging.getLogger()
+        root.addHandler(_queue_handler)
+        root.setLevel(settings.get('level', 'INFO'))
+        for name, level in (settings.get('levels') or {}).items():
+            logging.getLogger(name).setLevel(level)
+
+        _listener.start()
+        return _listener
+
+
+def _shutdown_locked():
+    global _listener, _queue_handler
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+def shutdown_logging():
+    """Flush queued records and remove the handlers installed by configure_logging"""
+    with _configure_lock:
+        _shutdown_locked()
+
 
 def setup_logger(name):
-    logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
-    handler = logging.StreamHandler()
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
-    return logger
\ No newline at end of file
+    """Module logger; handlers live on the root logger, so repeated calls add nothing"""
+    configure_logging()
+    return logging.getLogger(name)
+
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,202 @@
+import html
+import json
+import pandas as pd
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Sequence
+from src.data.csv_manager import CSVDataManager
+from src.utils.config import Config
+from src.utils.aggregation import ALL_CATEGORIES, get_metric_rules
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+SUPPORTED_FORMATS = ("html", "json", "csv")
+SUMMARY_COLUMNS = [
+    "model_name", "category", "metric", "rows", "count", "mean", "std", "min", "max",
+    "p25", "p50", "p75", "p90", "pass_count", "pass_rate"
+]
+EXAMPLE_COLUMNS = ["id", "test_case_id", "model_name", "category", "metric", "score", "status", "response_text"]
+
+HTML_STYLE = """
+body { font-family: -apple-system, Segoe UI, Helvetica, Arial, sans-serif; margin: 2rem; color: #222; }
+h1 { font-size: 1.6rem; } h2 { font-size: 1.2rem; margin-top: 2rem; border-bottom: 1px solid #ddd; }
+table { border-collapse: collapse; margin: 0.5rem 0 1rem; font-size: 0.85rem; }
+th, td { border: 1px solid #ddd; padding: 4px 8px; text-align: left; vertical-align: top; }
+th { background: #f4f4f4; } td.num { text-align: right; font-variant-numeric: tabular-nums; }
+.meta { color: #666; font-size: 0.85rem; }
+"""
+
+
+class ReportExporter:
+    """Writes evaluation results as self-contained HTML, JSON and CSV reports.
+
+    Summary numbers are read from the data manager's summary cube, so they match
+    the dashboard. Raw results are only streamed in chunks into bounded
+    worst-example lists, so memory does not grow with the number of rows.
+    """
+
+    def __init__(self, data_manager: Optional[CSVDataManager] = None, config: Optional[Config] = None,
+                 output_dir: Optional[Path] = None, chunk_size: int = 100_000, worst_n: int = 10,
+                 max_response_chars: int = 500):
+        self.data_manager = data_manager or CSVDataManager()
+        self.config = config or Config()
+        self.output_dir = Path(output_dir) if output_dir else self.config.reports_dir
+        self.chunk_size = chunk_size
+        self.worst_n = worst_n
+        self.max_response_chars = max_response_chars
+
+    def collect(self) -> Dict[str, Any]:
+        """Read the summary cube and stream the results store once for the worst examples"""
+        thresholds, higher_is_better = get_metric_rules(self.config)
+        # Summary numbers come from the materialised cube, so they match the dashboard
+        cube, meta = self.data_manager.get_summary_partials()
+        if cube.empty:
+            per_category = pd.DataFrame(columns=SUMMARY_COLUMNS)
+            per_model = pd.DataFrame(columns=SUMMARY_COLUMNS)
+        else:
+            # Metrics that were never scored only add empty rows to a report
+            scored = cube[cube['count'] > 0]
+            per_category = scored[scored['category'] != ALL_CATEGORIES].reindex(columns=SUMMARY_COLUMNS)
+            per_model = scored[scored['category'] == ALL_CATEGORIES].reindex(columns=SUMMARY_COLUMNS)
+            per_category = per_category.reset_index(drop=True)
+            per_model = per_model.reset_index(drop=True)
+
+        test_cases_df = self.data_manager.load_test_cases()
+        category_map = None
+        if {'id', 'category'} <= set(test_cases_df.columns):
+            category_map = test_cases_df.drop_duplicates('id').set_index('id')['category']
+
+        worst: Dict[str, pd.DataFrame] = {}
+        status_counts = None
+        for chunk in self.data_manager.iter_evaluation_results(chunk_size=self.chunk_size):
+            if 'status' in chunk.columns and 'model_name' in chunk.columns:
+                counts = chunk.groupby(['model_name', 'status']).size()
+                status_counts = _add_counts(status_counts, counts)
+            self._update_worst(worst, chunk, category_map, higher_is_better)
+
+        return {
+            "generated_at": datetime.now().isoformat(),
+            "total_evaluations": meta["total_evaluations"],
+            "thresholds": thresholds,
+            "per_model": per_model,
+            "per_category": per_category,
+            "status_counts": {
+                f"{model}|{status}": int(count) for (model, status), count in status_counts.items()
+            } if status_counts is not None else {},
+            "worst_examples": {metric: frame.reindex(columns=EXAMPLE_COLUMNS) for metric, frame in worst.items()}
+        }
+
+    def _update_worst(self, worst: Dict[str, pd.DataFrame], chunk: pd.DataFrame,
+                      category_map: Optional[pd.Series], higher_is_better: Dict[str, bool]):
+        """Keep the worst_n lowest-quality rows per metric seen so far"""
+        score_columns = [col for col in chunk.columns
+                         if col.endswith('_score') and pd.api.types.is_numeric_dtype(chunk[col])]
+        for metric in score_columns:
+            higher = higher_is_better.get(metric.replace('_score', ''), True)
+            scored = chunk.dropna(subset=[metric])
+            if scored.empty:
+                continue
+            candidates = scored.nsmallest(self.worst_n, metric) if higher else scored.nlargest(self.worst_n, metric)
+            keep = [col for col in ('id', 'test_case_id', 'model_name', 'status', 'response_text') if col in chunk.columns]
+            candidates = candidates[keep + [metric]].rename(columns={metric: 'score'})
+            candidates['metric'] = metric
+            if category_map is not None and 'test_case_id' in candidates.columns:
+                candidates['category'] = candidates['test_case_id'].map(category_map)
+            if 'response_text' in candidates.columns:
+                candidates['response_text'] = candidates['response_text'].astype('string').str.slice(0, self.max_response_chars)
+            merged = pd.concat([worst[metric], candidates], ignore_index=True) if metric in worst else candidates
+            worst[metric] = (merged.nsmallest(self.worst_n, 'score') if higher
+                             else merged.nlargest(self.worst_n, 'score')).reset_index(drop=True)
+
+    def export(self, formats: Sequence[str] = SUPPORTED_FORMATS, name: Optional[str] = None) -> Dict[str, Path]:
+        """Write the report in each requested format and return the written paths"""
+        unknown = set(formats) - set(SUPPORTED_FORMATS)
+        if unknown:
+            raise ValueError(f"Unsupported report formats: {', '.join(sorted(unknown))}")
+
+        report = self.collect()
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        name = name or f"evaluation_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        writers = {"html": self._write_html, "json": self._write_json, "csv": self._write_csv}
+        paths = {}
+        for fmt in formats:
+            paths[fmt] = writers[fmt](report, name)
+            logger.info(f"Wrote {fmt} report to {paths[fmt]}")
+        return paths
+
+    def _write_csv(self, report: Dict[str, Any], name: str) -> Path:
+        path = self.output_dir / f"{name}.csv"
+        summary = pd.concat([report["per_model"], report["per_category"]], ignore_index=True)
+        summary.to_csv(path, index=False)
+        examples = [frame for frame in report["worst_examples"].values() if not frame.empty]
+        if examples:
+            pd.concat(examples, ignore_index=True).to_csv(self.output_dir / f"{name}_worst_examples.csv", index=False)
+        return path
+
+    def _write_json(self, report: Dict[str, Any], name: str) -> Path:
+        path = self.output_dir / f"{name}.json"
+        payload = {
+            "generated_at": report["generated_at"],
+            "total_evaluations": report["total_evaluations"],
+            "thresholds": report["thresholds"],
+            "status_counts": report["status_counts"],
+            "per_model": _records(report["per_model"]),
+            "per_category": _records(report["per_category"]),
+            "worst_examples": {metric: _records(frame) for metric, frame in report["worst_examples"].items()}
+        }
+        with open(path, 'w') as f:
+            json.dump(payload, f, indent=2, default=str)
+        return path
+
+    def _write_html(self, report: Dict[str, Any], name: str) -> Path:
+        path = self.output_dir / f"{name}.html"
+        sections = [
+            "<h1>LLM Evaluation Report</h1>",
+            f"<p class='meta'>Generated {html.escape(report['generated_at'])} &middot; "
+            f"{report['total_evaluations']} evaluations</p>",
+            "<h2>Per-model summary</h2>", _html_table(report["per_model"].drop(columns=['category'])),
+            "<h2>Per-category breakdown</h2>", _html_table(report["per_category"]),
+        ]
+        for metric, frame in report["worst_examples"].items():
+            sections.append(f"<h2>Worst examples: {html.escape(metric.replace('_score', '').title())}</h2>")
+            sections.append(_html_table(frame))
+        document = (
+            "<!DOCTYPE html><html><head><meta charset='utf-8'>"
+            f"<title>{html.escape(name)}</title><style>{HTML_STYLE}</style></head><body>"
+            + "\n".join(sections) + "</body></html>"
+        )
+        path.write_text(document, encoding='utf-8')
+        return path
+
+
+def _add_counts(total: Optional[pd.Series], counts: pd.Series) -> pd.Series:
+    """Add two count series aligned on their index"""
+    if total is None or total.empty:
+        return counts
+    if counts.empty:
+        return total
+    return total.add(counts, fill_value=0)
+
+
+def _records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """DataFrame rows as JSON-safe dicts with NaN mapped to None"""
+    return json.loads(df.to_json(orient='records'))
+
+
+def _html_table(df: pd.DataFrame) -> str:
+    if df.empty:
+        return "<p class='meta'>No data</p>"
+    header = "".join(f"<th>{html.escape(str(col))}</th>" for col in df.columns)
+    rows = []
+    for row in df.itertuples(index=False):
+        cells = []
+        for value in row:
+            if isinstance(value, float):
+                cells.append(f"<td class='num'>{'' if pd.isna(value) else f'{value:.3f}'}</td>")
+            elif isinstance(value, int):
+                cells.append(f"<td class='num'>{value}</td>")
+            else:
+                cells.append(f"<td>{'' if pd.isna(value) else html.escape(str(value))}</td>")
+        rows.append(f"<tr>{''.join(cells)}</tr>")
+    return f"<table><thead><tr>{header}</tr></thead><tbody>{''.join(rows)}</tbody></table>"
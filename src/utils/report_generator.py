@@ -1,10 +1,15 @@
 import pandas as pd
+from src.utils.aggregation import ALL_CATEGORIES, build_aggregation_cube
 
-def generate_report(results_df):
-    if results_df.empty:
-        return "No results to report"
-    numeric_cols = [col for col in results_df.columns if col.endswith('_score') and pd.api.types.is_numeric_dtype(results_df[col])]
-    if not numeric_cols:
+def generate_report(results_df=None, cube=None):
+    """Per-model mean scores, read from a summary cube (built from results_df if not given)"""
+    if cube is None:
+        if results_df is None or results_df.empty:
+            return "No results to report"
+        cube = build_aggregation_cube(results_df)
+    if cube.empty:
         return "No score columns found"
-    summary = results_df.groupby('model_name')[numeric_cols].mean().reset_index()
-    return summary.to_dict(orient='records')
\ No newline at end of file
+    totals = cube[cube['category'] == ALL_CATEGORIES]
+    summary = totals.pivot(index='model_name', columns='metric', values='mean').reset_index()
+    summary.columns.name = None
+    return summary.to_dict(orient='records')
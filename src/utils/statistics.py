@@ -0,0 +1,155 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, List, Optional, Tuple
+
+DEFAULT_SEED = 42
+DEFAULT_RESAMPLES = 2000
+
+# Scores are rounded to this resolution before resampling so the support stays small
+SCORE_RESOLUTION = 1e-3
+# Largest number of distinct values resampled through the multinomial path
+MAX_SUPPORT = 4096
+# Upper bound on resample indices materialised at once by the fallback path
+MAX_BLOCK_ELEMENTS = 20_000_000
+
+
+def resample_means(values: np.ndarray, n_resamples: int = DEFAULT_RESAMPLES,
+                   seed: int = DEFAULT_SEED, resolution: Optional[float] = SCORE_RESOLUTION) -> np.ndarray:
+    """Bootstrap distribution of the mean of values.
+
+    Resampling n values with replacement only changes how often each distinct value
+    is drawn, so the draw counts are sampled from a multinomial over the distinct
+    values and each resample mean is a dot product. With values rounded to
+    `resolution` this costs O(resamples x distinct values) instead of
+    O(resamples x n). Supports larger than MAX_SUPPORT fall back to blocked
+    index resampling.
+    """
+    rng = np.random.default_rng(seed)
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    n = len(values)
+    if n == 0:
+        return np.full(n_resamples, np.nan)
+    if resolution:
+        values = np.round(values / resolution) * resolution
+
+    support, counts = np.unique(values, return_counts=True)
+    if len(support) <= MAX_SUPPORT:
+        draws = rng.multinomial(n, counts / n, size=n_resamples)
+        return draws @ support / n
+
+    means = np.empty(n_resamples)
+    block = max(MAX_BLOCK_ELEMENTS // n, 1)
+    for start in range(0, n_resamples, block):
+        stop = min(start + block, n_resamples)
+        means[start:stop] = values[rng.integers(0, n, size=(stop - start, n))].mean(axis=1)
+    return means
+
+
+def resample_proportions(successes: int, n: int, n_resamples: int = DEFAULT_RESAMPLES,
+                         seed: int = DEFAULT_SEED) -> np.ndarray:
+    """Bootstrap distribution of a proportion; resampling Bernoulli outcomes is a binomial draw"""
+    if n == 0:
+        return np.full(n_resamples, np.nan)
+    rng = np.random.default_rng(seed)
+    return rng.binomial(n, successes / n, size=n_resamples) / n
+
+
+def percentile_interval(samples: np.ndarray, confidence: float = 0.95) -> Tuple[float, float]:
+    """Percentile bootstrap interval"""
+    if np.all(np.isnan(samples)):
+        return np.nan, np.nan
+    alpha = (1 - confidence) / 2
+    lower, upper = np.nanquantile(samples, [alpha, 1 - alpha])
+    return float(lower), float(upper)
+
+
+def bootstrap_metric_intervals(results_df: pd.DataFrame, thresholds: Dict[str, float],
+                               higher_is_better: Dict[str, bool], metrics: Optional[List[str]] = None,
+                               confidence: float = 0.95, n_resamples: int = DEFAULT_RESAMPLES,
+                               seed: int = DEFAULT_SEED) -> pd.DataFrame:
+    """Confidence intervals for the mean score and pass rate of each model and metric.
+
+    Pass rates use every result as the denominator, so a missing score counts as a
+    failure, matching the summary cube.
+    """
+    metrics = metrics or [col for col in results_df.columns
+                          if col.endswith('_score') and pd.api.types.is_numeric_dtype(results_df[col])]
+    rows = []
+    for model_name, group in results_df.groupby('model_name', sort=True):
+        for metric in metrics:
+            scores = group[metric].to_numpy(dtype=float)
+            scored = scores[~np.isnan(scores)]
+            if len(scored) == 0:
+                continue
+            name = metric.replace('_score', '')
+            threshold = thresholds.get(name, 0.5)
+            passed = scored >= threshold if higher_is_better.get(name, True) else scored <= threshold
+            mean_lower, mean_upper = percentile_interval(resample_means(scored, n_resamples, seed), confidence)
+            rate_lower, rate_upper = percentile_interval(
+                resample_proportions(int(passed.sum()), len(scores), n_resamples, seed), confidence
+            )
+            rows.append({
+                "model_name": model_name,
+                "metric": metric,
+                "n": len(scored),
+                "mean": float(scored.mean()),
+                "mean_lower": mean_lower,
+                "mean_upper": mean_upper,
+                "pass_rate": passed.sum() / len(scores) * 100,
+                "pass_rate_lower": rate_lower * 100,
+                "pass_rate_upper": rate_upper * 100
+            })
+    return pd.DataFrame(rows, columns=[
+        "model_name", "metric", "n", "mean", "mean_lower", "mean_upper",
+        "pass_rate", "pass_rate_lower", "pass_rate_upper"
+    ])
+
+
+def paired_comparison(results_df: pd.DataFrame, model_a: str, model_b: str, metric: str,
+                      confidence: float = 0.95, n_resamples: int = DEFAULT_RESAMPLES,
+                      seed: int = DEFAULT_SEED) -> Dict[str, Any]:
+    """Paired bootstrap test of the mean score difference (a - b) on shared test cases.
+
+    Repeated results for the same test case and model are averaged first. The
+    p-value is two-sided, from the bootstrap distribution of the mean difference
+    re-centred on zero.
+    """
+    subset = results_df[results_df['model_name'].isin([model_a, model_b])]
+    paired = subset.pivot_table(index='test_case_id', columns='model_name', values=metric, aggfunc='mean')
+    if model_a not in paired.columns or model_b not in paired.columns:
+        differences = np.array([])
+    else:
+        paired = paired[[model_a, model_b]].dropna()
+        differences = (paired[model_a] - paired[model_b]).to_numpy()
+
+    result = {
+        "model_a": model_a,
+        "model_b": model_b,
+        "metric": metric,
+        "n_pairs": len(differences),
+        "mean_difference": np.nan,
+        "lower": np.nan,
+        "upper": np.nan,
+        "p_value": np.nan,
+        "wins": int((differences > 0).sum()),
+        "ties": int((differences == 0).sum()),
+        "losses": int((differences < 0).sum()),
+        "significant": False
+    }
+    if len(differences) < 2:
+        return result
+
+    observed = float(differences.mean())
+    boot = resample_means(differences, n_resamples, seed)
+    lower, upper = percentile_interval(boot, confidence)
+    centered = boot - boot.mean()
+    p_value = (np.sum(np.abs(centered) >= abs(observed)) + 1) / (n_resamples + 1)
+    result.update({
+        "mean_difference": observed,
+        "lower": lower,
+        "upper": upper,
+        "p_value": float(p_value),
+        "significant": bool(p_value < 1 - confidence)
+    })
+    return result
@@ -0,0 +1,302 @@
+import atexit
+import json
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+
+class Span:
+    """A timed unit of work within a trace"""
+
+    __slots__ = ('name', 'trace_id', 'span_id', 'parent_id', 'start_ns', 'end_ns', 'attributes', 'status', 'tracer')
+    sampled = True
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict[str, Any],
+                 tracer: Optional["Tracer"] = None):
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.attributes = attributes
+        self.status = "ok"
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        return (self.end_ns - self.start_ns) / 1e6 if self.end_ns is not None else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "attributes": self.attributes
+        }
+
+
+class _UnsampledSpan:
+    """Stand-in for spans dropped by sampling; children inherit the decision"""
+
+    sampled = False
+    trace_id = None
+    span_id = None
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+
+UNSAMPLED = _UnsampledSpan()
+
+
+class RingBufferExporter:
+    """Keeps the most recent finished spans in memory"""
+
+    def __init__(self, capacity: int = 10_000):
+        self._spans = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+
+    def export(self, span: Span):
+        with self._lock:
+            self._spans.append(span.to_dict())
+
+    def spans(self, trace_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [s for s in self._spans if trace_id is None or s["trace_id"] == trace_id]
+
+    def trace_ids(self) -> List[str]:
+        """Trace ids of root spans, most recent first"""
+        with self._lock:
+            return [s["trace_id"] for s in reversed(self._spans) if s["parent_id"] is None]
+
+    def flush(self):
+        pass
+
+
+class JsonlExporter:
+    """Appends finished spans to a JSON lines file, buffered and flushed when a trace ends.
+
+    Once the file passes `max_bytes` it is rotated to `traces.jsonl.1` and so on,
+    keeping `backup_count` old files, so looking up a trace reads a bounded amount.
+    """
+
+    def __init__(self, path: Path, buffer_size: int = 256, max_bytes: int = 20 * 1024 * 1024,
+                 backup_count: int = 3):
+        self.path = Path(path)
+        self.buffer_size = buffer_size
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._buffer = []
+        self._lock = threading.Lock()
+
+    def export(self, span: Span):
+        with self._lock:
+            self._buffer.append(span.to_dict())
+            if span.parent_id is None or len(self._buffer) >= self.buffer_size:
+                self._flush_locked()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._buffer:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.exists() and self.path.stat().st_size >= self.max_bytes:
+            self._rotate()
+        with open(self.path, 'a') as f:
+            f.write("".join(json.dumps(span, default=str) + "\n" for span in self._buffer))
+        self._buffer = []
+
+    def _rotate(self):
+        for index in range(self.backup_count - 1, 0, -1):
+            older = Path(f"{self.path}.{index}")
+            if older.exists():
+                older.replace(f"{self.path}.{index + 1}")
+        if self.backup_count > 0:
+            self.path.replace(f"{self.path}.1")
+        else:
+            self.path.unlink()
+
+
+_current_span: ContextVar = ContextVar("current_span", default=None)
+
+
+class Tracer:
+    """Creates spans and hands finished ones to exporters.
+
+    Sampling is decided once per trace (or per subtree when `sampled` is passed)
+    and inherited by child spans, so unsampled work costs one context switch.
+    """
+
+    def __init__(self, exporters: Optional[List[Any]] = None, sample_rate: float = 1.0, seed: Optional[int] = None):
+        self.exporters = exporters or []
+        self.sample_rate = sample_rate
+        self._random = random.Random(seed)
+
+    def should_sample(self) -> bool:
+        return self.sample_rate >= 1.0 or self._random.random() < self.sample_rate
+
+    def current_span(self):
+        return _current_span.get()
+
+    @contextmanager
+    def span(self, name: str, sampled: Optional[bool] = None, parent=None, trace_id: Optional[str] = None,
+             require_parent: bool = False, **attributes):
+        """Time the enclosed block as a span.
+
+        `parent` overrides the context parent (for work handed to other threads),
+        `require_parent` records the span only inside an existing trace, and
+        `sampled` forces a new sampling decision for this subtree.
+        """
+        parent = parent if parent is not None else _current_span.get()
+        if parent is None and require_parent:
+            yield UNSAMPLED
+            return
+        if sampled is None:
+            sampled = parent.sampled if parent is not None else self.should_sample()
+        if not sampled:
+            token = _current_span.set(UNSAMPLED)
+            try:
+                yield UNSAMPLED
+            finally:
+                _current_span.reset(token)
+            return
+
+        sampled_parent = parent if parent is not None and parent.sampled else None
+        span = Span(
+            name,
+            trace_id or (sampled_parent.trace_id if sampled_parent else uuid.uuid4().hex[:12]),
+            sampled_parent.span_id if sampled_parent else None,
+            attributes,
+            self
+        )
+        token = _current_span.set(span)
+        try:
+            yield span
+        except Exception as e:
+            span.status = "error"
+            span.attributes["error"] = str(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end_ns = time.time_ns()
+            for exporter in self.exporters:
+                exporter.export(span)
+
+    def flush(self):
+        for exporter in self.exporters:
+            exporter.flush()
+
+
+_tracer: Optional[Tracer] = None
+_ring_buffer: Optional[RingBufferExporter] = None
+_tracer_lock = threading.Lock()
+
+
+def default_trace_path() -> Path:
+    """traces.jsonl under the configured logs directory"""
+    from src.utils.config import Config
+    return Config().logs_dir / "traces.jsonl"
+
+
+def configure_tracing(path: Optional[Path] = None, sample_rate: float = 1.0, buffer_size: int = 10_000,
+                      to_file: bool = True) -> Tracer:
+    """Install the process-wide tracer exporting to logs/traces.jsonl and an in-memory ring buffer"""
+    global _tracer, _ring_buffer
+    with _tracer_lock:
+        if _tracer is not None:
+            _tracer.flush()
+        _ring_buffer = RingBufferExporter(buffer_size)
+        exporters = [_ring_buffer]
+        if to_file:
+            exporters.append(JsonlExporter(path or default_trace_path()))
+        _tracer = Tracer(exporters, sample_rate)
+        return _tracer
+
+
+def get_tracer() -> Tracer:
+    """The process-wide tracer, configured with defaults on first use"""
+    if _tracer is None:
+        configure_tracing()
+    return _tracer
+
+
+def get_ring_buffer() -> RingBufferExporter:
+    get_tracer()
+    return _ring_buffer
+
+
+def child_span(name: str, **attributes):
+    """Span recorded only inside an active trace, by the tracer that started it.
+
+    Used by lower layers (such as CSV I/O) that should show up in a run's trace
+    without creating traces of their own.
+    """
+    parent = _current_span.get()
+    tracer = getattr(parent, "tracer", None) or get_tracer()
+    return tracer.span(name, require_parent=True, **attributes)
+
+
+def load_trace(trace_id: str, path: Optional[Path] = None) -> List[Dict[str, Any]]:
+    """Spans of one trace, from the ring buffer or else the JSONL file and its rotated copies.
+
+    Files are read newest first, stopping at the first file without spans of the
+    trace once some were found.
+    """
+    spans = get_ring_buffer().spans(trace_id)
+    if spans:
+        return spans
+    path = Path(path or default_trace_path())
+    rotated = [older for older in path.parent.glob(f"{path.name}.*") if older.suffix[1:].isdigit()]
+    files = [path] + sorted(rotated, key=lambda older: int(older.suffix[1:]))
+    spans = []
+    for trace_file in files:
+        if not trace_file.exists():
+            continue
+        with open(trace_file, 'r') as f:
+            found = [span for span in map(json.loads, f) if span["trace_id"] == trace_id]
+        if not found and spans:
+            break
+        # Older files hold the earlier spans of the trace
+        spans = found + spans
+    return spans
+
+
+def summarise_trace(spans: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Time per span name, with self time excluding child spans, sorted by total time"""
+    child_time: Dict[str, float] = {}
+    for span in spans:
+        if span["parent_id"] and span["duration_ms"] is not None:
+            child_time[span["parent_id"]] = child_time.get(span["parent_id"], 0.0) + span["duration_ms"]
+    stages: Dict[str, Dict[str, Any]] = {}
+    for span in spans:
+        duration = span["duration_ms"] or 0.0
+        stage = stages.setdefault(span["name"], {"stage": span["name"], "count": 0, "total_ms": 0.0, "self_ms": 0.0})
+        stage["count"] += 1
+        stage["total_ms"] += duration
+        stage["self_ms"] += max(duration - child_time.get(span["span_id"], 0.0), 0.0)
+    total_self = sum(stage["self_ms"] for stage in stages.values()) or 1.0
+    for stage in stages.values():
+        stage["mean_ms"] = stage["total_ms"] / stage["count"]
+        stage["self_share"] = stage["self_ms"] / total_self * 100
+    return sorted(stages.values(), key=lambda stage: stage["total_ms"], reverse=True)
+
+
+atexit.register(lambda: _tracer.flush() if _tracer is not None else None)
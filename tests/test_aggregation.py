@@ -0,0 +1,60 @@
+import pytest
+import numpy as np
+import pandas as pd
+from src.utils.aggregation import (
+    ALL_CATEGORIES, build_aggregation_cube, build_partial_aggregates, finalize_aggregates,
+    merge_partial_aggregates, metric_pass_rates, model_averages, rollup
+)
+from src.utils.report_generator import generate_report
+
+THRESHOLDS = {"correctness": 0.7, "toxicity": 0.2}
+HIGHER_IS_BETTER = {"correctness": True, "toxicity": False}
+
+@pytest.fixture
+def results_df():
+    return pd.DataFrame([
+        {"test_case_id": 1, "model_name": "a", "correctness_score": 0.9, "toxicity_score": 0.1},
+        {"test_case_id": 2, "model_name": "a", "correctness_score": 0.5, "toxicity_score": 0.3},
+        {"test_case_id": 1, "model_name": "b", "correctness_score": 0.8, "toxicity_score": np.nan},
+        {"test_case_id": 2, "model_name": "b", "correctness_score": 0.7, "toxicity_score": 0.0}
+    ])
+
+@pytest.fixture
+def test_cases_df():
+    return pd.DataFrame([{"id": 1, "category": "greeting"}, {"id": 2, "category": "math"}])
+
+def test_cube_cells_and_rollup_rows(results_df, test_cases_df):
+    cube = build_aggregation_cube(results_df, test_cases_df, THRESHOLDS, HIGHER_IS_BETTER)
+    totals = cube[(cube["category"] == ALL_CATEGORIES) & (cube["metric"] == "correctness_score")].set_index("model_name")
+    assert totals.loc["a", "mean"] == pytest.approx(0.7)
+    assert totals.loc["a", "std"] == pytest.approx(np.std([0.9, 0.5], ddof=1))
+    assert totals.loc["a", "p50"] == pytest.approx(0.7)
+    assert totals.loc["a", "pass_rate"] == 50.0
+    math = cube[(cube["category"] == "math") & (cube["metric"] == "toxicity_score")].set_index("model_name")
+    assert math.loc["a", "pass_count"] == 0  # 0.3 > 0.2 and lower is better
+    assert math.loc["b", "pass_count"] == 1
+
+def test_missing_scores_count_as_failures(results_df):
+    cube = build_aggregation_cube(results_df, None, THRESHOLDS, HIGHER_IS_BETTER)
+    rates = metric_pass_rates(cube)
+    assert rates["toxicity_score"] == 50.0  # 0.1 and 0.0 pass, 0.3 fails, NaN fails
+    assert model_averages(cube)["b"]["toxicity_score"] == pytest.approx(0.0)
+
+def test_merged_partials_match_full_cube(results_df, test_cases_df):
+    category_map = test_cases_df.set_index("id")["category"]
+    partials = [
+        build_partial_aggregates(results_df.iloc[:2], category_map, THRESHOLDS, HIGHER_IS_BETTER),
+        build_partial_aggregates(results_df.iloc[2:], category_map, THRESHOLDS, HIGHER_IS_BETTER)
+    ]
+    merged = finalize_aggregates(merge_partial_aggregates(partials))
+    cube = build_aggregation_cube(results_df, test_cases_df, THRESHOLDS, HIGHER_IS_BETTER)
+    by_model = rollup(merged, ["model_name", "metric"])
+    expected = cube[cube["category"] == ALL_CATEGORIES].sort_values(["model_name", "metric"])
+    assert by_model["mean"].tolist() == pytest.approx(expected["mean"].tolist(), nan_ok=True)
+    assert by_model["pass_count"].tolist() == expected["pass_count"].tolist()
+
+def test_generate_report_from_cube(results_df):
+    report = generate_report(results_df)
+    by_model = {entry["model_name"]: entry for entry in report}
+    assert by_model["a"]["correctness_score"] == pytest.approx(0.7)
+    assert generate_report(pd.DataFrame()) == "No results to report"
@@ -0,0 +1,33 @@
+import json
+from benchmarks.run_benchmarks import compare, main, memory_growth, run_suite
+
+def test_run_suite_small_scale():
+    report = run_suite([300], e2e_cases=5, track_memory=True)
+    operations = report["results"]["300"]
+    assert set(operations) == {
+        "save_evaluation_results", "load_evaluation_results", "get_results_by_category",
+        "get_summary_statistics_cold", "get_summary_statistics_warm", "end_to_end_run"
+    }
+    assert all(stats["seconds"] >= 0 and "peak_mb" in stats for stats in operations.values())
+
+def test_compare_flags_regressions():
+    baseline = {"results": {"1000": {"load_evaluation_results": {"seconds": 1.0, "peak_mb": 10.0}}}}
+    current = {"results": {"1000": {"load_evaluation_results": {"seconds": 1.5, "peak_mb": 10.5}}}}
+    regressions = compare(current, baseline, tolerance=0.25)
+    assert len(regressions) == 1
+    assert "seconds" in regressions[0]
+
+def test_streaming_runs_are_reported_with_memory_growth():
+    report = run_suite([300], e2e_cases=5, track_memory=False, stream_cases=[200, 400])
+    streaming = report["streaming"]
+    assert [streaming[size]["rows"] for size in ("200", "400")] == [200, 400]
+    assert memory_growth(streaming) == streaming["400"]["peak_mb"] / streaming["200"]["peak_mb"]
+
+def test_output_is_written_with_its_command_even_on_regression(tmp_path):
+    output = tmp_path / "baseline.json"
+    argv = ["--scales", "300", "--e2e-cases", "5", "--no-memory", "--stream-cases", "200", "400",
+            "--max-memory-growth", "0", "--output", str(output)]
+    assert main(argv) == 1
+    report = json.loads(output.read_text())
+    assert report["command"] == "python -m benchmarks.run_benchmarks " + " ".join(argv)
+    assert set(report["streaming"]) == {"200", "400"}
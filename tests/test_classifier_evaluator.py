@@ -0,0 +1,113 @@
+import threading
+import src.evaluators.classifier_evaluator as classifier_module
+from src.data.csv_manager import CSVDataManager
+from src.evaluators.classifier_evaluator import (
+    BiasEvaluator, ToxicityEvaluator, classifier_evaluators, get_classifier, length_sorted_batches
+)
+from src.models.base_model import BaseModel
+from src.pipeline.runner import EvaluationRunner
+from src.utils.config import Config
+
+
+class FakeClassifier:
+    """Keyword classifier recording the batches it is asked to score"""
+
+    def __init__(self, labels=("toxic", "insult", "BIASED", "NEUTRAL")):
+        self.labels = labels
+        self.batches = []
+        self.lock = threading.Lock()
+
+    def predict(self, texts, batch_size=32):
+        with self.lock:
+            self.batches.append(len(texts))
+        return [
+            {label: (0.9 if label.lower() in text.lower() else 0.1) for label in self.labels}
+            for text in texts
+        ]
+
+
+class EchoModel(BaseModel):
+    model_type = "fake"
+    model_name = "echo"
+
+    def generate_response(self, input_text, **kwargs):
+        return input_text
+
+
+def test_scores_are_the_highest_positive_label_probability():
+    evaluator = ToxicityEvaluator(classifier=FakeClassifier(), max_wait_ms=0)
+    result = evaluator.evaluate("q", "a", "an insult")
+    assert result["score"] == 0.9
+    assert result["details"]["toxic"] == 0.1
+    assert evaluator.evaluate("q", "a", "kind words")["score"] == 0.1
+    assert BiasEvaluator(classifier=FakeClassifier(), max_wait_ms=0).evaluate("q", "a", "biased take")["score"] == 0.9
+
+
+def test_concurrent_rows_are_classified_in_batches(tmp_path):
+    classifier = FakeClassifier()
+    evaluators = {
+        "toxicity": ToxicityEvaluator(classifier=classifier, batch_size=8, max_wait_ms=200),
+        "bias": BiasEvaluator(classifier=classifier, batch_size=8, max_wait_ms=200)
+    }
+    cases = [{"id": i, "input_text": "toxic reply" if i % 2 else "biased reply", "expected_output": ""}
+             for i in range(1, 17)]
+    manager = CSVDataManager(data_dir=tmp_path)
+    EvaluationRunner([EchoModel()], evaluators, manager, max_workers=8).run(cases)
+
+    assert sum(classifier.batches) == 32
+    assert max(classifier.batches) > 1
+    results = manager.load_evaluation_results().sort_values("test_case_id")
+    assert results["toxicity_score"].tolist() == [0.9, 0.1] * 8
+    assert results["bias_score"].tolist() == [0.1, 0.9] * 8
+
+
+def test_score_texts_backfills_many_responses():
+    classifier = FakeClassifier()
+    results = ToxicityEvaluator(classifier=classifier).score_texts(["toxic", "fine", "insult"])
+    assert [result["score"] for result in results] == [0.9, 0.1, 0.9]
+    assert classifier.batches == [3]
+
+
+def test_length_sorted_batches_group_similar_lengths():
+    texts = ["a" * 50, "b", "c" * 10, "d" * 49, "e" * 2]
+    batches = length_sorted_batches(texts, 2)
+    assert batches == [[1, 4], [2, 3], [0]]
+    assert sorted(index for batch in batches for index in batch) == list(range(5))
+
+
+def test_classifier_is_loaded_once_per_process(monkeypatch):
+    loads = []
+
+    class Loaded(FakeClassifier):
+        def __init__(self, *args):
+            loads.append(args)
+            super().__init__()
+
+    monkeypatch.setattr(classifier_module, "TextClassifier", Loaded)
+    monkeypatch.setattr(classifier_module, "_classifiers", {})
+    first = ToxicityEvaluator(quantize=True, max_wait_ms=0)
+    second = ToxicityEvaluator(quantize=True, max_wait_ms=0)
+    assert not loads
+    first.evaluate("q", "a", "toxic")
+    second.evaluate("q", "a", "toxic")
+    assert len(loads) == 1 and loads[0][:3] == ("unitary/toxic-bert", "torch", True)
+    assert get_classifier("unitary/toxic-bert", quantize=False) is not first.classifier
+
+
+def test_missing_runtime_gives_missing_scores(monkeypatch):
+    def unavailable(*args):
+        raise ImportError("Classifier evaluators need transformers and torch")
+
+    monkeypatch.setattr(classifier_module, "TextClassifier", unavailable)
+    monkeypatch.setattr(classifier_module, "_classifiers", {})
+    result = BiasEvaluator(max_wait_ms=0).evaluate("q", "a", "text")
+    assert result["score"] is None and "transformers" in result["details"]
+
+
+def test_settings_come_from_metrics_config(tmp_path):
+    evaluators = classifier_evaluators(Config(config_dir=str(tmp_path)))
+    assert set(evaluators) == {"toxicity", "bias"}
+    assert evaluators["toxicity"].quantize and evaluators["bias"].backend == "torch"
+    # Quantisation changes scores slightly, so it is part of the evaluator version
+    assert ToxicityEvaluator(quantize=True).config_version() != ToxicityEvaluator(quantize=False).config_version()
+    assert ToxicityEvaluator(batch_size=4).config_version() == ToxicityEvaluator(batch_size=64).config_version()
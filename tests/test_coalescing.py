@@ -0,0 +1,98 @@
+import threading
+import time
+import pytest
+from src.data.csv_manager import CSVDataManager
+from src.evaluators.custom_evaluator import CustomGEvalEvaluator
+from src.pipeline.coalescing import SingleFlight, request_key
+from src.pipeline.runner import EvaluationRunner
+from tests.test_pipeline import EchoModel
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        release.wait(2)
+        return "response"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(flight.do("key", slow))) for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert sorted(shared for _, shared in results) == [False, True, True, True, True]
+    assert flight.calls == 1 and flight.shared == 4
+
+
+def test_rejected_results_are_retried():
+    flight = SingleFlight()
+    assert flight.do("key", lambda: None, keep=lambda result: result is not None) == (None, False)
+    assert flight.do("key", lambda: "ok") == ("ok", False)
+    assert flight.do("key", lambda: "other") == ("ok", True)
+
+
+def test_waiting_callers_retry_when_the_result_is_rejected():
+    flight = SingleFlight()
+    release = threading.Event()
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            release.wait(2)
+            return None
+        return "ok"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(
+        flight.do("key", flaky, keep=lambda result: result is not None))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(results, key=repr) == sorted([(None, False), ("ok", False), ("ok", True), ("ok", True)], key=repr)
+    assert flight.calls == 2 and flight.shared == 2
+
+
+def test_request_key_ignores_param_order():
+    assert request_key("m", "p", {"a": 1, "b": 2}) == request_key("m", "p", {"b": 2, "a": 1})
+    assert request_key("m", "p") != request_key("m2", "p")
+
+
+@pytest.mark.parametrize("max_workers", [1, 8])
+def test_runner_coalesces_duplicate_prompts(tmp_path, max_workers):
+    model = EchoModel(answers={"Hello": "Hi"})
+    runner = EvaluationRunner([model], {"correctness": CustomGEvalEvaluator()},
+                              CSVDataManager(data_dir=tmp_path), max_workers=max_workers)
+    cases = [
+        {"id": i, "input_text": "Hello", "expected_output": "Hi", "category": category}
+        for i, category in enumerate(["greeting", "smalltalk", "greeting"], start=1)
+    ] + [{"id": 4, "input_text": "Bye", "expected_output": "Bye"}]
+
+    summary = runner.run(cases)
+
+    assert len(model.calls) == 2
+    assert summary["generation_calls_saved"] == 2
+    results = CSVDataManager(data_dir=tmp_path).load_evaluation_results()
+    assert results["correctness_score"].tolist() == [1.0, 1.0, 1.0, 0.0]
+    assert results["coalesced"].sum() == 2
+    assert results["cost_usd"].sum() == pytest.approx(0.004)
+    # Shared rows reuse a generation, so only the two real calls count towards usage
+    for usage in (summary["usage"]["echo"], CSVDataManager(data_dir=tmp_path).get_summary_statistics()["usage"]["echo"]):
+        assert (usage["prompt_tokens"], usage["completion_tokens"]) == (20, 40)
+        assert usage["duration_ms"] == pytest.approx(240.0)
+        assert usage["cases"] == 2 and usage["avg_latency_ms"] == pytest.approx(120.0)
+        assert usage["cost_usd"] == pytest.approx(0.004)
@@ -0,0 +1,111 @@
+import threading
+import time
+import pytest
+from src.data.csv_manager import CSVDataManager
+from src.evaluators.custom_evaluator import CustomGEvalEvaluator
+from src.models.base_model import GenerationRecord
+from src.pipeline.concurrency import (
+    ERROR, THROTTLED, AdaptiveLimiter, AdaptiveModel, classify_error
+)
+from src.pipeline.runner import EvaluationRunner
+from tests.test_pipeline import EchoModel
+
+
+def _saturate(limiter, completions, latency_ms, outcome="success"):
+    """Keep every slot busy, completing `completions` requests with the given latency"""
+    in_flight = []
+    for _ in range(completions):
+        while limiter.in_flight < limiter.limit:
+            in_flight.append(limiter.acquire())
+        in_flight.pop()
+        limiter.release(time.monotonic() - latency_ms / 1000, outcome)
+    for _ in in_flight:
+        limiter.release(time.monotonic() - latency_ms / 1000, outcome)
+
+
+def test_limit_grows_additively_while_latency_holds():
+    limiter = AdaptiveLimiter(initial_limit=2, max_limit=5)
+    _saturate(limiter, 2, 100)
+    assert limiter.limit == 3
+    _saturate(limiter, 50, 100)
+    assert limiter.limit == 5
+
+
+def test_throttles_cut_limit_once_per_window():
+    limiter = AdaptiveLimiter(initial_limit=8)
+    started = [limiter.acquire() for _ in range(8)]
+    for start in started:
+        limiter.release(start, THROTTLED)
+
+    metrics = limiter.metrics()
+    assert metrics["limit"] == 4
+    assert metrics["throttled"] == 8 and metrics["decreases"] == 1
+
+    limiter.release(limiter.acquire(), ERROR)
+    assert limiter.limit == 2
+
+
+def test_latency_degradation_cuts_limit():
+    limiter = AdaptiveLimiter(initial_limit=8, max_limit=8, smoothing=1.0)
+    _saturate(limiter, 20, 100)
+    assert limiter.limit == 8
+
+    limiter.acquire()
+    limiter.release(time.monotonic() - 0.5)
+    assert limiter.limit == 4
+    assert limiter.metrics()["baseline_latency_ms"] == pytest.approx(100, rel=0.1)
+
+
+def test_acquire_blocks_at_limit():
+    limiter = AdaptiveLimiter(initial_limit=1)
+    started = limiter.acquire()
+    assert limiter.acquire(timeout=0.01) is None
+    threading.Timer(0.05, limiter.release, (started,)).start()
+    assert limiter.acquire(timeout=2) is not None
+
+
+def test_classify_error():
+    assert classify_error(None) == "success"
+    assert classify_error("ThrottlingException: Rate exceeded") == THROTTLED
+    assert classify_error("status code: 503") == THROTTLED
+    assert classify_error("model not found") == ERROR
+
+
+class SaturatingModel(EchoModel):
+    """Slows down once more than `capacity` requests are in flight"""
+
+    def __init__(self, capacity=2, latency_s=0.01):
+        super().__init__(answers={})
+        self.capacity = capacity
+        self.latency_s = latency_s
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def generate(self, input_text, **kwargs):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            load = self.in_flight
+        time.sleep(self.latency_s * max(1.0, load / self.capacity) ** 2)
+        with self.lock:
+            self.in_flight -= 1
+        return GenerationRecord(text="unknown", model_name=self.model_name, completion_tokens=5)
+
+
+def test_runner_respects_adaptive_limit(tmp_path):
+    model = SaturatingModel()
+    adaptive = AdaptiveModel(model, AdaptiveLimiter(initial_limit=2, max_limit=6))
+    runner = EvaluationRunner([adaptive], {"correctness": CustomGEvalEvaluator()},
+                              CSVDataManager(data_dir=tmp_path), max_workers=16)
+    cases = [{"id": i, "input_text": f"q{i}", "expected_output": "a"} for i in range(60)]
+
+    summary = runner.run(cases)
+
+    assert summary["total"] == 60 and summary["saved"]
+    assert model.max_in_flight <= 6
+    metrics = summary["concurrency"]["echo"]
+    assert metrics["succeeded"] == 60 and metrics["in_flight"] == 0
+    assert metrics["goodput_per_s"] > 0
+    results = CSVDataManager(data_dir=tmp_path).load_evaluation_results()
+    assert results["test_case_id"].tolist() == list(range(60))
@@ -230,4 +230,71 @@ def test_get_summary_statistics_empty(data_manager, mocker):
     assert stats["models_evaluated"] == []
     assert stats["average_scores"] == {}
     assert stats["pass_rates"] == {}
-    assert stats["category_counts"] == {"greeting": 1}
\ No newline at end of file
+    assert stats["category_counts"] == {"greeting": 1}
+
+def test_warm_summary_statistics_read_no_test_cases(data_manager, mocker):
+    """Test that a cached summary answers without reloading the test cases."""
+    _save_browser_results(data_manager)
+    cold = data_manager.get_summary_statistics()
+    load = mocker.spy(data_manager, "load_test_cases")
+    warm = data_manager.get_summary_statistics()
+
+    assert load.call_count == 0
+    assert warm["total_test_cases"] == cold["total_test_cases"] == 2
+    assert warm["category_counts"] == {"greeting": 1, "math": 1}
+
+def _save_browser_results(data_manager):
+    test_cases = [
+        {"id": 1, "input_text": "Hello", "expected_output": "Hi", "category": "greeting"},
+        {"id": 2, "input_text": "What is 2+2?", "expected_output": "4", "category": "math"}
+    ]
+    results = [
+        {"test_case_id": 1, "model_name": "llama3:8b", "response_text": "Hi there", "correctness_score": 0.9, "status": "success"},
+        {"test_case_id": 2, "model_name": "llama3:8b", "response_text": "4", "correctness_score": 0.4, "status": "success"},
+        {"test_case_id": 1, "model_name": "mistral:7b", "response_text": "Hello", "correctness_score": 0.7, "status": "error"},
+        {"test_case_id": 2, "model_name": "mistral:7b", "response_text": "five", "correctness_score": 0.1, "status": "success"}
+    ]
+    data_manager.save_test_cases(test_cases)
+    data_manager.save_evaluation_results(results)
+
+def test_query_evaluation_results_pages_and_sorts(data_manager):
+    """Test server-side sorting and paging of evaluation results."""
+    data_manager.chunk_size = 2
+    _save_browser_results(data_manager)
+    page_df, total = data_manager.query_evaluation_results(
+        columns=["model_name", "correctness_score"], sort_by="correctness_score",
+        ascending=False, page=1, page_size=2
+    )
+    assert total == 4
+    assert list(page_df.columns) == ["id", "model_name", "correctness_score"]
+    assert page_df["correctness_score"].tolist() == [0.4, 0.1]
+
+def test_query_evaluation_results_filters(data_manager):
+    """Test filtering by model, status, category and score range."""
+    _save_browser_results(data_manager)
+    page_df, total = data_manager.query_evaluation_results(
+        columns=["test_case_id", "model_name"],
+        filter_conditions={"status": "success"},
+        categories=["math"],
+        score_ranges={"correctness_score": (0.3, 1.0)}
+    )
+    assert total == 1
+    assert page_df.iloc[0]["model_name"] == "llama3:8b"
+    assert page_df.iloc[0]["test_case_id"] == 2
+    assert "response_text" not in page_df.columns
+
+def test_get_response_text(data_manager):
+    """Test loading a single response on demand."""
+    _save_browser_results(data_manager)
+    assert data_manager.get_response_text(4) == "five"
+    assert data_manager.get_response_text(99) is None
+
+def test_aggregation_cube_is_materialised_and_refreshed(data_manager):
+    """Test the summary cube is cached on disk and rebuilt when results change."""
+    _save_browser_results(data_manager)
+    cube = data_manager.get_aggregation_cube()
+    assert data_manager.summary_cube_file.exists()
+    assert set(cube["model_name"]) == {"llama3:8b", "mistral:7b"}
+    data_manager.save_evaluation_results([{"test_case_id": 1, "model_name": "phi3:mini", "correctness_score": 0.5}])
+    assert "phi3:mini" in set(data_manager.get_aggregation_cube()["model_name"])
+    assert data_manager.get_summary_statistics()["total_evaluations"] == 5
@@ -0,0 +1,72 @@
+import pytest
+from src.data.csv_manager import CSVDataManager
+from src.data.datasets import case_hash
+from src.evaluators.custom_evaluator import CustomGEvalEvaluator
+from src.pipeline.runner import EvaluationRunner
+from tests.test_pipeline import EchoModel
+
+
+@pytest.fixture
+def data_manager(tmp_path):
+    return CSVDataManager(data_dir=tmp_path)
+
+
+def _cases():
+    return [
+        {"input_text": "Hello", "expected_output": "Hi", "category": "greeting"},
+        {"input_text": "What is 2+2?", "expected_output": "4", "category": "math"},
+        {"input_text": "Capital of France?", "expected_output": "Paris", "category": "geo"}
+    ]
+
+
+def test_case_hash_depends_on_content_only():
+    case = {"input_text": "Hello", "expected_output": "Hi", "category": "greeting"}
+    assert case_hash(case) == case_hash({**case, "category": "other", "context": float("nan")})
+    assert case_hash(case) != case_hash({**case, "expected_output": "Hey"})
+
+
+def test_reupload_keeps_ids_and_reports_diff(data_manager):
+    assert data_manager.save_test_cases(_cases())
+    first = data_manager.load_test_cases()
+    ids = dict(zip(first["input_text"], first["id"]))
+
+    # Reordered, one answer changed, one case removed and one added
+    cases = _cases()
+    cases[1]["expected_output"] = "four"
+    updated = [cases[1], cases[0], {"input_text": "Bye", "expected_output": "Goodbye", "category": "greeting"}]
+    assert data_manager.save_test_cases(updated)
+    second = data_manager.load_test_cases()
+
+    assert dict(zip(second["input_text"], second["id"])) == {
+        "What is 2+2?": ids["What is 2+2?"], "Hello": ids["Hello"], "Bye": 4
+    }
+    store = data_manager.datasets
+    assert store.list_versions() == ["v0001", "v0002"]
+    assert store.diff("v0001", "v0002") == {
+        "new": [4], "changed": [ids["What is 2+2?"]], "removed": [ids["Capital of France?"]],
+        "unchanged": [ids["Hello"]]
+    }
+    hello = second[second["input_text"] == "Hello"].iloc[0]
+    assert hello["created_at"] == first[first["input_text"] == "Hello"].iloc[0]["created_at"]
+
+
+def test_versions_are_deduplicated_and_reloadable(data_manager):
+    data_manager.save_test_cases(_cases())
+    data_manager.save_test_cases(_cases())
+    assert data_manager.datasets.list_versions() == ["v0001"]
+
+    data_manager.add_test_case({"input_text": "Bye", "expected_output": "Goodbye"})
+    store = data_manager.datasets
+    assert store.diff("v0001", "v0002")["new"] == [4]
+    restored = store.load_version("v0001")
+    assert restored["expected_output"].tolist() == ["Hi", "4", "Paris"]
+    assert restored["case_hash"].tolist() == [case_hash(case) for case in _cases()]
+
+
+def test_results_record_case_hash(data_manager):
+    data_manager.save_test_cases(_cases())
+    cases = data_manager.load_test_cases().to_dict('records')
+    EvaluationRunner([EchoModel()], {"correctness": CustomGEvalEvaluator()}, data_manager).run(cases)
+
+    results = data_manager.load_evaluation_results()
+    assert results["case_hash"].tolist() == [case_hash(case) for case in _cases()]
@@ -0,0 +1,178 @@
+import json
+import re
+import threading
+import pytest
+from src.data.csv_manager import CSVDataManager
+from src.evaluators.batching import MicroBatcher
+from src.evaluators.judge_evaluator import MultiMetricJudgeEvaluator, parse_json
+from src.models.base_model import BaseModel, GenerationRecord
+from src.models.ollama_handler import OllamaHandler
+from src.models.openai_handler import OpenAIHandler
+from src.pipeline.runner import EvaluationRunner
+from src.utils.config import Config
+
+METRICS = {
+    "correctness": {"name": "Correctness", "description": "Factual accuracy"},
+    "relevancy": {"name": "Relevancy", "description": "Relevance to the input"},
+    "fluency": {"name": "Fluency", "description": "Readability"},
+    "coherence": {"name": "Coherence", "description": "Logical consistency"},
+}
+
+
+def _verdicts(response):
+    score = 1.0 if "right" in response else 0.25
+    return {metric: {"score": score, "reason": f"{metric} judged"} for metric in METRICS}
+
+
+class FakeJudge(BaseModel):
+    """Replies with JSON scores for every case in the prompt"""
+    model_type = "fake"
+    model_name = "judge"
+
+    def __init__(self, reply=None):
+        self.calls = []
+        self.reply = reply
+        self.lock = threading.Lock()
+
+    def generate(self, input_text, **kwargs):
+        with self.lock:
+            self.calls.append((input_text, kwargs))
+        if self.reply is not None:
+            return self.reply
+        responses = re.findall(r"Response:\n(.*?)(?:\n\nItem \d+|$)", input_text, re.DOTALL)
+        if input_text.startswith("Item 1"):
+            body = {"results": [{"item": n, **_verdicts(r)} for n, r in enumerate(responses, start=1)]}
+        else:
+            body = _verdicts(responses[0])
+        return GenerationRecord(text=json.dumps(body), model_name=self.model_name, prompt_tokens=10, completion_tokens=5)
+
+    def generate_response(self, input_text, **kwargs):
+        return self.generate(input_text, **kwargs).text
+
+
+class AnswerModel(BaseModel):
+    model_type = "fake"
+    model_name = "answers"
+
+    def generate_response(self, input_text, **kwargs):
+        return "right answer" if "even" in input_text else "wrong answer"
+
+
+def _cases(count):
+    return [{"id": i, "input_text": f"question {i} {'even' if i % 2 == 0 else 'odd'}", "expected_output": "x"}
+            for i in range(1, count + 1)]
+
+
+def test_runner_scores_all_metrics_with_one_call_per_row(tmp_path):
+    fake = FakeJudge()
+    judge = MultiMetricJudgeEvaluator(fake, METRICS)
+    manager = CSVDataManager(data_dir=tmp_path)
+    EvaluationRunner([AnswerModel()], {metric: judge for metric in judge.metrics}, manager).run(_cases(3))
+
+    assert len(fake.calls) == 3
+    results = manager.load_evaluation_results()
+    for metric in METRICS:
+        assert results[f"{metric}_score"].tolist() == [0.25, 1.0, 0.25]
+        assert results[f"{metric}_evaluator_version"].nunique() == 1
+    assert json.loads(results["custom_metrics"][0])["fluency"] == "fluency judged"
+
+
+def test_rubric_is_a_static_system_prefix():
+    fake = FakeJudge()
+    judge = MultiMetricJudgeEvaluator(fake, METRICS, keep_alive="30m")
+    judge.evaluate_metrics("q1", "a1", "right", list(METRICS))
+    judge.evaluate_metrics("q2", "a2", "wrong", list(METRICS))
+
+    (first_prompt, first), (second_prompt, second) = fake.calls
+    assert first["system"] == second["system"] == judge.rubric
+    assert "q1" not in first["system"] and first_prompt.startswith("Input:\nq1")
+    assert set(first["format"]["required"]) == set(METRICS)
+    assert first["options"]["temperature"] == 0 and first["keep_alive"] == "30m"
+
+
+def test_concurrent_rows_are_packed_into_one_call(tmp_path):
+    fake = FakeJudge()
+    judge = MultiMetricJudgeEvaluator(fake, METRICS, rows_per_call=4, max_wait_ms=500)
+    manager = CSVDataManager(data_dir=tmp_path)
+    EvaluationRunner([AnswerModel()], {metric: judge for metric in judge.metrics}, manager,
+                     max_workers=4).run(_cases(8))
+
+    assert len(fake.calls) < 8
+    assert all(prompt.startswith("Item 1") for prompt, _ in fake.calls)
+    results = manager.load_evaluation_results().sort_values("test_case_id")
+    assert results["correctness_score"].tolist() == [0.25, 1.0] * 4
+    assert judge.usage()["rows"] == 8
+
+
+def test_evaluate_many_packs_rows_per_call():
+    fake = FakeJudge()
+    judge = MultiMetricJudgeEvaluator(fake, METRICS, rows_per_call=2)
+    results = judge.evaluate_many([("q", "a", "right"), ("q", "a", "wrong"), ("q", "a", "right")])
+    assert len(fake.calls) == 2
+    assert [row["coherence"]["score"] for row in results] == [1.0, 0.25, 1.0]
+
+
+def test_unusable_replies_give_missing_scores():
+    failed = GenerationRecord(text="", model_name="judge", error="HTTP 500: down")
+    result = MultiMetricJudgeEvaluator(FakeJudge(failed), METRICS).evaluate_metrics("q", "a", "r", ["fluency"])
+    assert result["fluency"]["score"] is None and "HTTP 500" in result["fluency"]["details"]
+
+    partial = GenerationRecord(text='```json\n{"correctness": {"score": 1.7, "reason": "ok"}}\n```', model_name="judge")
+    result = MultiMetricJudgeEvaluator(FakeJudge(partial), METRICS).evaluate_metrics("q", "a", "r", ["correctness", "fluency"])
+    assert result["correctness"] == {"score": 1.0, "details": "ok"}
+    assert result["fluency"]["score"] is None
+
+    with pytest.raises(ValueError):
+        parse_json("no json here")
+
+
+def test_rubric_changes_mark_scores_stale():
+    base = MultiMetricJudgeEvaluator(FakeJudge(), METRICS)
+    edited = MultiMetricJudgeEvaluator(FakeJudge(), {**METRICS, "fluency": {"description": "Grammar only"}})
+    assert base.config_version() == MultiMetricJudgeEvaluator(FakeJudge(), METRICS, keep_alive="1h").config_version()
+    assert base.config_version() != edited.config_version()
+
+
+def test_judge_from_config_uses_default_metrics(tmp_path):
+    judge = MultiMetricJudgeEvaluator.from_config(FakeJudge(), Config(config_dir=str(tmp_path)))
+    assert judge.metrics == ["correctness", "relevancy", "fluency", "coherence"]
+    assert "Measures factual accuracy of the response" in judge.rubric
+
+
+def test_micro_batcher_groups_concurrent_submissions_and_raises_errors():
+    batches = []
+
+    def double(items):
+        batches.append(len(items))
+        if -1 in items:
+            raise RuntimeError("bad item")
+        return [item * 2 for item in items]
+
+    batcher = MicroBatcher(double, max_batch=3, max_wait_ms=300)
+    results = {}
+    threads = [threading.Thread(target=lambda i=i: results.update({i: batcher.submit(i)})) for i in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == {i: i * 2 for i in range(6)}
+    assert sum(batches) == 6 and len(batches) < 6
+
+    with pytest.raises(RuntimeError):
+        MicroBatcher(double, max_batch=1).submit(-1)
+
+
+def test_handlers_send_system_prompt_and_format(mocker):
+    mock_client = mocker.patch("ollama.Client")
+    mock_client.return_value.chat.return_value = {"message": {"content": "{}"}}
+    OllamaHandler("llama3:8b").generate("row", system="rubric", format="json", options={"temperature": 0})
+    call = mock_client.return_value.chat.call_args.kwargs
+    assert call["messages"] == [{"role": "system", "content": "rubric"}, {"role": "user", "content": "row"}]
+    assert call["format"] == "json" and call["options"] == {"temperature": 0}
+
+    payload = OpenAIHandler("m", base_url="http://127.0.0.1:9/v1")._payload(
+        "row", system="rubric", format={"type": "object"}, options={"temperature": 0}
+    )
+    assert payload["messages"][0] == {"role": "system", "content": "rubric"}
+    assert payload["temperature"] == 0
+    assert payload["response_format"]["json_schema"]["schema"] == {"type": "object"}
@@ -0,0 +1,93 @@
+import pandas as pd
+import pytest
+from src.data.csv_manager import CSVDataManager
+from src.data.live_results import LiveAggregator, ResultsTail, complete_records_end
+from src.evaluators.custom_evaluator import CustomGEvalEvaluator
+from src.pipeline.runner import EvaluationRunner
+from tests.test_pipeline import EchoModel
+
+
+@pytest.fixture
+def data_manager(tmp_path):
+    return CSVDataManager(data_dir=tmp_path)
+
+
+def _rows(run_id, scores):
+    return [{"run_id": run_id, "test_case_id": i, "model_name": "m", "correctness_score": score, "status": "success"}
+            for i, score in enumerate(scores, start=1)]
+
+
+def test_complete_records_end_skips_partial_and_quoted_newlines():
+    data = b'1,"multi\nline",x\n2,done,y\n3,"half'
+    assert complete_records_end(data) == data.index(b"3,")
+    assert complete_records_end(b'1,"open\n') == 0
+
+
+def test_appends_keep_existing_rows_in_place(data_manager):
+    data_manager.save_evaluation_results(_rows("a", [0.9]))
+    size = data_manager.results_offset()
+    with open(data_manager.results_file, 'rb') as f:
+        before = f.read()
+    data_manager.save_evaluation_results(_rows("b", [0.1, 0.2]))
+    with open(data_manager.results_file, 'rb') as f:
+        assert f.read(size) == before
+    assert data_manager.load_evaluation_results()['id'].tolist() == [1, 2, 3]
+
+
+def test_tail_reads_only_new_rows(data_manager):
+    data_manager.save_evaluation_results(_rows("a", [0.9]))
+    tail = ResultsTail(data_manager.results_file, offset=data_manager.results_offset())
+    assert tail.poll()[0].empty
+
+    data_manager.save_evaluation_results(_rows("a", [0.4, 0.8]))
+    rows, reset = tail.poll()
+    assert rows['correctness_score'].tolist() == [0.4, 0.8] and not reset
+    assert tail.poll()[0].empty
+
+    # A new column rewrites the file and restarts the tail from the first record
+    data_manager.save_evaluation_results([{**_rows("a", [0.5])[0], "extra": 1}])
+    rows, reset = tail.poll()
+    assert reset and len(rows) == 4
+
+
+def test_tail_respects_byte_budget(data_manager):
+    data_manager.save_evaluation_results(_rows("a", [0.5] * 50))
+    tail = ResultsTail(data_manager.results_file, max_bytes=200)
+    polls = []
+    while True:
+        rows, _ = tail.poll()
+        if rows.empty:
+            break
+        polls.append(len(rows))
+    assert sum(polls) == 50 and len(polls) > 1
+
+
+def test_live_aggregator_follows_one_run(data_manager):
+    data_manager.save_evaluation_results(_rows("old", [0.0, 0.0]))
+    aggregator = LiveAggregator(data_manager, run_id="new", offset=data_manager.results_offset())
+
+    data_manager.save_evaluation_results(_rows("new", [0.9, 0.5]) + _rows("other", [0.9]))
+    assert aggregator.refresh() == 2
+    data_manager.save_evaluation_results(_rows("new", [0.8]))
+    assert aggregator.refresh() == 1
+
+    snapshot = aggregator.snapshot()
+    assert snapshot["rows"] == 3
+    assert snapshot["pass_rates"]["correctness_score"] == pytest.approx(200 / 3)
+    cells = snapshot["cells"].set_index("metric")
+    cell = cells.loc["correctness_score"]
+    assert cell["mean"] == pytest.approx((0.9 + 0.5 + 0.8) / 3)
+
+
+def test_runner_writes_progressively_and_records_status(data_manager):
+    cases = [{"id": i, "input_text": f"q{i}", "expected_output": "unknown"} for i in range(1, 8)]
+    runner = EvaluationRunner([EchoModel()], {"correctness": CustomGEvalEvaluator()}, data_manager, flush_rows=3)
+    summary = runner.run(cases)
+
+    status = data_manager.load_run_status()[summary["run_id"]]
+    assert status["expected"] == 7 and status["completed"] == 7
+    assert status["finished_at"] is not None
+    aggregator = LiveAggregator(data_manager, run_id=summary["run_id"], offset=status["results_offset"])
+    aggregator.refresh()
+    assert aggregator.rows == 7
+    assert len(pd.read_csv(data_manager.results_file)) == 7
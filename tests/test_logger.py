@@ -0,0 +1,60 @@
+import json
+import logging
+import pytest
+from src.utils.logger import configure_logging, setup_logger, shutdown_logging
+
+
+@pytest.fixture
+def logs_dir(tmp_path):
+    settings = {
+        'level': 'INFO',
+        'console': False,
+        'file': {'filename': 'app.jsonl', 'max_bytes': 2000, 'backup_count': 2},
+        'levels': {'tests.quiet': 'WARNING'}
+    }
+    configure_logging(settings, tmp_path, force=True)
+    yield tmp_path
+    shutdown_logging()
+    logging.getLogger('tests.quiet').setLevel(logging.NOTSET)
+
+
+def _records(logs_dir):
+    shutdown_logging()
+    return [json.loads(line) for line in (logs_dir / 'app.jsonl').read_text().splitlines()]
+
+
+def test_setup_logger_does_not_add_handlers(logs_dir):
+    root_handlers = list(logging.getLogger().handlers)
+    logger = setup_logger('tests.module')
+    setup_logger('tests.module')
+
+    assert logger.handlers == []
+    assert logging.getLogger().handlers == root_handlers
+    assert configure_logging() is configure_logging()
+
+
+def test_records_are_written_as_json_with_extras(logs_dir):
+    logger = setup_logger('tests.module')
+    logger.info("generated %s tokens", 42, extra={'model': 'llama3'})
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.exception("generation failed")
+
+    records = _records(logs_dir)
+    assert records[0]['message'] == "generated 42 tokens"
+    assert records[0]['model'] == 'llama3'
+    assert records[0]['logger'] == 'tests.module'
+    assert records[1]['level'] == 'ERROR' and 'ValueError: boom' in records[1]['exception']
+
+
+def test_per_module_levels_and_rotation(logs_dir):
+    setup_logger('tests.quiet').info("suppressed")
+    logger = setup_logger('tests.module')
+    for i in range(100):
+        logger.info("line %d", i)
+
+    records = _records(logs_dir)
+    assert all(record['logger'] != 'tests.quiet' for record in records)
+    assert (logs_dir / 'app.jsonl.1').exists()
+    assert not (logs_dir / 'app.jsonl.3').exists()
@@ -0,0 +1,87 @@
+import json
+import threading
+import time
+import pytest
+import httpx
+from botocore.config import Config as BotoConfig
+from src.models.ollama_handler import OllamaHandler
+from src.models.bedrock_handler import BedrockHandler
+from src.testing.mock_llm_server import LatencyModel, MockBehaviour, MockLLMServer
+
+
+@pytest.fixture
+def aws_env(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+
+
+def test_ollama_handler_against_mock_server():
+    with MockLLMServer(behaviour=MockBehaviour(seed=1)) as server:
+        handler = OllamaHandler("llama3:8b", host=server.url)
+        first = handler.generate("What is 2+2?")
+        second = handler.generate("What is 2+2?")
+
+    assert first.ok
+    assert first.text == second.text
+    assert first.prompt_tokens == 3
+    assert first.completion_tokens == len(first.text.split())
+    assert first.eval_duration_ms is not None
+
+
+def test_ollama_streaming_chunks():
+    with MockLLMServer(behaviour=MockBehaviour(tokens_per_second=1000, min_tokens=5, max_tokens=5)) as server:
+        with httpx.stream("POST", f"{server.url}/api/chat",
+                          json={"model": "m", "messages": [{"role": "user", "content": "hi"}]}) as response:
+            lines = [json.loads(line) for line in response.iter_lines() if line]
+
+    assert len(lines) == 6
+    assert not any(line["done"] for line in lines[:-1])
+    assert lines[-1]["done"] and lines[-1]["eval_count"] == 5
+    assert "".join(line["message"]["content"] for line in lines[:-1]).count(" ") == 4
+
+
+def test_bedrock_handler_against_mock_server(aws_env):
+    with MockLLMServer() as server:
+        handler = BedrockHandler("amazon.titan-text-express-v1", endpoint_url=server.url)
+        record = handler.generate("Summarise the report")
+
+    assert record.ok
+    assert record.prompt_tokens == 3
+    assert record.completion_tokens == len(record.text.split())
+
+
+def test_error_and_throttle_injection(aws_env):
+    with MockLLMServer(behaviour=MockBehaviour(throttle_rate=1.0)) as server:
+        bedrock = BedrockHandler("amazon.titan-text-express-v1", endpoint_url=server.url,
+                                 client_config=BotoConfig(retries={"max_attempts": 1, "mode": "standard"}))
+        throttled = bedrock.generate("hi")
+        assert "ThrottlingException" in throttled.error
+    with MockLLMServer(behaviour=MockBehaviour(error_rate=1.0)) as server:
+        failed = OllamaHandler("m", host=server.url).generate("hi")
+        assert not failed.ok
+        assert server.stats["errors"] == 1
+
+
+def test_capacity_limits_concurrency():
+    behaviour = MockBehaviour(latency="fixed:50", capacity=2)
+    with MockLLMServer(behaviour=behaviour) as server:
+        handler = OllamaHandler("m", host=server.url)
+        threads = [threading.Thread(target=handler.generate, args=(f"prompt {i}",)) for i in range(6)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+    assert server.stats["max_in_flight"] == 2
+    assert elapsed >= 0.15
+
+
+def test_latency_model_specs():
+    import random
+    rng = random.Random(0)
+    assert LatencyModel("fixed:5").sample(rng) == 5
+    assert 1 <= LatencyModel("uniform:1:2").sample(rng) <= 2
+    with pytest.raises(ValueError):
+        LatencyModel("gamma:1")
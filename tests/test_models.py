@@ -49,4 +49,51 @@ def test_bedrock_handler_error(mocker):
     model = BedrockHandler("anthropic.claude-v2")
     response = model.generate_response("Test input")
     
-    assert "Error generating response" in response
\ No newline at end of file
+    assert "Error generating response" in response
+
+def test_ollama_generate_record(mocker):
+    mock_client = mocker.patch("ollama.Client")
+    mock_client.return_value.chat.return_value = {
+        "message": {"content": "Test response"},
+        "prompt_eval_count": 12, "eval_count": 40,
+        "eval_duration": 2_000_000_000, "load_duration": 500_000_000, "total_duration": 2_600_000_000
+    }
+
+    model = OllamaHandler("llama3:8b", pricing={"input_per_1k": 1.0, "output_per_1k": 2.0})
+    record = model.generate("Test input")
+
+    assert record.ok
+    assert record.prompt_tokens == 12 and record.completion_tokens == 40
+    assert record.eval_duration_ms == 2000.0 and record.load_duration_ms == 500.0
+    assert record.tokens_per_second == 20.0
+    assert record.cost_usd == pytest.approx(0.012 + 0.08)
+    assert record.to_result_fields()["status"] == "success"
+
+def test_bedrock_generate_record_reads_usage_headers(mocker):
+    mock_client = mocker.patch("boto3.client")
+    mock_client.return_value.invoke_model.return_value = {
+        "body": mocker.Mock(read=mocker.Mock(return_value=b'{"results": [{"outputText": "Test response"}]}')),
+        "ResponseMetadata": {"HTTPHeaders": {
+            "x-amzn-bedrock-input-token-count": "100",
+            "x-amzn-bedrock-output-token-count": "50",
+            "x-amzn-bedrock-invocation-latency": "500"
+        }}
+    }
+
+    model = BedrockHandler("anthropic.claude-v2", pricing={"input_per_1k": 0.008, "output_per_1k": 0.024})
+    record = model.generate("Test input")
+
+    assert record.text == "Test response"
+    assert (record.prompt_tokens, record.completion_tokens) == (100, 50)
+    assert record.tokens_per_second == 100.0
+    assert record.cost_usd == pytest.approx(0.0008 + 0.0012)
+
+def test_generate_error_record(mocker):
+    mock_client = mocker.patch("ollama.Client")
+    mock_client.return_value.chat.side_effect = Exception("Connection failed")
+
+    record = OllamaHandler("llama3:8b").generate("Test input")
+
+    assert not record.ok
+    assert record.to_result_fields()["status"] == "error"
+    assert record.to_result_fields()["error_message"] == "Connection failed"
@@ -0,0 +1,101 @@
+import httpx
+import pytest
+import src.models.openai_handler as openai_handler
+from src.data.csv_manager import CSVDataManager
+from src.evaluators.custom_evaluator import CustomGEvalEvaluator
+from src.models.openai_handler import OpenAIHandler, get_http_client
+from src.pipeline.concurrency import THROTTLED, AdaptiveModel, classify_error
+from src.pipeline.runner import EvaluationRunner
+from src.testing.mock_llm_server import MockBehaviour, MockLLMServer
+
+
+def test_generate_against_mock_server():
+    with MockLLMServer(behaviour=MockBehaviour(seed=1)) as server:
+        handler = OpenAIHandler("local-model", base_url=f"{server.url}/v1", api_key="test",
+                                pricing={"input_per_1k": 1.0, "output_per_1k": 2.0})
+        first = handler.generate("What is 2+2?")
+        second = handler.generate("What is 2+2?")
+
+    assert first.ok and first.text == second.text
+    assert first.prompt_tokens == 3
+    assert first.completion_tokens == len(first.text.split())
+    assert first.cost_usd == (3 + 2 * first.completion_tokens) / 1000
+
+
+def test_handlers_share_a_connection_pool():
+    a = OpenAIHandler("a", base_url="http://127.0.0.1:9/v1")
+    b = OpenAIHandler("b", base_url="http://127.0.0.1:9/v1/")
+    assert a.client is b.client is get_http_client("http://127.0.0.1:9/v1")
+    assert OpenAIHandler("c", base_url="http://127.0.0.1:10/v1").client is not a.client
+
+
+def test_throttling_is_reported_for_the_limiter():
+    with MockLLMServer(behaviour=MockBehaviour(throttle_rate=1.0)) as server:
+        record = OpenAIHandler("m", base_url=f"{server.url}/v1").generate("hi")
+    assert not record.ok and "429" in record.error
+    assert classify_error(record.error) == THROTTLED
+
+
+def test_generate_many_runs_concurrently_in_order():
+    prompts = [f"question {i}" for i in range(12)]
+    with MockLLMServer(behaviour=MockBehaviour(latency="fixed:50", seed=2)) as server:
+        handler = OpenAIHandler("m", base_url=f"{server.url}/v1")
+        records = handler.generate_many(prompts, concurrency=6)
+        expected = [handler.generate(prompt).text for prompt in prompts[:3]]
+        max_in_flight = server.stats["max_in_flight"]
+
+    assert [record.text for record in records[:3]] == expected
+    assert all(record.ok for record in records)
+    assert 1 < max_in_flight <= 6
+
+
+def test_batch_mode_round_trip():
+    prompts = ["alpha", "beta", "gamma"]
+    with MockLLMServer(behaviour=MockBehaviour(seed=3)) as server:
+        handler = OpenAIHandler("m", base_url=f"{server.url}/v1")
+        records = handler.run_batch(prompts, poll_interval_s=0.01)
+        direct = [handler.generate(prompt).text for prompt in prompts]
+        assert len(server.batches) == 1
+
+    assert [record.text for record in records] == direct
+    assert all(record.ok and record.latency_ms is None for record in records)
+
+
+def test_batch_failures_become_error_records():
+    with MockLLMServer(behaviour=MockBehaviour(error_rate=1.0)) as server:
+        records = OpenAIHandler("m", base_url=f"{server.url}/v1").run_batch(["a", "b"], poll_interval_s=0.01)
+    assert [record.ok for record in records] == [False, False]
+    assert all("500" in record.error for record in records)
+
+
+def test_unreachable_endpoint_returns_error_record():
+    handler = OpenAIHandler("m", base_url="http://127.0.0.1:9/v1", timeout=1.0)
+    record = handler.generate("hi")
+    assert not record.ok
+    assert isinstance(handler.client, httpx.Client)
+
+
+def test_pools_are_keyed_by_timeout_and_reused_by_generate_many():
+    assert get_http_client("http://127.0.0.1:9/v1", timeout=5) is not get_http_client("http://127.0.0.1:9/v1", timeout=60)
+    with MockLLMServer(behaviour=MockBehaviour(seed=4)) as server:
+        handler = OpenAIHandler("m", base_url=f"{server.url}/v1")
+        handler.generate_many(["a", "b"])
+        clients = dict(openai_handler._async_clients[openai_handler._background_loop()])
+        handler.generate_many(["c"])
+        assert openai_handler._async_clients[openai_handler._background_loop()] == clients
+
+
+@pytest.mark.parametrize("use_batch_api", [True, False])
+def test_runner_generates_in_bulk(tmp_path, use_batch_api):
+    cases = [{"id": i, "input_text": f"question {i}", "expected_output": ""} for i in range(1, 5)]
+    with MockLLMServer(behaviour=MockBehaviour(seed=5)) as server:
+        handler = OpenAIHandler("m", base_url=f"{server.url}/v1")
+        manager = CSVDataManager(data_dir=tmp_path)
+        summary = EvaluationRunner([AdaptiveModel(handler)], {"correctness": CustomGEvalEvaluator()}, manager,
+                                   max_workers=2).run_batch(cases, use_batch_api=use_batch_api, poll_interval_s=0.01)
+        assert len(server.batches) == (1 if use_batch_api else 0)
+
+    assert summary["total"] == 4 and summary["failed"] == 0
+    results = manager.load_evaluation_results()
+    assert results["test_case_id"].tolist() == [1, 2, 3, 4]
+    assert results["correctness_score"].notna().all()
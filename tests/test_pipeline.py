@@ -0,0 +1,63 @@
+import pytest
+from src.data.csv_manager import CSVDataManager
+from src.evaluators.custom_evaluator import CustomGEvalEvaluator
+from src.models.base_model import BaseModel, GenerationRecord
+from src.pipeline.runner import EvaluationRunner
+
+
+class EchoModel(BaseModel):
+    """Returns the expected answer for known prompts and reports fixed usage"""
+    model_type = "fake"
+
+    def __init__(self, model_name="echo", answers=None, fail_on=()):
+        self.model_name = model_name
+        self.answers = answers or {}
+        self.fail_on = set(fail_on)
+        self.calls = []
+
+    def generate(self, input_text, **kwargs):
+        self.calls.append(input_text)
+        if input_text in self.fail_on:
+            return GenerationRecord(text="Error generating response: boom", model_name=self.model_name, error="boom")
+        return GenerationRecord(
+            text=self.answers.get(input_text, "unknown"), model_name=self.model_name,
+            prompt_tokens=10, completion_tokens=20, eval_duration_ms=100.0, latency_ms=120.0, cost_usd=0.002
+        )
+
+    def generate_response(self, input_text, **kwargs):
+        return self.generate(input_text, **kwargs).text
+
+
+@pytest.fixture
+def data_manager(tmp_path):
+    return CSVDataManager(data_dir=tmp_path)
+
+
+@pytest.fixture
+def test_cases():
+    return [
+        {"id": 1, "input_text": "Hello", "expected_output": "Hi", "category": "greeting"},
+        {"id": 2, "input_text": "What is 2+2?", "expected_output": "4", "category": "math"},
+        {"id": 3, "input_text": "Capital of France?", "expected_output": "Paris", "category": "geo"}
+    ]
+
+
+def test_runner_persists_scores_and_usage(data_manager, test_cases):
+    model = EchoModel(answers={"Hello": "Hi", "What is 2+2?": "5"}, fail_on={"Capital of France?"})
+    runner = EvaluationRunner([model], {"correctness": CustomGEvalEvaluator()}, data_manager)
+
+    summary = runner.run(test_cases)
+
+    assert summary["total"] == 3 and summary["failed"] == 1 and summary["saved"]
+    usage = summary["usage"]["echo"]
+    assert usage["tokens_per_second"] == pytest.approx(200.0)
+    assert usage["cost_per_1k_cases"] == pytest.approx(0.004 / 3 * 1000)
+
+    results = data_manager.load_evaluation_results()
+    assert results["correctness_score"].tolist()[:2] == [1.0, 0.0]
+    assert results["status"].tolist() == ["success", "success", "error"]
+    assert results["completion_tokens"].tolist()[:2] == [20, 20]
+    assert results["run_id"].nunique() == 1
+
+    stats = data_manager.get_summary_statistics()
+    assert stats["usage"]["echo"]["cost_usd"] == pytest.approx(0.004)
@@ -0,0 +1,137 @@
+import pandas as pd
+import pytest
+from src.data.csv_manager import CSVDataManager
+from src.evaluators.custom_evaluator import CustomGEvalEvaluator
+from src.pipeline.runner import EvaluationRunner
+from src.utils.aggregation import latest_results
+from tests.test_pipeline import EchoModel
+
+
+class LengthEvaluator(CustomGEvalEvaluator):
+    """Scores 1.0 for short responses"""
+
+    def __init__(self, max_chars=5):
+        self.max_chars = max_chars
+
+    def evaluate(self, input_text, expected_output, response_text, **kwargs):
+        return {"score": float(len(response_text) <= self.max_chars), "details": None}
+
+
+@pytest.fixture
+def data_manager(tmp_path):
+    return CSVDataManager(data_dir=tmp_path)
+
+
+def _cases(n):
+    return [{"id": i, "input_text": f"q{i}", "expected_output": "a"} for i in range(1, n + 1)]
+
+
+def _answers(n):
+    return {f"q{i}": "a" for i in range(1, n + 1)}
+
+
+def test_nothing_is_scheduled_for_a_complete_matrix(data_manager):
+    runner = EvaluationRunner([EchoModel(answers=_answers(3))], {"correctness": CustomGEvalEvaluator()}, data_manager)
+    runner.run(_cases(3))
+
+    plan = runner.plan(_cases(3))
+    assert plan.summary()["fresh_cells"] == 3 and plan.tasks == []
+
+
+def test_only_new_models_and_cases_are_evaluated(data_manager):
+    old = EchoModel("old", answers=_answers(4))
+    EvaluationRunner([old], {"correctness": CustomGEvalEvaluator()}, data_manager).run(_cases(3))
+
+    old.calls.clear()
+    new = EchoModel("new", answers=_answers(4))
+    runner = EvaluationRunner([old, new], {"correctness": CustomGEvalEvaluator()}, data_manager)
+    summary = runner.run_incremental(_cases(4))
+
+    assert summary["plan"]["missing_cells"] == 5 and summary["plan"]["fresh_cells"] == 3
+    assert old.calls == ["q4"] and len(new.calls) == 4
+    assert summary["total"] == 5
+
+
+def test_new_metric_rescores_stored_responses(data_manager):
+    model = EchoModel(answers=_answers(3))
+    EvaluationRunner([model], {"correctness": CustomGEvalEvaluator()}, data_manager).run(_cases(3))
+
+    model.calls.clear()
+    runner = EvaluationRunner([model], {"correctness": CustomGEvalEvaluator(), "fluency": LengthEvaluator()},
+                              data_manager)
+    summary = runner.run_incremental(_cases(3))
+
+    assert summary["plan"]["generations_reused"] == 3 and model.calls == []
+    assert summary["usage"]["echo"]["cases"] == 0
+    stats = data_manager.get_summary_statistics()
+    # Re-scored rows generated nothing, so latency and cost stay per real generation
+    assert stats["usage"]["echo"]["cases"] == 3
+    assert stats["usage"]["echo"]["avg_latency_ms"] == pytest.approx(120.0)
+    assert stats["usage"]["echo"]["cost_per_1k_cases"] == pytest.approx(2.0)
+    averages = stats["average_scores"]["echo"]
+    assert (averages["correctness_score"], averages["fluency_score"]) == (1.0, 1.0)
+
+
+def test_changed_evaluator_config_marks_cells_stale(data_manager):
+    model = EchoModel(answers=_answers(2))
+    EvaluationRunner([model], {"fluency": LengthEvaluator(5)}, data_manager).run(_cases(2))
+
+    assert EvaluationRunner([model], {"fluency": LengthEvaluator(5)}, data_manager).plan(_cases(2)).tasks == []
+    plan = EvaluationRunner([model], {"fluency": LengthEvaluator(0)}, data_manager).plan(_cases(2))
+    assert plan.summary()["stale_cells"] == 2
+    assert [task.response_text for task in plan.tasks] == ["a", "a"]
+
+
+def test_changed_case_content_is_missing(data_manager):
+    model = EchoModel(answers=_answers(2))
+    runner = EvaluationRunner([model], {"correctness": CustomGEvalEvaluator()}, data_manager)
+    runner.run(_cases(2))
+
+    cases = _cases(2)
+    cases[0]["expected_output"] = "b"
+    plan = runner.plan(cases)
+    assert [task.test_case["id"] for task in plan.tasks] == [1]
+    assert plan.tasks[0].response_text is None
+
+
+def test_new_id_with_known_content_rescores_the_stored_response(data_manager):
+    model = EchoModel(answers=_answers(1))
+    runner = EvaluationRunner([model], {"correctness": CustomGEvalEvaluator()}, data_manager)
+    data_manager.save_test_cases([{"id": 1, "input_text": "q1", "expected_output": "a", "category": "x"}])
+    runner.run(_cases(1))
+
+    model.calls.clear()
+    twin = {"id": 2, "input_text": "q1", "expected_output": "a", "category": "y"}
+    data_manager.add_test_case(twin)
+    plan = runner.plan(_cases(1) + [twin])
+    assert plan.summary()["fresh_cells"] == 1 and plan.summary()["missing_cells"] == 1
+    assert [(task.test_case["id"], task.response_text) for task in plan.tasks] == [(2, "a")]
+
+    runner.run_incremental(_cases(1) + [twin])
+    assert model.calls == []
+    assert data_manager.get_summary_statistics()["category_counts"] == {"x": 1, "y": 1}
+    cube = data_manager.get_aggregation_cube()
+    assert set(cube.loc[cube["metric"] == "correctness_score", "category"]) == {"x", "y", "__all__"}
+
+
+def test_latest_results_unions_partial_rows():
+    results = pd.DataFrame([
+        {"case_hash": "h1", "model_name": "m", "status": "success", "correctness_score": 0.2, "fluency_score": None},
+        {"case_hash": "h1", "model_name": "m", "status": "success", "correctness_score": None, "fluency_score": 0.9},
+        {"case_hash": "h1", "model_name": "m", "status": "error", "correctness_score": None, "fluency_score": None},
+        {"case_hash": None, "model_name": "m", "status": "success", "correctness_score": 0.5, "fluency_score": None}
+    ])
+    latest = latest_results(results)
+    assert len(latest) == 2
+    row = latest[latest["case_hash"] == "h1"].iloc[0]
+    assert (row["correctness_score"], row["fluency_score"], row["status"]) == (0.2, 0.9, "success")
+
+
+def test_latest_results_keeps_identical_cases_with_different_ids():
+    results = pd.DataFrame([
+        {"test_case_id": 1, "case_hash": "h1", "model_name": "m", "status": "success", "correctness_score": 0.2},
+        {"test_case_id": 2, "case_hash": "h1", "model_name": "m", "status": "success", "correctness_score": 0.8},
+        {"test_case_id": 2, "case_hash": "h1", "model_name": "m", "status": "success", "correctness_score": 0.6}
+    ])
+    latest = latest_results(results).sort_values("test_case_id")
+    assert latest["correctness_score"].tolist() == [0.2, 0.6]
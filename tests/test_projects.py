@@ -0,0 +1,66 @@
+import pytest
+from src.data.projects import DEFAULT_PROJECT, ProjectStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ProjectStore(data_dir=tmp_path / "data", config_dir=str(tmp_path / "config"))
+
+
+def _results(model, scores):
+    return [
+        {"test_case_id": i, "model_name": model, "correctness_score": score, "status": "success",
+         "completion_tokens": 10, "eval_duration_ms": 100.0}
+        for i, score in enumerate(scores, start=1)
+    ]
+
+
+def test_projects_have_separate_storage(store):
+    store.create_project("team-a")
+    assert store.list_projects() == [DEFAULT_PROJECT, "team-a"]
+
+    store.get_data_manager("team-a").save_evaluation_results(_results("m", [0.9]))
+    assert len(store.get_data_manager("team-a").load_evaluation_results()) == 1
+    assert store.get_data_manager(DEFAULT_PROJECT).load_evaluation_results().empty
+    assert (store.project_dir("team-a") / "evaluation_results.csv").exists()
+
+
+def test_invalid_and_duplicate_projects_are_rejected(store):
+    store.create_project("team-a")
+    with pytest.raises(ValueError):
+        store.create_project("team-a")
+    with pytest.raises(ValueError):
+        store.create_project("../escape")
+    with pytest.raises(ValueError):
+        store.get_data_manager("missing")
+
+
+def test_config_overrides_apply_to_project_summary(store):
+    store.create_project("strict", overrides={"metrics": {"thresholds": {"correctness": 0.95}}})
+    store.create_project("lenient")
+    for name in ("strict", "lenient"):
+        store.get_data_manager(name).save_evaluation_results(_results("m", [0.9, 0.99]))
+
+    assert store.get_config("strict").get_metric_threshold("correctness") == 0.95
+    assert store.get_config("strict").get_metric_threshold("relevancy") == 0.8
+    assert store.get_data_manager("strict").get_summary_statistics()["pass_rates"]["correctness_score"] == 50.0
+    assert store.get_data_manager("lenient").get_summary_statistics()["pass_rates"]["correctness_score"] == 100.0
+
+
+def test_cross_project_summary_merges_cached_cubes(store):
+    store.create_project("team-a")
+    store.create_project("team-b")
+    store.get_data_manager("team-a").save_evaluation_results(_results("m1", [0.2, 0.4]))
+    store.get_data_manager("team-b").save_evaluation_results(_results("m1", [0.6]) + _results("m2", [1.0]))
+
+    summary = store.cross_project_summary()
+
+    assert summary["total_evaluations"] == 4
+    assert summary["models_evaluated"] == ["m1", "m2"]
+    assert summary["average_scores"]["m1"]["correctness_score"] == pytest.approx(0.4)
+    assert summary["pass_rates"]["correctness_score"] == pytest.approx(25.0)
+    assert summary["usage"]["m1"]["cases"] == 3
+    assert summary["projects"]["team-b"]["total_evaluations"] == 2
+
+    cube = store.cross_project_cube(["team-a"])
+    assert set(cube["model_name"]) == {"m1"}
@@ -0,0 +1,70 @@
+import json
+import pytest
+import pandas as pd
+from src.data.csv_manager import CSVDataManager
+from src.data.retention import RetentionManager
+from src.utils.report_exporter import ReportExporter
+
+@pytest.fixture
+def data_manager(tmp_path):
+    manager = CSVDataManager(data_dir=tmp_path / "data")
+    manager.save_test_cases([
+        {"id": 1, "input_text": "Hello", "expected_output": "Hi", "category": "greeting"},
+        {"id": 2, "input_text": "What is 2+2?", "expected_output": "4", "category": "math"}
+    ])
+    manager.save_evaluation_results([
+        {"test_case_id": tc, "model_name": model, "response_text": f"<b>{model} {tc}</b>",
+         "correctness_score": score, "status": "success"}
+        for tc, model, score in [(1, "a", 0.9), (2, "a", 0.2), (1, "b", 0.6), (2, "b", 0.8), (2, "a", 0.4)]
+    ])
+    return manager
+
+def test_export_writes_all_formats(data_manager, tmp_path):
+    exporter = ReportExporter(data_manager, output_dir=tmp_path / "reports", chunk_size=2, worst_n=2)
+    paths = exporter.export(name="run")
+
+    summary = pd.read_csv(paths["csv"])
+    assert set(summary["metric"]) == {"correctness_score"}
+    model_a = summary[(summary["model_name"] == "a") & (summary["category"] == "__all__")].iloc[0]
+    assert model_a["rows"] == 3
+    assert model_a["mean"] == pytest.approx(0.5)
+    assert model_a["pass_rate"] == pytest.approx(100 / 3)
+    assert set(summary["category"]) == {"__all__", "greeting", "math"}
+
+    payload = json.loads(paths["json"].read_text())
+    assert payload["total_evaluations"] == 5
+    worst = payload["worst_examples"]["correctness_score"]
+    assert [row["score"] for row in worst] == [0.2, 0.4]
+    assert worst[0]["category"] == "math"
+
+    document = paths["html"].read_text()
+    assert "<style>" in document and "&lt;b&gt;a 2&lt;/b&gt;" in document
+
+def test_export_rejects_unknown_format(data_manager, tmp_path):
+    with pytest.raises(ValueError):
+        ReportExporter(data_manager, output_dir=tmp_path).export(["pdf"])
+
+def test_export_matches_the_summary_cube_after_retries_and_archiving(tmp_path):
+    manager = CSVDataManager(data_dir=tmp_path / "data")
+    manager.save_test_cases([
+        {"id": tc, "input_text": f"q{tc}", "expected_output": "a", "category": "c"} for tc in (1, 2)
+    ])
+    old = "2020-01-01T00:00:00"
+    manager.save_evaluation_results([
+        {"test_case_id": tc, "model_name": "a", "case_hash": f"h{tc}", "correctness_score": score,
+         "status": "success", "evaluation_time": old}
+        for tc, score in [(1, 0.9), (2, 0.2)]
+    ])
+    manager.save_evaluation_results([
+        {"test_case_id": 2, "model_name": "a", "case_hash": "h2", "correctness_score": 0.4, "status": "success"}
+    ])
+    RetentionManager(manager).archive(older_than_days=30)
+
+    report = ReportExporter(manager, output_dir=tmp_path / "reports").collect()
+    model_a = report["per_model"].iloc[0]
+    cube = manager.get_aggregation_cube()
+    expected = cube[(cube["category"] == "__all__") & (cube["metric"] == "correctness_score")].iloc[0]
+    assert model_a["mean"] == pytest.approx(expected["mean"])
+    assert model_a["mean"] == pytest.approx(0.65)
+    assert model_a["rows"] == expected["rows"] == 2
+    assert report["total_evaluations"] == manager.get_summary_statistics()["total_evaluations"] == 3
@@ -0,0 +1,163 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from src.data.csv_manager import CSVDataManager
+from src.data.retention import RetentionManager
+from src.evaluators.custom_evaluator import CustomGEvalEvaluator
+from src.pipeline.runner import EvaluationRunner
+from src.utils.config import Config
+from tests.test_pipeline import EchoModel
+
+NOW = datetime(2026, 6, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return CSVDataManager(data_dir=tmp_path / "data", config=Config(str(tmp_path / "config")))
+
+
+def _results(model, scores, days_ago):
+    when = (NOW - timedelta(days=days_ago)).isoformat()
+    return [
+        {"test_case_id": i, "model_name": model, "correctness_score": score, "status": "success",
+         "case_hash": f"case-{i}", "evaluation_time": when, "completion_tokens": 10, "eval_duration_ms": 100.0}
+        for i, score in enumerate(scores, start=1)
+    ]
+
+
+def _seed(manager):
+    manager.save_evaluation_results(_results("old", [0.9, 0.5], days_ago=400))
+    manager.save_evaluation_results(_results("new", [0.8, 0.6, 0.7], days_ago=1))
+
+
+def test_archive_moves_old_rows_and_keeps_summary(manager):
+    _seed(manager)
+    before = manager.get_summary_statistics()
+
+    entry = RetentionManager(manager).archive(now=NOW)
+    assert entry["rows"] == 2
+    assert (manager.archive_dir / entry["file"]).exists()
+    live = manager.load_evaluation_results()
+    assert set(live["model_name"]) == {"new"}
+
+    after = manager.get_summary_statistics()
+    assert after["total_evaluations"] == before["total_evaluations"] == 5
+    assert set(after["models_evaluated"]) == {"old", "new"}
+    for model in ("old", "new"):
+        assert after["average_scores"][model]["correctness_score"] == pytest.approx(
+            before["average_scores"][model]["correctness_score"])
+    assert after["pass_rates"] == pytest.approx(before["pass_rates"])
+
+
+def test_nothing_to_archive(manager):
+    manager.save_evaluation_results(_results("new", [0.8], days_ago=1))
+    assert RetentionManager(manager).archive(now=NOW) is None
+    assert len(manager.load_evaluation_results()) == 1
+
+
+def test_archived_rows_can_be_loaded_and_restored(manager):
+    _seed(manager)
+    retention = RetentionManager(manager)
+    entry = retention.archive(now=NOW)
+
+    archived = retention.load_archived(filter_conditions={"test_case_id": 1})
+    assert archived["correctness_score"].tolist() == [0.9]
+
+    assert retention.restore(entry["segment"]) == 2
+    assert len(manager.load_evaluation_results()) == 5
+    assert retention.load_manifest()["segments"] == []
+    assert manager.get_summary_statistics()["total_evaluations"] == 5
+
+
+def test_compaction_merges_segments_and_respects_interval(manager):
+    _seed(manager)
+    retention = RetentionManager(manager)
+    retention.enabled = True
+    retention.archive(now=NOW)
+    manager.save_evaluation_results(_results("new", [0.4], days_ago=1))
+    retention.archive(older_than_days=0, now=NOW + timedelta(seconds=1))
+    assert len(retention.load_manifest()["segments"]) == 2
+
+    report = retention.maybe_compact(now=NOW + timedelta(seconds=2))
+    assert report["merged_segments"] == 2
+    assert len(retention.load_manifest()["segments"]) == 1
+    assert len(retention.load_archived()) == 6
+    assert retention.maybe_compact(now=NOW + timedelta(hours=1)) is None
+    assert manager.get_summary_statistics()["total_evaluations"] == 6
+
+
+def test_result_ids_stay_unique_across_archive_and_restore(manager):
+    _seed(manager)
+    retention = RetentionManager(manager)
+    entry = retention.archive(now=NOW)
+    assert retention.load_manifest()["max_id"] == 2
+
+    manager.save_evaluation_results(_results("later", [0.5], days_ago=1))
+    assert manager.load_evaluation_results()["id"].max() == 6
+
+    retention.restore(entry["segment"])
+    ids = manager.load_evaluation_results()["id"]
+    assert ids.is_unique and sorted(ids) == [1, 2, 3, 4, 5, 6]
+
+
+def test_restore_renumbers_ids_taken_by_live_rows(manager):
+    _seed(manager)
+    retention = RetentionManager(manager)
+    entry = retention.archive(now=NOW)
+    # Live rows reusing archived ids, as saved before the archive reserved them
+    live = manager.load_evaluation_results()
+    live.loc[live.index[0], "id"] = 1
+    live.to_csv(manager.results_file, index=False)
+
+    retention.restore(entry["segment"])
+    ids = manager.load_evaluation_results()["id"]
+    assert ids.is_unique and len(ids) == 5
+    assert manager._next_result_id() == ids.max() + 1
+
+
+def test_retention_is_off_by_default(manager):
+    _seed(manager)
+    retention = RetentionManager(manager)
+    assert not retention.enabled
+    assert retention.maybe_compact(now=NOW) is None
+    assert len(manager.load_evaluation_results()) == 5
+
+
+def test_archived_reruns_count_once(manager):
+    manager.save_evaluation_results(_results("m", [0.2, 0.4], days_ago=500))
+    manager.save_evaluation_results(_results("m", [0.6, 0.8], days_ago=400))
+    manager.save_evaluation_results(_results("m", [1.0], days_ago=1))
+    before = manager.get_summary_statistics()
+    assert before["average_scores"]["m"]["correctness_score"] == pytest.approx(0.9)
+
+    RetentionManager(manager).archive(now=NOW)
+    after = manager.get_summary_statistics()
+    assert after["average_scores"]["m"]["correctness_score"] == pytest.approx(0.9)
+    assert after["pass_rates"] == pytest.approx(before["pass_rates"])
+    assert after["total_evaluations"] == 5
+
+
+def test_planner_does_not_rerun_archived_cells(manager):
+    cases = [{"id": i, "input_text": f"q{i}", "expected_output": "a"} for i in range(1, 4)]
+    model = EchoModel(answers={f"q{i}": "a" for i in range(1, 4)})
+    runner = EvaluationRunner([model], {"correctness": CustomGEvalEvaluator()}, manager)
+    runner.run(cases)
+    RetentionManager(manager).archive(older_than_days=0, now=datetime.now() + timedelta(days=1))
+    assert manager.load_evaluation_results().empty
+
+    plan = runner.plan(cases)
+    assert plan.summary()["fresh_cells"] == 3 and plan.tasks == []
+
+
+def test_appends_wait_for_the_results_lock(manager):
+    _seed(manager)
+    with manager.results_lock():
+        writer = threading.Thread(target=manager.save_evaluation_results, args=(_results("late", [0.5], days_ago=1),))
+        writer.start()
+        time.sleep(0.2)
+        assert writer.is_alive()
+        assert len(manager.load_evaluation_results()) == 5
+    writer.join(timeout=5)
+    assert len(manager.load_evaluation_results()) == 6
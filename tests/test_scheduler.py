@@ -0,0 +1,94 @@
+import pytest
+from src.data.csv_manager import CSVDataManager
+from src.evaluators.custom_evaluator import CustomGEvalEvaluator
+from src.models.ollama_handler import OllamaHandler
+from src.pipeline.runner import EvaluationRunner
+from src.pipeline.scheduler import ModelScheduler
+from src.testing.mock_llm_server import MockBehaviour, MockLLMServer
+from src.utils.config import Config
+
+LOAD_MS = 80
+
+
+def _cases(count):
+    return [{"id": i, "input_text": f"question {i}", "expected_output": "x"} for i in range(1, count + 1)]
+
+
+def _run(tmp_path, server, scheduler, names=("a", "b", "c"), cases=4, max_workers=1):
+    models = [OllamaHandler(name, host=server.url) for name in names]
+    runner = EvaluationRunner(models, {"correctness": CustomGEvalEvaluator()}, CSVDataManager(data_dir=tmp_path),
+                              max_workers=max_workers, scheduler=scheduler)
+    return runner.run(_cases(cases)), runner
+
+
+def test_group_keeps_first_seen_model_order():
+    a, b = object(), object()
+    tasks = [(a, 1), (b, 1), (a, 2), (b, 2)]
+    assert ModelScheduler.group(tasks) == [(a, [0, 2]), (b, [1, 3])]
+
+
+def test_interleaved_run_thrashes_without_scheduler(tmp_path):
+    with MockLLMServer(behaviour=MockBehaviour(load_ms=LOAD_MS, max_resident=1)) as server:
+        _run(tmp_path, server, scheduler=None)
+        assert server.stats["loads"] == 12
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_scheduler_loads_each_model_once(tmp_path, max_workers):
+    with MockLLMServer(behaviour=MockBehaviour(load_ms=LOAD_MS, max_resident=1)) as server:
+        summary, _ = _run(tmp_path, server, ModelScheduler(max_resident=1), max_workers=max_workers)
+        assert server.stats["loads"] == 3
+        assert list(server.resident) == ["c"]
+
+    loads = summary["model_loads"]
+    assert [loads[name]["loads"] for name in "abc"] == [1, 1, 1]
+    assert all(loads[name]["load_ms"] >= LOAD_MS * 0.9 for name in "abc")
+    assert loads["a"]["unloads"] == loads["b"]["unloads"] == 1
+    # Results are written model by model as each group finishes
+    results = CSVDataManager(data_dir=tmp_path).load_evaluation_results()
+    assert results["model_name"].tolist() == ["a"] * 4 + ["b"] * 4 + ["c"] * 4
+    assert results["test_case_id"].tolist() == [1, 2, 3, 4] * 3
+
+
+def test_sequential_run_swaps_models_once_per_batch(tmp_path):
+    with MockLLMServer(behaviour=MockBehaviour(load_ms=LOAD_MS, max_resident=1)) as server:
+        models = [OllamaHandler(name, host=server.url) for name in ("a", "b")]
+        runner = EvaluationRunner(models, {"correctness": CustomGEvalEvaluator()}, CSVDataManager(data_dir=tmp_path),
+                                  max_workers=2, scheduler=ModelScheduler(max_resident=1))
+        summary = runner.run_sequential(_cases(6), {"metric": "correctness", "min_samples": 100},
+                                        Config(str(tmp_path / "config")))
+        # Batches of two cases run a, b then b, a then a, b
+        assert server.stats["loads"] == 4
+
+    assert summary["total"] == 12
+
+
+def test_prewarm_hides_load_time_when_two_models_fit(tmp_path):
+    behaviour = MockBehaviour(load_ms=LOAD_MS, max_resident=2, latency="fixed:40")
+    with MockLLMServer(behaviour=behaviour) as server:
+        summary, _ = _run(tmp_path, server, ModelScheduler(max_resident=2), names=("a", "b"), cases=4)
+        assert server.stats["loads"] == 2
+        assert server.stats["evictions"] == 0
+
+    loads = summary["model_loads"]
+    assert loads["a"]["wait_ms"] >= LOAD_MS * 0.9
+    # b was loaded while a's last case ran
+    assert loads["b"]["wait_ms"] < LOAD_MS / 2
+
+
+def test_load_time_is_reported_apart_from_generation(tmp_path):
+    with MockLLMServer(behaviour=MockBehaviour(load_ms=LOAD_MS, max_resident=1)) as server:
+        summary, _ = _run(tmp_path, server, scheduler=None, names=("a", "b"), cases=2)
+    usage = summary["usage"]["a"]
+    assert usage["load_duration_ms"] >= 2 * LOAD_MS * 0.9
+    assert usage["avg_generation_ms"] < usage["avg_latency_ms"]
+
+
+def test_remote_models_are_not_warmed():
+    class Remote:
+        model_name = "remote"
+
+    scheduler = ModelScheduler()
+    scheduler.activate(Remote())
+    scheduler.prewarm(Remote())
+    assert scheduler.metrics() == {} and not scheduler.resident
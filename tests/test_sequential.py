@@ -0,0 +1,82 @@
+import random
+import pytest
+from src.data.csv_manager import CSVDataManager
+from src.evaluators.custom_evaluator import CustomGEvalEvaluator
+from src.pipeline.runner import EvaluationRunner
+from src.pipeline.sequential import (
+    FAIL, PASS, SequentialTest, hoeffding_interval, look_alpha, stratified_order, wilson_interval
+)
+from src.utils.config import Config
+from tests.test_pipeline import EchoModel
+
+
+def test_stratified_order_keeps_category_proportions():
+    cases = [{"id": i, "category": "a" if i < 60 else "b"} for i in range(90)]
+    cases.append({"id": 90, "category": float("nan")})
+    ordered = stratified_order(cases, seed=1)
+
+    assert sorted(case["id"] for case in ordered) == list(range(91))
+    prefix = ordered[:30]
+    assert 17 <= sum(case["category"] == "a" for case in prefix) <= 23
+    assert stratified_order(cases, seed=1) == ordered
+
+
+def test_intervals_contain_estimate_and_shrink():
+    for interval in (wilson_interval, hoeffding_interval):
+        lower, upper = interval(80, 100, 0.05)
+        assert lower < 0.8 < upper
+        wide = interval(8, 10, 0.05)
+        assert wide[1] - wide[0] > upper - lower
+    assert sum(look_alpha(0.05, k) for k in range(1, 100000)) == pytest.approx(0.05, rel=1e-3)
+
+
+@pytest.mark.parametrize("rate,expected", [(0.95, PASS), (0.5, FAIL)])
+def test_sequential_test_settles_clear_cases(rate, expected):
+    rng = random.Random(0)
+    test = SequentialTest(target=0.8, alpha=0.05, min_samples=20)
+    for _ in range(1000):
+        if test.update(rng.random() < rate):
+            break
+    assert test.decision == expected
+    assert test.n < 300
+
+
+def test_sequential_test_error_rate_is_bounded():
+    rng = random.Random(1)
+    wrong = 0
+    for _ in range(200):
+        test = SequentialTest(target=0.8, alpha=0.05, min_samples=10, check_every=5)
+        for _ in range(400):
+            if test.update(rng.random() < 0.75):
+                break
+        wrong += test.decision == PASS
+    assert wrong / 200 <= 0.05
+
+
+def test_unknown_method_is_rejected():
+    with pytest.raises(ValueError):
+        SequentialTest(0.8, method="bayes")
+
+
+def test_runner_stops_models_once_settled(tmp_path):
+    cases = [
+        {"id": i, "input_text": f"q{i}", "expected_output": "a", "category": ["x", "y", "z"][i % 3]}
+        for i in range(400)
+    ]
+    good = EchoModel("good", answers={f"q{i}": "a" for i in range(400) if i % 20})
+    bad = EchoModel("bad", answers={f"q{i}": "a" for i in range(400) if i % 2})
+    runner = EvaluationRunner([good, bad], {"correctness": CustomGEvalEvaluator()},
+                              CSVDataManager(data_dir=tmp_path), max_workers=4)
+    settings = {"metric": "correctness", "target_pass_rate": 0.8, "alpha": 0.05, "min_samples": 20, "check_every": 5}
+
+    summary = runner.run_sequential(cases, settings, Config(str(tmp_path / "config")))
+
+    outcome = summary["early_stopping"]
+    assert outcome["good"]["decision"] == PASS and outcome["bad"]["decision"] == FAIL
+    assert outcome["bad"]["skipped"] > 300 and outcome["good"]["skipped"] > 150
+    for model in (good, bad):
+        run = outcome[model.model_name]
+        assert run["cases_run"] == len(model.calls) == len(cases) - run["skipped"]
+        assert run["evaluated"] <= run["cases_run"]
+    assert len(good.calls) + len(bad.calls) == summary["total"] < 250
+    assert len(CSVDataManager(data_dir=tmp_path).load_evaluation_results()) == summary["total"]
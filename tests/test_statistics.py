@@ -0,0 +1,56 @@
+import time
+import numpy as np
+import pandas as pd
+import pytest
+from src.utils.statistics import (
+    bootstrap_metric_intervals, paired_comparison, resample_means, resample_proportions
+)
+
+def test_resample_means_is_deterministic_and_centred():
+    values = np.random.default_rng(0).random(5000)
+    first = resample_means(values, n_resamples=500, seed=7)
+    assert np.array_equal(first, resample_means(values, n_resamples=500, seed=7))
+    assert first.mean() == pytest.approx(values.mean(), abs=2e-3)
+    assert first.std() == pytest.approx(values.std() / np.sqrt(len(values)), rel=0.15)
+
+def test_resample_means_large_support_fallback():
+    values = np.random.default_rng(0).normal(size=10000) * 100
+    samples = resample_means(values, n_resamples=200, resolution=None)
+    assert samples.std() == pytest.approx(values.std() / 100, rel=0.2)
+
+def test_resample_proportions():
+    samples = resample_proportions(30, 100, n_resamples=2000)
+    assert samples.mean() == pytest.approx(0.3, abs=0.01)
+
+def test_bootstrap_metric_intervals_bracket_estimates():
+    df = pd.DataFrame({
+        "model_name": ["a"] * 200,
+        "correctness_score": np.linspace(0, 1, 200),
+        "toxicity_score": [np.nan] * 100 + [0.1] * 100
+    })
+    intervals = bootstrap_metric_intervals(df, {"correctness": 0.7, "toxicity": 0.2}, {"toxicity": False})
+    row = intervals.set_index("metric").loc["correctness_score"]
+    assert row["mean_lower"] < row["mean"] < row["mean_upper"]
+    assert row["pass_rate_lower"] < row["pass_rate"] < row["pass_rate_upper"]
+    assert intervals.set_index("metric").loc["toxicity_score", "pass_rate"] == 50.0
+
+def test_paired_comparison_detects_shift():
+    rng = np.random.default_rng(3)
+    base = rng.random(400)
+    df = pd.DataFrame({
+        "test_case_id": np.tile(np.arange(400), 2),
+        "model_name": ["a"] * 400 + ["b"] * 400,
+        "correctness_score": np.r_[np.clip(base + 0.05, 0, 1), base]
+    })
+    result = paired_comparison(df, "a", "b", "correctness_score")
+    assert result["n_pairs"] == 400
+    assert result["lower"] > 0
+    assert result["significant"]
+    same = paired_comparison(df.assign(correctness_score=np.r_[base, base]), "a", "b", "correctness_score")
+    assert not same["significant"]
+
+def test_bootstrap_100k_rows_is_fast():
+    values = np.random.default_rng(0).random(100_000)
+    start = time.perf_counter()
+    resample_means(values, n_resamples=2000)
+    assert time.perf_counter() - start < 1.0
@@ -0,0 +1,91 @@
+import threading
+import time
+import pytest
+from benchmarks.synthetic import FakeEvaluator, FakeModel, generate_test_cases
+from src.data.csv_manager import CSVDataManager
+from src.pipeline.coalescing import SingleFlight
+from src.pipeline.runner import EvaluationRunner
+from src.pipeline.streaming import BoundedPipeline
+
+
+def test_pipeline_delivers_every_item_through_each_stage():
+    pipeline = BoundedPipeline([("double", lambda x: x * 2, 3), ("inc", lambda x: x + 1, 2)], queue_size=4)
+    out = []
+    pipeline.run(range(500), out.append)
+    assert sorted(out) == [x * 2 + 1 for x in range(500)]
+    metrics = pipeline.metrics()
+    assert metrics["processed"] == {"double": 500, "inc": 500}
+    assert all(depth <= 4 for depth in metrics["max_depth"].values())
+
+
+def test_slow_sink_holds_back_the_source():
+    produced = []
+
+    def source():
+        for i in range(300):
+            produced.append(i)
+            yield i
+
+    ahead = []
+    consumed = []
+
+    def sink(item):
+        time.sleep(0.001)
+        consumed.append(item)
+        ahead.append(len(produced) - len(consumed))
+
+    BoundedPipeline([("work", lambda x: x, 2)], queue_size=5).run(source(), sink)
+    # Two queues of 5, one item per worker and the item being fed
+    assert max(ahead) <= 2 * 5 + 2 + 1
+
+
+def test_stage_error_stops_the_pipeline_and_is_raised():
+    def fail(x):
+        if x == 50:
+            raise RuntimeError("boom")
+        return x
+
+    started = time.monotonic()
+    with pytest.raises(RuntimeError, match="boom"):
+        BoundedPipeline([("fail", fail, 2)], queue_size=2).run(iter(range(10_000)), lambda item: None)
+    assert time.monotonic() - started < 5
+    assert not [t for t in threading.enumerate() if t.name.startswith("stream-")]
+
+
+def test_run_stream_writes_all_results_and_summarises_from_totals(tmp_path):
+    manager = CSVDataManager(data_dir=tmp_path)
+    generate_test_cases(120).to_csv(manager.test_cases_file, index=False)
+    runner = EvaluationRunner([FakeModel("a"), FakeModel("b")], {"correctness": FakeEvaluator()}, manager,
+                              max_workers=3)
+    summary = runner.run_stream(manager.iter_test_cases(chunk_size=25), expected=manager.count_test_cases(),
+                                queue_size=8, batch_size=40)
+
+    results = manager.load_evaluation_results()
+    assert len(results) == summary["total"] == 240
+    assert results["id"].is_unique
+    assert sorted(zip(results["test_case_id"], results["model_name"])) == sorted(
+        (i, name) for i in range(1, 121) for name in "ab"
+    )
+    expected = EvaluationRunner.summarise(summary["run_id"], results.to_dict('records'), True)
+    assert summary["usage"]["a"]["completion_tokens"] == expected["usage"]["a"]["completion_tokens"]
+    assert summary["usage"]["b"]["cases"] == 120
+    assert summary["pipeline"]["processed"] == {"generate": 240, "evaluate": 240}
+    assert manager.load_run_status()[summary["run_id"]]["completed"] == 240
+
+
+def test_iter_test_cases_filters_ids_chunk_by_chunk(tmp_path):
+    manager = CSVDataManager(data_dir=tmp_path)
+    assert manager.count_test_cases() == 0
+    generate_test_cases(30).to_csv(manager.test_cases_file, index=False)
+    assert manager.count_test_cases() == 30
+    cases = list(manager.iter_test_cases(ids=[3, 17, 29], chunk_size=7))
+    assert [case["id"] for case in cases] == [3, 17, 29]
+    assert cases[0]["input_text"]
+
+
+def test_non_retaining_flight_forgets_finished_calls():
+    flight = SingleFlight(retain=False)
+    flight.do("k", lambda: 1)
+    result, shared = flight.do("k", lambda: 2)
+    assert (result, shared) == (2, False)
+    assert flight.calls == 2
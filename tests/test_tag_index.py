@@ -0,0 +1,76 @@
+import pandas as pd
+import pytest
+from src.data.csv_manager import CSVDataManager
+from src.data.tag_index import TagIndex, parse_tags
+
+CASES = [
+    {"id": 1, "input_text": "2+2", "category": "reasoning", "tags": "math, multi-step"},
+    {"id": 2, "input_text": "Capital of France", "category": "knowledge", "tags": "geography"},
+    {"id": 3, "input_text": "Prove it", "category": "reasoning", "tags": "math;flaky"},
+    {"id": 4, "input_text": "Plan a trip", "category": "Reasoning", "tags": "Multi-Step"},
+    {"id": 5, "input_text": "Hello", "category": None, "tags": None},
+]
+
+
+@pytest.fixture
+def index():
+    return TagIndex.build(pd.DataFrame(CASES))
+
+
+def test_parse_tags():
+    assert parse_tags(" Math, multi-step ;math| ") == ["math", "multi-step"]
+    assert parse_tags(float("nan")) == []
+
+
+@pytest.mark.parametrize("expression, expected", [
+    ("category:reasoning", [1, 3, 4]),
+    ("tag:math", [1, 3]),
+    ("category:reasoning AND (tag:math OR tag:multi-step)", [1, 3, 4]),
+    ("category:reasoning AND NOT tag:flaky", [1, 4]),
+    ("NOT category:reasoning", [2, 5]),
+    ("geography OR tag:flaky", [2, 3]),
+    ("tag:missing", []),
+])
+def test_query(index, expression, expected):
+    assert index.query(expression).tolist() == expected
+
+
+@pytest.mark.parametrize("expression", ["(tag:math", "tag:math AND", "author:me", "tag:math tag:flaky"])
+def test_invalid_queries(index, expression):
+    with pytest.raises(ValueError):
+        index.query(expression)
+
+
+def test_select(index):
+    assert index.select(categories=["reasoning"], any_tags=["math", "multi-step"], exclude_tags=["flaky"]).tolist() == [1, 4]
+    assert index.select(all_tags=["math", "multi-step"]).tolist() == [1]
+    assert index.select().tolist() == [1, 2, 3, 4, 5]
+
+
+def test_save_and_load_roundtrip(index, tmp_path):
+    path = tmp_path / "index.npz"
+    index.save(path, [1, 2])
+    loaded = TagIndex.load(path)
+    assert loaded.signature == [1, 2]
+    assert sorted(loaded.terms()) == sorted(index.terms())
+    assert loaded.query("tag:math AND category:reasoning").tolist() == [1, 3]
+
+
+def test_data_manager_keeps_index_current(tmp_path):
+    manager = CSVDataManager(data_dir=tmp_path / "data")
+    manager.save_test_cases(CASES[:2])
+    assert manager.tag_index_file.exists()
+    assert manager.get_tag_index().query("category:reasoning").tolist() == [1]
+
+    manager.add_test_case({"input_text": "Integrate x", "category": "reasoning", "tags": "math"})
+    index = TagIndex.load(manager.tag_index_file)
+    assert index.signature == manager._test_cases_signature()
+    assert index.query("tag:math").tolist() == [1, 3]
+    assert manager.query_test_cases("tag:math AND NOT tag:multi-step")['input_text'].tolist() == ["Integrate x"]
+
+
+def test_stale_index_is_rebuilt(tmp_path):
+    manager = CSVDataManager(data_dir=tmp_path / "data")
+    manager.save_test_cases(CASES)
+    pd.DataFrame(CASES[:1]).to_csv(manager.test_cases_file, index=False)
+    assert manager.get_tag_index().query("category:reasoning").tolist() == [1]
@@ -0,0 +1,104 @@
+import json
+import pytest
+from src.data.csv_manager import CSVDataManager
+from src.evaluators.custom_evaluator import CustomGEvalEvaluator
+from src.pipeline.runner import EvaluationRunner
+from src.utils.tracing import JsonlExporter, RingBufferExporter, Tracer, summarise_trace
+from tests.test_pipeline import EchoModel
+
+
+@pytest.fixture
+def ring_buffer():
+    return RingBufferExporter()
+
+
+def test_spans_nest_and_record_attributes(ring_buffer):
+    tracer = Tracer([ring_buffer])
+    with tracer.span("outer", trace_id="run1", model="m") as outer:
+        with tracer.span("inner") as inner:
+            inner.set_attribute("rows", 3)
+
+    spans = {span["name"]: span for span in ring_buffer.spans("run1")}
+    assert spans["inner"]["parent_id"] == outer.span_id
+    assert spans["inner"]["attributes"] == {"rows": 3}
+    assert spans["outer"]["attributes"] == {"model": "m"}
+    assert spans["outer"]["duration_ms"] >= spans["inner"]["duration_ms"]
+    assert ring_buffer.trace_ids() == ["run1"]
+
+
+def test_unsampled_subtrees_and_orphans_are_dropped(ring_buffer):
+    tracer = Tracer([ring_buffer])
+    with tracer.span("run", sampled=True, trace_id="run1"):
+        with tracer.span("case", sampled=False):
+            with tracer.span("generate"):
+                pass
+    with tracer.span("csv.read", require_parent=True):
+        pass
+
+    assert [span["name"] for span in ring_buffer.spans()] == ["run"]
+
+
+def test_span_marks_errors(ring_buffer):
+    tracer = Tracer([ring_buffer])
+    with pytest.raises(ValueError):
+        with tracer.span("generate"):
+            raise ValueError("boom")
+    assert ring_buffer.spans()[0]["status"] == "error"
+
+
+def test_jsonl_exporter_flushes_when_trace_ends(tmp_path):
+    exporter = JsonlExporter(tmp_path / "traces.jsonl")
+    tracer = Tracer([exporter])
+    with tracer.span("run", trace_id="run1"):
+        with tracer.span("persist"):
+            pass
+        assert not exporter.path.exists()
+
+    lines = [json.loads(line) for line in exporter.path.read_text().splitlines()]
+    assert [span["name"] for span in lines] == ["persist", "run"]
+
+
+def test_runner_traces_each_stage(tmp_path, ring_buffer):
+    model = EchoModel(answers={"Hello": "Hi"})
+    runner = EvaluationRunner([model], {"correctness": CustomGEvalEvaluator()},
+                              CSVDataManager(data_dir=tmp_path), tracer=Tracer([ring_buffer]))
+
+    summary = runner.run([{"id": 1, "input_text": "Hello", "expected_output": "Hi"}])
+
+    spans = ring_buffer.spans(summary["run_id"])
+    assert sorted(span["name"] for span in spans) == [
+        "csv.read", "csv.write", "evaluate", "evaluation_run", "generate", "persist", "test_case"
+    ]
+    evaluate = next(span for span in spans if span["name"] == "evaluate")
+    assert evaluate["attributes"]["evaluator"] == "CustomGEvalEvaluator"
+    assert evaluate["attributes"]["score"] == 1.0
+
+    stages = {stage["stage"]: stage for stage in summarise_trace(spans)}
+    assert stages["evaluation_run"]["count"] == 1
+    assert sum(stage["self_share"] for stage in stages.values()) == pytest.approx(100.0)
+
+
+def _write_runs(path, max_bytes):
+    exporter = JsonlExporter(path, buffer_size=1, max_bytes=max_bytes, backup_count=2)
+    tracer = Tracer([exporter])
+    for run in ("run1", "run2", "run3", "run4"):
+        with tracer.span("run", trace_id=run):
+            with tracer.span("persist"):
+                pass
+    return exporter.path
+
+
+def test_jsonl_exporter_rotates_and_traces_load_across_files(tmp_path, monkeypatch):
+    import src.utils.tracing as tracing
+    monkeypatch.setattr(tracing, "_ring_buffer", RingBufferExporter())
+    monkeypatch.setattr(tracing, "_tracer", Tracer([]))
+
+    # About one trace per file: the oldest trace is rotated out
+    path = _write_runs(tmp_path / "whole" / "traces.jsonl", max_bytes=400)
+    assert sorted(p.name for p in path.parent.iterdir()) == ["traces.jsonl", "traces.jsonl.1", "traces.jsonl.2"]
+    assert [span["name"] for span in tracing.load_trace("run3", path)] == ["persist", "run"]
+    assert tracing.load_trace("run1", path) == []
+
+    # One span per file: a trace's spans are gathered from consecutive files
+    path = _write_runs(tmp_path / "split" / "traces.jsonl", max_bytes=1)
+    assert [span["name"] for span in tracing.load_trace("run4", path)] == ["persist", "run"]